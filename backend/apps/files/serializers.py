@@ -0,0 +1,16 @@
+from core.serializers import DynamicFieldsModelSerializer
+from .models import File, ManuscriptFile
+
+
+class FileSerializer(DynamicFieldsModelSerializer):
+    class Meta:
+        model = File
+        fields = '__all__'
+
+
+class ManuscriptFileSerializer(DynamicFieldsModelSerializer):
+    expandable_fields = {'file': FileSerializer}
+
+    class Meta:
+        model = ManuscriptFile
+        fields = '__all__'
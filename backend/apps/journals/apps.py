@@ -6,4 +6,6 @@ class JournalsConfig(AppConfig):
     name = 'apps.journals'
     label = 'journals'
 
-
+    def ready(self):
+        from . import handlers  # noqa: F401
+        return super().ready()
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.caching import bump_generation
+
+from .models import Journal, Section
+
+
+@receiver([post_save, post_delete], sender=Journal)
+@receiver([post_save, post_delete], sender=Section)
+def journal_changed(sender, **kwargs):
+    bump_generation(sender)
@@ -1,14 +1,16 @@
-from rest_framework import serializers
+from core.serializers import DynamicFieldsModelSerializer
 from .models import Journal, Section
 
 
-class JournalSerializer(serializers.ModelSerializer):
+class JournalSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = Journal
         fields = '__all__'
 
 
-class SectionSerializer(serializers.ModelSerializer):
+class SectionSerializer(DynamicFieldsModelSerializer):
+    expandable_fields = {'journal': JournalSerializer}
+
     class Meta:
         model = Section
         fields = '__all__'
@@ -1,22 +1,32 @@
 from rest_framework import viewsets, mixins
 from apps.users.permissions import require_permission
+from core.async_views import AsyncListModelMixin, AsyncRetrieveModelMixin, AsyncViewSetMixin
+from core.caching import CachedResponseMixin
+from core.viewsets import SparseFieldsMixin, ValuesListMixin
 from .models import Journal, Section
 from .serializers import JournalSerializer, SectionSerializer
 
 
-class JournalViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+class JournalViewSet(
+    CachedResponseMixin, AsyncListModelMixin, AsyncRetrieveModelMixin, ValuesListMixin, SparseFieldsMixin,
+    AsyncViewSetMixin, mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet,
+):
     queryset = Journal.objects.all()
     serializer_class = JournalSerializer
+    cache_models = (Journal,)
 
     def get_permissions(self):
         return [require_permission('view_published_articles')()]
 
 
-class SectionViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+class SectionViewSet(
+    CachedResponseMixin, AsyncListModelMixin, AsyncRetrieveModelMixin, ValuesListMixin, SparseFieldsMixin,
+    AsyncViewSetMixin, mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet,
+):
     queryset = Section.objects.all()
     serializer_class = SectionSerializer
+    # ?expand=journal renders journal rows too.
+    cache_models = (Section, Journal)
 
     def get_permissions(self):
         return [require_permission('view_published_articles')()]
-
-
@@ -6,4 +6,6 @@ class ManuscriptsConfig(AppConfig):
     name = 'apps.manuscripts'
     label = 'manuscripts'
 
-
+    def ready(self):
+        from . import handlers, metrics  # noqa: F401
+        return super().ready()
@@ -0,0 +1,60 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.files.models import File, ManuscriptFile
+from apps.reviews.models import Review, ReviewAssignment, ReviewRound
+from core.signals import bulk_written
+
+from .models import Decision, EditorAssignment, Manuscript, ManuscriptStatusHistory, ManuscriptVersion
+from .services import invalidate_dossiers
+
+# Rows rendered in a manuscript's dossier that carry its id directly.
+DOSSIER_CHILDREN = (
+    ManuscriptVersion, ManuscriptStatusHistory, EditorAssignment, Decision, ReviewRound, Review, ManuscriptFile,
+)
+# The column tying each row to its manuscript, directly or through its round.
+PARENT_FIELDS = {**{model: 'manuscript' for model in DOSSIER_CHILDREN}, ReviewAssignment: 'review_round'}
+
+
+def _dossier_manuscript_ids(sender, instances):
+    if sender is Manuscript:
+        return [instance.pk for instance in instances]
+    if sender in DOSSIER_CHILDREN:
+        return [instance.manuscript_id for instance in instances]
+    if sender is ReviewAssignment:
+        cached = ReviewAssignment.review_round.is_cached
+        if all(cached(instance) for instance in instances):
+            # Saved through a serializer, which already loaded the round.
+            return [instance.review_round.manuscript_id for instance in instances]
+        rounds = {instance.review_round_id for instance in instances}
+        return ReviewRound.objects.filter(pk__in=rounds).values_list('manuscript_id', flat=True)
+    if sender is File:
+        files = [instance.pk for instance in instances]
+        return ManuscriptFile.objects.filter(file_id__in=files).values_list('manuscript_id', flat=True)
+    return []
+
+
+def dossier_row_changed(sender, instance, **kwargs):
+    invalidate_dossiers(_dossier_manuscript_ids(sender, [instance]))
+
+
+def dossier_row_moving(sender, instance, raw=False, update_fields=None, **kwargs):
+    # A row moved to another manuscript also leaves the old one's dossier stale.
+    field = sender._meta.get_field(PARENT_FIELDS[sender])
+    if raw or instance._state.adding or (update_fields is not None and field.name not in update_fields):
+        return
+    old = sender._default_manager.filter(pk=instance.pk).values_list(field.attname, flat=True).first()
+    if old is not None and old != getattr(instance, field.attname):
+        invalidate_dossiers(_dossier_manuscript_ids(sender, [sender(pk=instance.pk, **{field.attname: old})]))
+
+
+for model in (Manuscript, ReviewAssignment, File, *DOSSIER_CHILDREN):
+    post_save.connect(dossier_row_changed, sender=model)
+    post_delete.connect(dossier_row_changed, sender=model)
+for model in PARENT_FIELDS:
+    pre_save.connect(dossier_row_moving, sender=model)
+
+
+@receiver(bulk_written)
+def dossier_rows_bulk_written(sender, instances, previous=(), **kwargs):
+    invalidate_dossiers(_dossier_manuscript_ids(sender, [*instances, *previous]))
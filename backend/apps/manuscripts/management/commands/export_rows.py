@@ -0,0 +1,73 @@
+import os
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.http import HttpRequest, QueryDict
+
+from apps.manuscripts.views import DecisionViewSet, ManuscriptViewSet
+from apps.reviews.views import ReviewViewSet
+from apps.users.models import User
+from core.exports import FORMATS
+
+VIEWSETS = {
+    'manuscripts': ManuscriptViewSet,
+    'reviews': ReviewViewSet,
+    'decisions': DecisionViewSet,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream manuscripts, reviews or decisions to a CSV, JSONL or Parquet file, "
+        "as the export endpoint would for --user."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=VIEWSETS)
+        parser.add_argument('--user', required=True, help="Email of the account whose permissions and scope apply")
+        parser.add_argument('--output', default='-', help="Output file, or '-' for stdout")
+        parser.add_argument('--format', choices=FORMATS, help="Defaults to the file extension, else csv")
+        parser.add_argument('--filter', action='append', default=[], metavar='NAME=VALUE',
+                            help="List filter, e.g. --filter journal=3 --filter ordering=-submitted_at")
+        parser.add_argument('--fields', help="Comma-separated columns, as ?fields= on the list")
+
+    def handle(self, *args, **options):
+        output = options['output']
+        extension = os.path.splitext(output)[1].lstrip('.').lower()
+        fmt = options['format'] or (extension if extension in FORMATS else 'csv')
+        try:
+            user = User.objects.get(email=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"No user with email {options['user']!r}")
+
+        query = QueryDict(mutable=True)
+        for item in options['filter']:
+            name, sep, value = item.partition('=')
+            if not sep:
+                raise CommandError(f"Expected NAME=VALUE, got {item!r}")
+            query.appendlist(name, value)
+        if options['fields']:
+            query['fields'] = options['fields']
+
+        request = HttpRequest()
+        request.method = 'GET'
+        request.GET = query
+        request.META.update({'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'QUERY_STRING': query.urlencode()})
+        request._force_auth_user, request._force_auth_token = user, None
+
+        viewset = VIEWSETS[options['model']]
+        initkwargs = {'async_dispatch': False} if hasattr(viewset, 'async_dispatch') else {}
+        response = viewset.as_view({'get': 'export'}, **initkwargs)(request, export_format=fmt)
+        if response.status_code != 200:
+            raise CommandError(f"Export refused ({response.status_code}): {getattr(response, 'data', '')}")
+
+        stream = sys.stdout.buffer if output == '-' else open(output, 'wb')
+        try:
+            for chunk in response.streaming_content:
+                stream.write(chunk)
+        finally:
+            response.close()
+            if stream is not sys.stdout.buffer:
+                stream.close()
+        if output != '-':
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['model']} to {output}"))
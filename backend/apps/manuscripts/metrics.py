@@ -0,0 +1,22 @@
+from django.db.models import Count
+
+from apps.journals.models import Journal
+from apps.workflow.models import WorkflowState
+from core.metrics import domain_gauge
+from .models import Manuscript
+
+
+@domain_gauge('journal_submissions', 'Manuscripts submitted to each journal.', ['journal'])
+def submissions_per_journal():
+    counts = dict(Manuscript.objects.order_by().values_list('journal_id').annotate(n=Count('id')))
+    for journal_id, slug in Journal.objects.values_list('id', 'slug'):
+        yield (slug,), counts.get(journal_id, 0)
+
+
+@domain_gauge('manuscripts_by_state', 'Manuscripts in each workflow state.', ['state'])
+def manuscripts_per_state():
+    counts = dict(Manuscript.objects.order_by().values_list('current_state_id').annotate(n=Count('id')))
+    for state_id, name in WorkflowState.objects.values_list('id', 'name'):
+        yield (name,), counts.get(state_id, 0)
+    if None in counts:
+        yield ('none',), counts[None]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('manuscripts', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='editorassignment',
+            index=models.Index(fields=['editor', 'manuscript'], name='editorassign_editor_ms_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journals', '0001_initial'),
+        ('manuscripts', '0002_visibility_indexes'),
+        ('workflow', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='decision',
+            index=models.Index(fields=['decided_at', 'id'], name='decision_decided_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='manuscript',
+            index=models.Index(fields=['submitted_at', 'id'], name='manuscript_submitted_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='manuscriptstatushistory',
+            index=models.Index(fields=['changed_at', 'id'], name='msstatus_changed_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='manuscriptversion',
+            index=models.Index(fields=['created_at', 'id'], name='msversion_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journals', '0001_initial'),
+        ('manuscripts', '0003_keyset_indexes'),
+        ('workflow', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='manuscript',
+            index=models.Index(fields=['journal', 'submitted_at', 'id'], name='manuscript_journal_sub_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='manuscript',
+            index=models.Index(fields=['section', 'submitted_at', 'id'], name='manuscript_section_sub_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='manuscript',
+            index=models.Index(fields=['current_state', 'submitted_at', 'id'], name='manuscript_state_sub_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='manuscript',
+            index=models.Index(fields=['corresponding_author', 'submitted_at', 'id'], name='manuscript_author_sub_idx'),
+        ),
+    ]
@@ -17,17 +17,34 @@ class Manuscript(models.Model):
     current_state = models.ForeignKey(WorkflowState, on_delete=models.SET_NULL, null=True)
     submitted_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Default list order; keyset pagination seeks on it.
+            models.Index(fields=['submitted_at', 'id'], name='manuscript_submitted_id_idx'),
+            # Filtered lists (ManuscriptViewSet.filter_fields) in the same order.
+            models.Index(fields=['journal', 'submitted_at', 'id'], name='manuscript_journal_sub_idx'),
+            models.Index(fields=['section', 'submitted_at', 'id'], name='manuscript_section_sub_idx'),
+            models.Index(fields=['current_state', 'submitted_at', 'id'], name='manuscript_state_sub_idx'),
+            models.Index(fields=['corresponding_author', 'submitted_at', 'id'], name='manuscript_author_sub_idx'),
+        ]
+
 class ManuscriptVersion(models.Model):
     manuscript = models.ForeignKey(Manuscript, on_delete=models.CASCADE, related_name='versions')
     version_number = models.PositiveIntegerField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [models.Index(fields=['created_at', 'id'], name='msversion_created_id_idx')]
+
 class ManuscriptStatusHistory(models.Model):
     manuscript = models.ForeignKey(Manuscript, on_delete=models.CASCADE, related_name='status_history')
     state = models.ForeignKey(WorkflowState, on_delete=models.CASCADE)
     changed_at = models.DateTimeField(auto_now_add=True)
     changed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
 
+    class Meta:
+        indexes = [models.Index(fields=['changed_at', 'id'], name='msstatus_changed_id_idx')]
+
 # --------------------
 # Editors & Decisions
 # --------------------
@@ -36,8 +53,17 @@ class EditorAssignment(models.Model):
     editor = models.ForeignKey(User, on_delete=models.CASCADE)
     role = models.CharField(max_length=50)  # Section Editor, Editor-in-Chief
 
+    class Meta:
+        indexes = [
+            # Drives the "manuscripts I edit" branch of visibility scoping.
+            models.Index(fields=['editor', 'manuscript'], name='editorassign_editor_ms_idx'),
+        ]
+
 class Decision(models.Model):
     manuscript = models.ForeignKey(Manuscript, on_delete=models.CASCADE, related_name='decisions')
     decision = models.CharField(max_length=50)  # Accept, Reject, etc.
     decided_by = models.ForeignKey(User, on_delete=models.CASCADE)
     decided_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['decided_at', 'id'], name='decision_decided_id_idx')]
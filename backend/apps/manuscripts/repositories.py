@@ -0,0 +1,93 @@
+from django.db.models import Prefetch, prefetch_related_objects
+
+from apps.users.services import permission_cache
+from .models import Decision, EditorAssignment, Manuscript, ManuscriptStatusHistory, ManuscriptVersion
+
+# Holders of any of these see every manuscript; everyone else is scoped to the
+# manuscripts they author, edit or review.
+OVERSIGHT_PERMISSIONS = ('make_final_decision', 'manage_journals')
+
+
+def has_oversight(user) -> bool:
+    if getattr(user, 'is_superuser', False):
+        return True
+    return permission_cache.has_any(user, OVERSIGHT_PERMISSIONS)
+
+
+def edited_manuscript_ids(user):
+    """Subquery of ids of manuscripts the user is assigned to as editor."""
+    return EditorAssignment.objects.filter(editor_id=user.pk).values('manuscript_id')
+
+
+def visible_manuscript_ids(user):
+    """
+    Subquery of ids of manuscripts the user authors, edits or reviews.
+
+    Built as a UNION of three index-driven lookups rather than an OR across
+    joins, so the database resolves each branch from its own index.
+    """
+    from apps.reviews.models import ReviewAssignment
+
+    authored = Manuscript.objects.filter(corresponding_author_id=user.pk).values('pk')
+    reviewed = ReviewAssignment.objects.filter(reviewer_id=user.pk).values('review_round__manuscript_id')
+    return authored.union(edited_manuscript_ids(user), reviewed)
+
+
+def scope_manuscripts(queryset, user, field='pk'):
+    """
+    Restrict ``queryset`` to rows whose manuscript (reached through ``field``)
+    is visible to ``user``.
+    """
+    if has_oversight(user):
+        return queryset
+    return queryset.filter(**{f'{field}__in': visible_manuscript_ids(user)})
+
+
+def scope_manuscript_children(queryset, user):
+    return scope_manuscripts(queryset, user, field='manuscript_id')
+
+
+def prefetch_dossier(manuscript):
+    """
+    Load everything ManuscriptDossierSerializer renders onto ``manuscript``:
+    one query per relation, however many rows each holds. Review rounds come
+    with every review and assignment; see scoped_review_rounds.
+    """
+    from apps.files.models import ManuscriptFile
+    from apps.reviews.models import Review, ReviewAssignment, ReviewRound
+
+    prefetch_related_objects(
+        [manuscript],
+        Prefetch('versions', queryset=ManuscriptVersion.objects.order_by('version_number', 'id')),
+        Prefetch('status_history', queryset=ManuscriptStatusHistory.objects.order_by('changed_at', 'id')),
+        Prefetch('editor_assignments', queryset=EditorAssignment.objects.order_by('id')),
+        Prefetch('decisions', queryset=Decision.objects.order_by('decided_at', 'id')),
+        Prefetch('review_rounds', queryset=ReviewRound.objects.order_by('round_number', 'id').prefetch_related(
+            Prefetch('reviews', queryset=Review.objects.order_by('id')),
+            Prefetch('assignments', queryset=ReviewAssignment.objects.order_by('assigned_at', 'id')),
+        )),
+        Prefetch('manuscriptfile_set', queryset=ManuscriptFile.objects.select_related('file').order_by('id')),
+    )
+    return manuscript
+
+
+def sees_all_reviews(user, manuscript_id) -> bool:
+    """Whether ``user`` may see every review of the manuscript: oversight holders and its editors."""
+    return has_oversight(user) or edited_manuscript_ids(user).filter(manuscript_id=manuscript_id).exists()
+
+
+def scoped_review_rounds(manuscript_id, user):
+    """
+    The manuscript's review rounds with only the reviews and assignments
+    ``user`` may see (apps.reviews.repositories): a reviewer gets their own,
+    an author none.
+    """
+    from apps.reviews.models import Review, ReviewAssignment, ReviewRound
+    from apps.reviews.repositories import scope_assignments, scope_review_rounds, scope_reviews
+
+    rounds = scope_review_rounds(ReviewRound.objects.filter(manuscript_id=manuscript_id), user)
+    reviews = scope_reviews(Review.objects.order_by('id'), user)
+    assignments = scope_assignments(ReviewAssignment.objects.order_by('assigned_at', 'id'), user)
+    return rounds.order_by('round_number', 'id').prefetch_related(
+        Prefetch('reviews', queryset=reviews), Prefetch('assignments', queryset=assignments),
+    )
@@ -1,4 +1,8 @@
 from rest_framework import serializers
+from apps.files.serializers import ManuscriptFileSerializer
+from apps.reviews.serializers import ReviewAssignmentSerializer, ReviewRoundSerializer, ReviewSerializer
+from apps.workflow.services import TransitionNotAllowed, get_workflow
+from core.serializers import DynamicFieldsModelSerializer
 from .models import (
     Manuscript,
     ManuscriptVersion,
@@ -7,29 +11,83 @@ from .models import (
     Decision
 )
 
-class ManuscriptSerializer(serializers.ModelSerializer):
+class ManuscriptSerializer(DynamicFieldsModelSerializer):
+    expandable_fields = {
+        'journal': 'apps.journals.serializers.JournalSerializer',
+        'section': 'apps.journals.serializers.SectionSerializer',
+        'corresponding_author': 'apps.users.serializers.UserSummarySerializer',
+        'current_state': 'apps.workflow.serializers.WorkflowStateSerializer',
+    }
+
     class Meta:
         model = Manuscript
         fields = '__all__'
 
-class ManuscriptVersionSerializer(serializers.ModelSerializer):
+    def validate_current_state(self, state):
+        # Updates go through ManuscriptViewSet.transition, which enforces the workflow.
+        if self.instance is not None:
+            if getattr(state, 'pk', None) != self.instance.current_state_id:
+                raise serializers.ValidationError('Change the state through the transition endpoint.')
+        elif state is not None:
+            try:
+                get_workflow().check(None, state.pk)
+            except TransitionNotAllowed:
+                raise serializers.ValidationError('Manuscripts cannot start in this state.')
+        return state
+
+class ManuscriptTransitionSerializer(serializers.Serializer):
+    to_state = serializers.IntegerField()
+    # The state the client saw; the transition fails if it has changed since.
+    from_state = serializers.IntegerField(required=False, allow_null=True)
+
+class ManuscriptVersionSerializer(DynamicFieldsModelSerializer):
+    expandable_fields = {'manuscript': ManuscriptSerializer}
+
     class Meta:
         model = ManuscriptVersion
         fields = '__all__'
 
-class ManuscriptStatusHistorySerializer(serializers.ModelSerializer):
+class ManuscriptStatusHistorySerializer(DynamicFieldsModelSerializer):
+    expandable_fields = {
+        'manuscript': ManuscriptSerializer,
+        'state': 'apps.workflow.serializers.WorkflowStateSerializer',
+        'changed_by': 'apps.users.serializers.UserSummarySerializer',
+    }
+
     class Meta:
         model = ManuscriptStatusHistory
         fields = '__all__'
 
 ## Review-related serializers were moved to backend/apps/reviews/serializers.py
 
-class EditorAssignmentSerializer(serializers.ModelSerializer):
+class EditorAssignmentSerializer(DynamicFieldsModelSerializer):
+    expandable_fields = {'manuscript': ManuscriptSerializer, 'editor': 'apps.users.serializers.UserSummarySerializer'}
+
     class Meta:
         model = EditorAssignment
         fields = '__all__'
 
-class DecisionSerializer(serializers.ModelSerializer):
+class DecisionSerializer(DynamicFieldsModelSerializer):
+    expandable_fields = {'manuscript': ManuscriptSerializer, 'decided_by': 'apps.users.serializers.UserSummarySerializer'}
+
     class Meta:
         model = Decision
         fields = '__all__'
+
+class DossierReviewRoundSerializer(ReviewRoundSerializer):
+    reviews = ReviewSerializer(many=True, read_only=True)
+    assignments = ReviewAssignmentSerializer(many=True, read_only=True)
+
+class ManuscriptDossierSerializer(ManuscriptSerializer):
+    """
+    A manuscript with its versions, status history, editor assignments,
+    decisions, review rounds (with reviews and assignments) and files.
+    Render instances loaded with repositories.prefetch_dossier().
+    """
+
+    versions = ManuscriptVersionSerializer(many=True, read_only=True)
+    status_history = ManuscriptStatusHistorySerializer(many=True, read_only=True)
+    editor_assignments = EditorAssignmentSerializer(many=True, read_only=True)
+    decisions = DecisionSerializer(many=True, read_only=True)
+    review_rounds = DossierReviewRoundSerializer(many=True, read_only=True)
+    files = ManuscriptFileSerializer(source='manuscriptfile_set', many=True, read_only=True, expand={'file': {}})
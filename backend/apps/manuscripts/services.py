@@ -0,0 +1,68 @@
+from django.core.cache import cache
+from django.utils.http import quote_etag
+
+from core.caching import bump_generation, content_etag, get_generations, is_shared_cache
+from .models import Manuscript
+from .repositories import prefetch_dossier, scoped_review_rounds, sees_all_reviews
+from .serializers import DossierReviewRoundSerializer, ManuscriptDossierSerializer
+
+# -------------------------
+# Dossier
+# -------------------------
+
+DOSSIER_KEY = 'dossier:{}:{}'
+DOSSIER_TTL = 60 * 60
+# Without a shared cache other processes never see a manuscript's generation
+# move, so their copies must expire on their own.
+DOSSIER_LOCAL_TTL = 30
+
+
+def dossier_generation(manuscript_id):
+    (generation,) = get_generations((Manuscript,), scope=manuscript_id)
+    return generation
+
+
+def dossier_audience(manuscript_id, user) -> str:
+    """
+    ``'all'`` for viewers who see every review of the manuscript, otherwise
+    one audience per user: peer review stays confidential (see
+    apps.reviews.repositories).
+    """
+    return 'all' if sees_all_reviews(user, manuscript_id) else f'user-{user.pk}'
+
+
+def dossier_etag(manuscript_id, generation, audience, data=None) -> str:
+    """
+    Tag derived from the generation when the cache is shared. Otherwise the
+    generation is only this process's, so the tag is derived from ``data``.
+    """
+    if data is not None:
+        return content_etag(data)
+    return quote_etag(f'dossier-{manuscript_id}-{generation}-{audience}')
+
+
+def get_dossier(manuscript, generation, audience, user):
+    """
+    The rendered dossier of ``manuscript`` at ``generation`` for ``user``,
+    built from a fixed number of queries. The full dossier is cached and
+    served as is to the ``'all'`` audience; everyone else gets its review
+    rounds replaced by those scoped to them, queried per request. Read the
+    generation before the rows so a dossier built while a write commits is
+    stored under the generation that write retires.
+    """
+    key = DOSSIER_KEY.format(manuscript.pk, generation)
+    data = cache.get(key)
+    if data is None:
+        data = ManuscriptDossierSerializer(prefetch_dossier(manuscript)).data
+        cache.set(key, data, DOSSIER_TTL if is_shared_cache('default') else DOSSIER_LOCAL_TTL)
+    if audience != 'all':
+        rounds = scoped_review_rounds(manuscript.pk, user)
+        data = {**data, 'review_rounds': DossierReviewRoundSerializer(rounds, many=True).data}
+    return data
+
+
+def invalidate_dossiers(manuscript_ids):
+    """Retire the cached dossiers of these manuscripts once the transaction commits."""
+    for manuscript_id in set(manuscript_ids):
+        if manuscript_id is not None:
+            bump_generation(Manuscript, scope=manuscript_id)
@@ -1,5 +1,15 @@
-from rest_framework import viewsets
+from django.db import transaction
+from django.utils.cache import get_conditional_response, patch_cache_control
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from apps.users.permissions import require_permission
+from apps.workflow.services import StaleState, TransitionNotAllowed
+from core.async_views import AsyncListModelMixin, AsyncViewSetMixin
+from core.caching import is_shared_cache
+from core.exports import ExportMixin
+from core.renderers import StreamingJSONMixin
+from core.viewsets import BulkWriteMixin, ScopedQuerysetMixin, SparseFieldsMixin, ValuesListMixin
 from .models import (
     Manuscript,
     ManuscriptVersion,
@@ -9,22 +19,42 @@ from .models import (
 )
 from .serializers import (
     ManuscriptSerializer,
+    ManuscriptTransitionSerializer,
     ManuscriptVersionSerializer,
     ManuscriptStatusHistorySerializer,
     EditorAssignmentSerializer,
     DecisionSerializer
 )
+from .repositories import scope_manuscripts, scope_manuscript_children
+from .services import dossier_audience, dossier_etag, dossier_generation, get_dossier
+from .workflows import allowed_next_states, enter_workflow, transition_manuscript
 
-class ManuscriptViewSet(viewsets.ModelViewSet):
+# Manuscripts per allowed-transitions request.
+MAX_TRANSITION_IDS = 500
+
+class ManuscriptViewSet(
+    ExportMixin, AsyncListModelMixin, StreamingJSONMixin, ValuesListMixin, SparseFieldsMixin, ScopedQuerysetMixin,
+    AsyncViewSetMixin, viewsets.ModelViewSet,
+):
     queryset = Manuscript.objects.all()
     serializer_class = ManuscriptSerializer
+    ordering = ('-submitted_at', '-id')
+    ordering_fields = ('submitted_at',)
+    filter_fields = {
+        'journal': ('exact', 'in'),
+        'section': ('exact', 'in'),
+        'current_state': ('exact', 'in'),
+        'corresponding_author': ('exact',),
+        'submitted_at': ('gte', 'lt'),
+    }
+    scope_queryset = staticmethod(scope_manuscripts)
 
     def get_permissions(self):
-        if self.action in ["list", "retrieve"]:
+        if self.action in ["list", "retrieve", "export"]:
             perm = require_permission('view_submissions')
         elif self.action in ["create"]:
             perm = require_permission('submit_manuscript')
-        elif self.action in ["update", "partial_update"]:
+        elif self.action in ["update", "partial_update", "transition"]:
             perm = require_permission('assign_editors')
         elif self.action in ["destroy"]:
             perm = require_permission('make_final_decision')
@@ -32,9 +62,74 @@ class ManuscriptViewSet(viewsets.ModelViewSet):
             perm = require_permission('view_submissions')
         return [perm()]
 
-class ManuscriptVersionViewSet(viewsets.ModelViewSet):
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            enter_workflow(serializer.save(), self.request.user)
+
+    @action(detail=True, methods=['get'])
+    def dossier(self, request, pk=None):
+        """
+        The manuscript with its versions, history, editors, decisions, review
+        rounds and files in one response, cached until any of them changes.
+        Reviews and assignments are limited to those the user may see.
+        """
+        manuscript = self.get_object()
+        generation = dossier_generation(manuscript.pk)
+        audience = dossier_audience(manuscript.pk, request.user)
+        if is_shared_cache('default'):
+            etag = dossier_etag(manuscript.pk, generation, audience)
+            response = get_conditional_response(request, etag=etag) or Response(
+                get_dossier(manuscript, generation, audience, request.user)
+            )
+        else:
+            data = get_dossier(manuscript, generation, audience, request.user)
+            etag = dossier_etag(manuscript.pk, generation, audience, data)
+            response = get_conditional_response(request, etag=etag) or Response(data)
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    @action(detail=True, methods=['post'])
+    def transition(self, request, pk=None):
+        """
+        Move the manuscript along a workflow transition: ``{"to_state": id,
+        "from_state": id}``. ``from_state`` defaults to the current state;
+        409 if the manuscript has left it in the meantime.
+        """
+        manuscript = self.get_object()
+        serializer = ManuscriptTransitionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        from_state = data['from_state'] if 'from_state' in data else manuscript.current_state_id
+        try:
+            transition_manuscript(manuscript, data['to_state'], request.user, from_state)
+        except TransitionNotAllowed:
+            return Response({'to_state': ['Transition not allowed from this state.']},
+                            status=status.HTTP_400_BAD_REQUEST)
+        except StaleState:
+            return Response({'detail': 'The manuscript changed state; reload it and retry.'},
+                            status=status.HTTP_409_CONFLICT)
+        return Response(self.get_serializer(manuscript).data)
+
+    @action(detail=False, methods=['get'], url_path='allowed-transitions')
+    def allowed_transitions(self, request):
+        """``?ids=1,2,3`` -> the states each visible manuscript may move to, in one query."""
+        try:
+            ids = [int(value) for value in request.query_params.get('ids', '').split(',') if value]
+        except ValueError:
+            return Response({'ids': ['Expected comma-separated ids.']}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > MAX_TRANSITION_IDS:
+            return Response({'ids': [f'At most {MAX_TRANSITION_IDS} ids.']}, status=status.HTTP_400_BAD_REQUEST)
+        rows = self.get_queryset().filter(pk__in=ids).values_list('pk', 'current_state_id')
+        return Response(allowed_next_states(rows))
+
+class ManuscriptVersionViewSet(
+    StreamingJSONMixin, ValuesListMixin, SparseFieldsMixin, ScopedQuerysetMixin, viewsets.ModelViewSet
+):
     queryset = ManuscriptVersion.objects.all()
     serializer_class = ManuscriptVersionSerializer
+    ordering = ('-created_at', '-id')
+    scope_queryset = staticmethod(scope_manuscript_children)
 
     def get_permissions(self):
         if self.action in ["list", "retrieve"]:
@@ -45,9 +140,14 @@ class ManuscriptVersionViewSet(viewsets.ModelViewSet):
             perm = require_permission('view_submissions')
         return [perm()]
 
-class ManuscriptStatusHistoryViewSet(viewsets.ModelViewSet):
+class ManuscriptStatusHistoryViewSet(
+    BulkWriteMixin, StreamingJSONMixin, ValuesListMixin, SparseFieldsMixin, ScopedQuerysetMixin,
+    viewsets.ModelViewSet,
+):
     queryset = ManuscriptStatusHistory.objects.all()
     serializer_class = ManuscriptStatusHistorySerializer
+    ordering = ('-changed_at', '-id')
+    scope_queryset = staticmethod(scope_manuscript_children)
 
     def get_permissions(self):
         if self.action in ["list", "retrieve"]:
@@ -58,9 +158,13 @@ class ManuscriptStatusHistoryViewSet(viewsets.ModelViewSet):
 
 ## Review-related viewsets were moved to backend/apps/reviews/views.py
 
-class EditorAssignmentViewSet(viewsets.ModelViewSet):
+class EditorAssignmentViewSet(
+    BulkWriteMixin, StreamingJSONMixin, ValuesListMixin, SparseFieldsMixin, ScopedQuerysetMixin,
+    viewsets.ModelViewSet,
+):
     queryset = EditorAssignment.objects.all()
     serializer_class = EditorAssignmentSerializer
+    scope_queryset = staticmethod(scope_manuscript_children)
 
     def get_permissions(self):
         if self.action in ["list", "retrieve"]:
@@ -69,12 +173,16 @@ class EditorAssignmentViewSet(viewsets.ModelViewSet):
             perm = require_permission('assign_editors')
         return [perm()]
 
-class DecisionViewSet(viewsets.ModelViewSet):
+class DecisionViewSet(
+    ExportMixin, StreamingJSONMixin, ValuesListMixin, SparseFieldsMixin, ScopedQuerysetMixin, viewsets.ModelViewSet
+):
     queryset = Decision.objects.all()
     serializer_class = DecisionSerializer
+    ordering = ('-decided_at', '-id')
+    scope_queryset = staticmethod(scope_manuscript_children)
 
     def get_permissions(self):
-        if self.action in ["list", "retrieve"]:
+        if self.action in ["list", "retrieve", "export"]:
             perm = require_permission('view_submissions')
         else:
             perm = require_permission('make_final_decision')
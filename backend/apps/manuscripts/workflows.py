@@ -0,0 +1,54 @@
+from django.db import transaction
+
+from apps.workflow.services import StaleState, get_workflow
+from .models import Manuscript, ManuscriptStatusHistory
+
+# -------------------------
+# Manuscript transitions
+# -------------------------
+
+
+def enter_workflow(manuscript, user):
+    """
+    Record the state a new manuscript starts in, which must be one no
+    transition leads into. Call inside the transaction that creates it.
+    """
+    if manuscript.current_state_id is None:
+        return None
+    get_workflow().check(None, manuscript.current_state_id)
+    return ManuscriptStatusHistory.objects.create(
+        manuscript_id=manuscript.pk, state_id=manuscript.current_state_id, changed_by_id=user.pk,
+    )
+
+
+def transition_manuscript(manuscript, to_state_id, user, from_state_id) -> ManuscriptStatusHistory:
+    """
+    Move ``manuscript`` from ``from_state_id`` (the state the caller saw) to
+    ``to_state_id`` and record it in the status history, in one transaction.
+    Raises TransitionNotAllowed if the workflow has no such transition and
+    StaleState if the manuscript is no longer in ``from_state_id``.
+    """
+    get_workflow().check(from_state_id, to_state_id)
+    with transaction.atomic():
+        moved = Manuscript.objects.filter(pk=manuscript.pk, current_state_id=from_state_id).update(
+            current_state_id=to_state_id,
+        )
+        if not moved:
+            raise StaleState
+        # Its post_save retires the manuscript's cached dossier.
+        entry = ManuscriptStatusHistory.objects.create(
+            manuscript_id=manuscript.pk, state_id=to_state_id, changed_by_id=user.pk,
+        )
+    manuscript.current_state_id = to_state_id
+    return entry
+
+
+def allowed_next_states(rows) -> dict:
+    """``{manuscript id: [{'id', 'name'}, ...]}`` for ``(id, current_state_id)`` rows, without queries."""
+    workflow = get_workflow()
+    return {
+        manuscript_id: [
+            {'id': state_id, 'name': workflow.names[state_id]} for state_id in sorted(workflow.allowed(state))
+        ]
+        for manuscript_id, state in rows
+    }
@@ -8,6 +8,12 @@ class Notification(models.Model):
     read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # A user's inbox, newest first; keyset pagination seeks on it.
+            models.Index(fields=['recipient', 'created_at', 'id'], name='notification_inbox_idx'),
+        ]
+
 class NotificationType(models.Model):
     name = models.CharField(max_length=50, unique=True)
     description = models.TextField(blank=True)
@@ -0,0 +1,3 @@
+def scope_notifications(queryset, user):
+    """Notifications are private to their recipient, whatever the user's roles."""
+    return queryset.filter(recipient_id=user.pk)
@@ -1,10 +1,13 @@
 from rest_framework import serializers
+from core.serializers import DynamicFieldsModelSerializer
 from .models import Notification, NotificationType
 
-class NotificationSerializer(serializers.ModelSerializer):
+class NotificationSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = Notification
         fields = '__all__'
+        # Recipients can only mark notifications read.
+        read_only_fields = ('recipient', 'title', 'message', 'created_at')
 
 class NotificationTypeSerializer(serializers.ModelSerializer):
     class Meta:
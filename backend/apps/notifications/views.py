@@ -1,10 +1,21 @@
-from rest_framework import viewsets
+from rest_framework import mixins, viewsets
+from core.async_views import AsyncListModelMixin, AsyncRetrieveModelMixin, AsyncViewSetMixin
+from core.viewsets import ScopedQuerysetMixin, SparseFieldsMixin, ValuesListMixin
 from .models import Notification, NotificationType
+from .repositories import scope_notifications
 from .serializers import NotificationSerializer, NotificationTypeSerializer
 
-class NotificationViewSet(viewsets.ModelViewSet):
+class NotificationViewSet(
+    AsyncListModelMixin, AsyncRetrieveModelMixin, ValuesListMixin, SparseFieldsMixin, ScopedQuerysetMixin,
+    AsyncViewSetMixin, mixins.ListModelMixin, mixins.RetrieveModelMixin, mixins.UpdateModelMixin,
+    mixins.DestroyModelMixin, viewsets.GenericViewSet,
+):
+    """The requesting user's notifications; created by the system, marked read or deleted by the recipient."""
     queryset = Notification.objects.all()
     serializer_class = NotificationSerializer
+    ordering = ('-created_at', '-id')
+    filter_fields = {'read': ('exact',)}
+    scope_queryset = staticmethod(scope_notifications)
 
 class NotificationTypeViewSet(viewsets.ModelViewSet):
     queryset = NotificationType.objects.all()
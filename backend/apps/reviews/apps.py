@@ -6,4 +6,6 @@ class ReviewsConfig(AppConfig):
     name = 'apps.reviews'
     label = 'reviews'
 
-
+    def ready(self):
+        from . import metrics  # noqa: F401
+        return super().ready()
@@ -0,0 +1,15 @@
+from django.db.models import Count
+
+from apps.journals.models import Journal
+from core.metrics import domain_gauge
+from .models import ReviewAssignment
+
+
+@domain_gauge('review_assignments_pending', 'Review assignments not yet completed, per journal.', ['journal'])
+def pending_assignments_per_journal():
+    counts = dict(
+        ReviewAssignment.objects.filter(completed=False).order_by()
+        .values_list('review_round__manuscript__journal_id').annotate(n=Count('id'))
+    )
+    for journal_id, slug in Journal.objects.values_list('id', 'slug'):
+        yield (slug,), counts.get(journal_id, 0)
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('manuscripts', '0003_keyset_indexes'),
+        ('reviews', '0002_visibility_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reviewassignment',
+            index=models.Index(fields=['assigned_at', 'id'], name='reviewassign_assigned_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reviewcomment',
+            index=models.Index(fields=['created_at', 'id'], name='reviewcomment_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reviewfile',
+            index=models.Index(fields=['uploaded_at', 'id'], name='reviewfile_uploaded_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reviewrating',
+            index=models.Index(fields=['created_at', 'id'], name='reviewrating_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reviewround',
+            index=models.Index(fields=['started_at', 'id'], name='reviewround_started_id_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('manuscripts', '0004_filter_indexes'),
+        ('reviews', '0003_keyset_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['status', 'id'], name='review_status_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['reviewer', 'id'], name='review_reviewer_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(condition=models.Q(('status', 'Pending')), fields=['reviewer', 'id'], name='review_pending_reviewer_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_filter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reviewassignment',
+            index=models.Index(condition=models.Q(('completed', False)), fields=['review_round'], name='reviewassign_pending_rnd_idx'),
+        ),
+    ]
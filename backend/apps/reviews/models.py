@@ -9,6 +9,7 @@ class ReviewRound(models.Model):
 
     class Meta:
         unique_together = ("manuscript", "round_number")
+        indexes = [models.Index(fields=['started_at', 'id'], name='reviewround_started_id_idx')]
 
 
 class Review(models.Model):
@@ -20,25 +21,55 @@ class Review(models.Model):
     status = models.CharField(max_length=50, default='Pending')  # Pending, Submitted, Completed
     submitted_at = models.DateTimeField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # ReviewViewSet.filter_fields, in list order (-id).
+            models.Index(fields=['status', 'id'], name='review_status_id_idx'),
+            models.Index(fields=['reviewer', 'id'], name='review_reviewer_id_idx'),
+            # Outstanding work is a small slice of the table.
+            models.Index(
+                fields=['reviewer', 'id'], condition=models.Q(status='Pending'), name='review_pending_reviewer_idx',
+            ),
+        ]
+
 class ReviewAssignment(models.Model):
     review_round = models.ForeignKey(ReviewRound, related_name='assignments', on_delete=models.CASCADE)
     reviewer = models.ForeignKey(django_settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     assigned_at = models.DateTimeField(auto_now_add=True)
     completed = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['assigned_at', 'id'], name='reviewassign_assigned_id_idx'),
+            # Drives the "rounds I review" branch of visibility scoping.
+            models.Index(fields=['reviewer', 'review_round'], name='reviewassign_reviewer_rnd_idx'),
+            # Outstanding assignments (the pending-assignment gauges).
+            models.Index(fields=['review_round'], condition=models.Q(completed=False),
+                         name='reviewassign_pending_rnd_idx'),
+        ]
+
 class ReviewFile(models.Model):
     review = models.ForeignKey(Review, related_name='files', on_delete=models.CASCADE)
     file = models.FileField(upload_to='uploads/reviews/')
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [models.Index(fields=['uploaded_at', 'id'], name='reviewfile_uploaded_id_idx')]
+
 class ReviewComment(models.Model):
     review = models.ForeignKey(ReviewAssignment, on_delete=models.CASCADE)
     commenter = models.ForeignKey(django_settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     comment = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [models.Index(fields=['created_at', 'id'], name='reviewcomment_created_id_idx')]
+
 class ReviewRating(models.Model):
     review = models.ForeignKey(ReviewAssignment, on_delete=models.CASCADE)
     criterion = models.CharField(max_length=100)
     rating = models.IntegerField()  # e.g., 1-5 scale
     created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['created_at', 'id'], name='reviewrating_created_id_idx')]
@@ -0,0 +1,52 @@
+from apps.manuscripts.repositories import edited_manuscript_ids, has_oversight
+from .models import Review, ReviewAssignment, ReviewRound
+
+
+# Peer review is confidential: reviews and assignments are visible to the
+# reviewer concerned and to the manuscript's editors, never to its authors.
+
+def visible_assignment_ids(user):
+    own = ReviewAssignment.objects.filter(reviewer_id=user.pk).values('pk')
+    edited = ReviewAssignment.objects.filter(
+        review_round__manuscript_id__in=edited_manuscript_ids(user)
+    ).values('pk')
+    return own.union(edited)
+
+
+def visible_review_ids(user):
+    own = Review.objects.filter(reviewer_id=user.pk).values('pk')
+    edited = Review.objects.filter(manuscript_id__in=edited_manuscript_ids(user)).values('pk')
+    return own.union(edited)
+
+
+def visible_round_ids(user):
+    reviewing = ReviewAssignment.objects.filter(reviewer_id=user.pk).values('review_round_id')
+    edited = ReviewRound.objects.filter(manuscript_id__in=edited_manuscript_ids(user)).values('pk')
+    return reviewing.union(edited)
+
+
+def scope_review_rounds(queryset, user):
+    if has_oversight(user):
+        return queryset
+    return queryset.filter(pk__in=visible_round_ids(user))
+
+
+def scope_reviews(queryset, user, field='pk'):
+    if has_oversight(user):
+        return queryset
+    return queryset.filter(**{f'{field}__in': visible_review_ids(user)})
+
+
+def scope_assignments(queryset, user, field='pk'):
+    if has_oversight(user):
+        return queryset
+    return queryset.filter(**{f'{field}__in': visible_assignment_ids(user)})
+
+
+def scope_review_files(queryset, user):
+    return scope_reviews(queryset, user, field='review_id')
+
+
+def scope_assignment_children(queryset, user):
+    # ReviewComment and ReviewRating hang off ReviewAssignment.
+    return scope_assignments(queryset, user, field='review_id')
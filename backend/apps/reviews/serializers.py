@@ -1,33 +1,49 @@
-from rest_framework import serializers
+from core.serializers import DynamicFieldsModelSerializer
 from .models import ReviewRound, Review, ReviewAssignment, ReviewFile, ReviewComment, ReviewRating
 
 
-class ReviewRoundSerializer(serializers.ModelSerializer):
+class ReviewRoundSerializer(DynamicFieldsModelSerializer):
+    expandable_fields = {'manuscript': 'apps.manuscripts.serializers.ManuscriptSerializer'}
+
     class Meta:
         model = ReviewRound
         fields = '__all__'
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(DynamicFieldsModelSerializer):
+    expandable_fields = {
+        'manuscript': 'apps.manuscripts.serializers.ManuscriptSerializer',
+        'review_round': ReviewRoundSerializer,
+        'reviewer': 'apps.users.serializers.UserSummarySerializer',
+    }
+
     class Meta:
         model = Review
         fields = '__all__'
 
-class ReviewAssignmentSerializer(serializers.ModelSerializer):
+class ReviewAssignmentSerializer(DynamicFieldsModelSerializer):
+    expandable_fields = {'review_round': ReviewRoundSerializer, 'reviewer': 'apps.users.serializers.UserSummarySerializer'}
+
     class Meta:
         model = ReviewAssignment
         fields = '__all__'
 
-class ReviewFileSerializer(serializers.ModelSerializer):
+class ReviewFileSerializer(DynamicFieldsModelSerializer):
+    expandable_fields = {'review': ReviewSerializer}
+
     class Meta:
         model = ReviewFile
         fields = '__all__'
 
-class ReviewCommentSerializer(serializers.ModelSerializer):
+class ReviewCommentSerializer(DynamicFieldsModelSerializer):
+    expandable_fields = {'review': ReviewAssignmentSerializer, 'commenter': 'apps.users.serializers.UserSummarySerializer'}
+
     class Meta:
         model = ReviewComment
         fields = '__all__'
 
-class ReviewRatingSerializer(serializers.ModelSerializer):
+class ReviewRatingSerializer(DynamicFieldsModelSerializer):
+    expandable_fields = {'review': ReviewAssignmentSerializer}
+
     class Meta:
         model = ReviewRating
         fields = '__all__'
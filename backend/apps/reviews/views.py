@@ -1,14 +1,29 @@
 from rest_framework import viewsets
 from apps.users.permissions import require_permission
+from core.exports import ExportMixin
+from core.renderers import StreamingJSONMixin
+from core.viewsets import BulkWriteMixin, ScopedQuerysetMixin, SparseFieldsMixin, ValuesListMixin
 from .models import ReviewRound, Review, ReviewAssignment, ReviewFile, ReviewComment, ReviewRating
 from .serializers import ReviewRoundSerializer, ReviewSerializer, ReviewAssignmentSerializer, ReviewFileSerializer, ReviewCommentSerializer, ReviewRatingSerializer
+from .repositories import (
+    scope_review_rounds,
+    scope_reviews,
+    scope_assignments,
+    scope_review_files,
+    scope_assignment_children,
+)
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(
+    ExportMixin, StreamingJSONMixin, ValuesListMixin, SparseFieldsMixin, ScopedQuerysetMixin, viewsets.ModelViewSet
+):
     queryset = Review.objects.all()
     serializer_class = ReviewSerializer
+    ordering = ('-id',)
+    filter_fields = {'status': ('exact', 'in'), 'reviewer': ('exact',)}
+    scope_queryset = staticmethod(scope_reviews)
 
     def get_permissions(self):
-        if self.action in ["list", "retrieve"]:
+        if self.action in ["list", "retrieve", "export"]:
             perm = require_permission('view_submissions')
         elif self.action in ["create", "update", "partial_update", "destroy"]:
             perm = require_permission('review_manuscripts')
@@ -16,16 +31,25 @@ class ReviewViewSet(viewsets.ModelViewSet):
             perm = require_permission('view_submissions')
         return [perm()]
 
-class ReviewRoundViewSet(viewsets.ModelViewSet):
+class ReviewRoundViewSet(
+    StreamingJSONMixin, ValuesListMixin, SparseFieldsMixin, ScopedQuerysetMixin, viewsets.ModelViewSet
+):
     queryset = ReviewRound.objects.all()
     serializer_class = ReviewRoundSerializer
+    ordering = ('-started_at', '-id')
+    scope_queryset = staticmethod(scope_review_rounds)
 
     def get_permissions(self):
         return [require_permission('assign_reviewers')()]
 
-class ReviewAssignmentViewSet(viewsets.ModelViewSet):
+class ReviewAssignmentViewSet(
+    BulkWriteMixin, StreamingJSONMixin, ValuesListMixin, SparseFieldsMixin, ScopedQuerysetMixin,
+    viewsets.ModelViewSet,
+):
     queryset = ReviewAssignment.objects.all()
     serializer_class = ReviewAssignmentSerializer
+    ordering = ('-assigned_at', '-id')
+    scope_queryset = staticmethod(scope_assignments)
 
     def get_permissions(self):
         if self.action in ["list", "retrieve"]:
@@ -34,9 +58,13 @@ class ReviewAssignmentViewSet(viewsets.ModelViewSet):
             perm = require_permission('assign_reviewers')
         return [perm()]
 
-class ReviewFileViewSet(viewsets.ModelViewSet):
+class ReviewFileViewSet(
+    StreamingJSONMixin, ValuesListMixin, SparseFieldsMixin, ScopedQuerysetMixin, viewsets.ModelViewSet
+):
     queryset = ReviewFile.objects.all()
     serializer_class = ReviewFileSerializer
+    ordering = ('-uploaded_at', '-id')
+    scope_queryset = staticmethod(scope_review_files)
 
     def get_permissions(self):
         if self.action in ["list", "retrieve"]:
@@ -45,9 +73,13 @@ class ReviewFileViewSet(viewsets.ModelViewSet):
             perm = require_permission('review_manuscripts')
         return [perm()]
 
-class ReviewCommentViewSet(viewsets.ModelViewSet):
+class ReviewCommentViewSet(
+    StreamingJSONMixin, ValuesListMixin, SparseFieldsMixin, ScopedQuerysetMixin, viewsets.ModelViewSet
+):
     queryset = ReviewComment.objects.all()
     serializer_class = ReviewCommentSerializer
+    ordering = ('-created_at', '-id')
+    scope_queryset = staticmethod(scope_assignment_children)
 
     def get_permissions(self):
         if self.action in ["list", "retrieve"]:
@@ -56,9 +88,14 @@ class ReviewCommentViewSet(viewsets.ModelViewSet):
             perm = require_permission('review_manuscripts')
         return [perm()]
 
-class ReviewRatingViewSet(viewsets.ModelViewSet):
+class ReviewRatingViewSet(
+    BulkWriteMixin, StreamingJSONMixin, ValuesListMixin, SparseFieldsMixin, ScopedQuerysetMixin,
+    viewsets.ModelViewSet,
+):
     queryset = ReviewRating.objects.all()
     serializer_class = ReviewRatingSerializer
+    ordering = ('-created_at', '-id')
+    scope_queryset = staticmethod(scope_assignment_children)
 
     def get_permissions(self):
         if self.action in ["list", "retrieve"]:
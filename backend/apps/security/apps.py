@@ -6,4 +6,6 @@ class SecurityConfig(AppConfig):
     name = 'apps.security'
     label = 'security'
 
-
+    def ready(self):
+        from . import handlers  # noqa: F401
+        return super().ready()
@@ -0,0 +1,44 @@
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+
+from .services import api_token_index, hash_token
+
+
+class APITokenAuthentication(BaseAuthentication):
+    """
+    Authenticates ``Authorization: Token <key>`` headers against APIToken.
+    Keys are matched by prefix and hash through an expiry-aware cache. The
+    cache is per process, so the user is loaded together with the token row:
+    a token deleted or shortened in another process stops working at once.
+    """
+
+    keyword = 'Token'
+
+    def authenticate(self, request):
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed(_('Invalid token header.'))
+        try:
+            raw = auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed(_('Invalid token header.'))
+
+        user_id = api_token_index.lookup(raw)
+        if user_id is None:
+            raise exceptions.AuthenticationFailed(_('Invalid or expired token.'))
+        try:
+            user = get_user_model().objects.get(
+                pk=user_id, is_active=True,
+                apitoken__token=hash_token(raw), apitoken__expires_at__gt=timezone.now(),
+            )
+        except get_user_model().DoesNotExist:
+            raise exceptions.AuthenticationFailed(_('Token revoked or user inactive.'))
+        return user, raw
+
+    def authenticate_header(self, request):
+        return self.keyword
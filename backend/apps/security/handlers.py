@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import APIToken, TokenBlacklist
+from .services import api_token_index, blacklist_index
+
+
+@receiver([post_save, post_delete], sender=APIToken)
+def api_token_changed(sender, instance, **kwargs):
+    api_token_index.invalidate(instance.prefix)
+
+
+@receiver(post_save, sender=TokenBlacklist)
+def token_blacklisted(sender, instance, **kwargs):
+    blacklist_index.add(instance.token)
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.security.models import APIToken, TokenBlacklist
+
+
+class Command(BaseCommand):
+    help = "Delete expired API tokens and blacklist entries in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        batch_size = options['batch_size']
+        targets = (
+            ('API tokens', APIToken.objects.filter(expires_at__lte=now)),
+            ('blacklist entries', TokenBlacklist.objects.filter(expires_at__lte=now)),
+        )
+        for label, queryset in targets:
+            if options['dry_run']:
+                self.stdout.write(f"{queryset.count()} expired {label} would be deleted")
+                continue
+            total = 0
+            while True:
+                # Short per-batch transactions keep locks brief on large tables.
+                ids = list(queryset.values_list('pk', flat=True)[:batch_size])
+                if not ids:
+                    break
+                deleted, _ = queryset.model.objects.filter(pk__in=ids).delete()
+                total += deleted
+            self.stdout.write(self.style.SUCCESS(f"Deleted {total} expired {label}"))
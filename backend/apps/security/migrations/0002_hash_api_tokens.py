@@ -0,0 +1,44 @@
+import hashlib
+
+from django.db import migrations, models
+
+
+PREFIX_LENGTH = 8
+
+
+def hash_existing_tokens(apps, schema_editor):
+    APIToken = apps.get_model('security', 'APIToken')
+    for api_token in APIToken.objects.all().iterator():
+        raw = api_token.token
+        api_token.prefix = raw[:PREFIX_LENGTH]
+        api_token.token = hashlib.sha256(raw.encode()).hexdigest()
+        api_token.save(update_fields=['prefix', 'token'])
+
+
+def noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('security', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apitoken',
+            name='prefix',
+            field=models.CharField(db_index=True, default='', max_length=12),
+        ),
+        migrations.AlterField(
+            model_name='apitoken',
+            name='expires_at',
+            field=models.DateTimeField(db_index=True),
+        ),
+        migrations.AddField(
+            model_name='tokenblacklist',
+            name='expires_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.RunPython(hash_existing_tokens, noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('security', '0002_hash_api_tokens'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='securityevent',
+            name='ip_address',
+            field=models.GenericIPAddressField(null=True),
+        ),
+    ]
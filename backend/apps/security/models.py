@@ -9,18 +9,22 @@ class AuditLog(models.Model):
 class SecurityEvent(models.Model):
     user = models.ForeignKey(django_settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True)
     event_type = models.CharField(max_length=255)
-    ip_address = models.GenericIPAddressField()
+    ip_address = models.GenericIPAddressField(null=True)
     timestamp = models.DateTimeField(auto_now_add=True)
 
 class APIToken(models.Model):
     user = models.ForeignKey(django_settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    # Only the SHA-256 of the key is stored; the prefix narrows the lookup.
+    prefix = models.CharField(max_length=12, db_index=True, default='')
     token = models.CharField(max_length=255, unique=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    expires_at = models.DateTimeField()
+    expires_at = models.DateTimeField(db_index=True)
 
 class TokenBlacklist(models.Model):
+    # A JWT ``jti`` or an API token hash.
     token = models.CharField(max_length=255, unique=True)
     blacklisted_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(null=True, blank=True, db_index=True)
 
 class SystemSetting(models.Model):
     key = models.CharField(max_length=100, unique=True)
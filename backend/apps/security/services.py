@@ -0,0 +1,302 @@
+import atexit
+import hashlib
+import hmac
+import ipaddress
+import logging
+import math
+import secrets
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections
+from django.utils import timezone
+
+from .models import APIToken, SecurityEvent, TokenBlacklist
+
+logger = logging.getLogger(__name__)
+
+
+def _config(name) -> dict:
+    return getattr(settings, name, {})
+
+
+def hash_token(raw: str) -> str:
+    """Return the stored form of a token: its SHA-256 hex digest."""
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def token_prefix(raw: str) -> str:
+    return raw[:_config('API_TOKEN_AUTH').get('PREFIX_LENGTH', 8)]
+
+
+# -------------------------
+# API tokens
+# -------------------------
+
+def issue_api_token(user, lifetime):
+    """
+    Create an API token for ``user`` valid for ``lifetime`` (a timedelta).
+    Returns ``(raw_key, api_token)``; the raw key is never stored.
+    """
+    raw = secrets.token_urlsafe(32)
+    api_token = APIToken.objects.create(
+        user=user,
+        prefix=token_prefix(raw),
+        token=hash_token(raw),
+        expires_at=timezone.now() + lifetime,
+    )
+    return raw, api_token
+
+
+class APITokenIndex:
+    """
+    Process-local, prefix-indexed cache of API token hashes.
+
+    Each prefix maps to the ``(hash, user_id, expires_at)`` rows sharing it and
+    is kept for CACHE_TTL seconds, never past the earliest row expiry. Unknown
+    prefixes are cached too, so garbage keys cannot hammer the database.
+    Changes made in other processes are not seen until the entry expires;
+    APITokenAuthentication confirms the row when it loads the user.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, raw: str):
+        """Return the user id owning ``raw`` or None if invalid or expired."""
+        prefix = token_prefix(raw)
+        rows = self._rows_for(prefix)
+        digest = hash_token(raw)
+        now = timezone.now()
+        for token_hash, user_id, expires_at in rows:
+            if hmac.compare_digest(token_hash, digest):
+                if expires_at <= now or blacklist_index.is_blacklisted(token_hash):
+                    return None
+                return user_id
+        return None
+
+    def invalidate(self, prefix: str):
+        with self._lock:
+            self._entries.pop(prefix, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _rows_for(self, prefix: str):
+        now = time.monotonic()
+        entry = self._entries.get(prefix)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+
+        wall_now = timezone.now()
+        rows = tuple(
+            APIToken.objects.filter(prefix=prefix, expires_at__gt=wall_now)
+            .values_list('token', 'user_id', 'expires_at')
+        )
+        ttl = _config('API_TOKEN_AUTH').get('CACHE_TTL', 60)
+        if rows:
+            earliest = min(expires_at for _, _, expires_at in rows)
+            ttl = min(ttl, max((earliest - wall_now).total_seconds(), 0))
+        with self._lock:
+            if len(self._entries) >= _config('API_TOKEN_AUTH').get('MAX_CACHED_PREFIXES', 10000):
+                self._entries.pop(next(iter(self._entries)), None)
+            self._entries[prefix] = (now + ttl, rows)
+        return rows
+
+
+# -------------------------
+# Blacklist
+# -------------------------
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings. Membership tests may return false
+    positives but never false negatives.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(capacity, 1)
+        self.size = max(int(-capacity * math.log(error_rate) / (math.log(2) ** 2)), 8)
+        self.hash_count = max(int(round(self.size / capacity * math.log(2))), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value: str):
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.size
+
+    def add(self, value: str):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+class BlacklistIndex:
+    """
+    In-process Bloom filter over unexpired TokenBlacklist rows, rebuilt every
+    REFRESH_INTERVAL seconds. A negative answer is final, so the common
+    "not revoked" case never reaches the database; only possible hits are
+    confirmed with a query.
+
+    Entries added in other processes become visible after their next refresh.
+    """
+
+    def __init__(self):
+        self._filter = None
+        self._built_at = 0.0
+        self._lock = threading.Lock()
+
+    def is_blacklisted(self, value: str) -> bool:
+        if value not in self._current_filter():
+            return False
+        return TokenBlacklist.objects.filter(token=value).exists()
+
+    async def ais_blacklisted(self, value: str) -> bool:
+        bloom = self._filter
+        interval = _config('TOKEN_BLACKLIST').get('REFRESH_INTERVAL', 30)
+        if bloom is None or time.monotonic() - self._built_at > interval:
+            bloom = await sync_to_async(self.refresh)()
+        if value not in bloom:
+            return False
+        return await TokenBlacklist.objects.filter(token=value).aexists()
+
+    def add(self, value: str):
+        bloom = self._filter
+        if bloom is not None:
+            bloom.add(value)
+
+    def refresh(self):
+        values = list(
+            TokenBlacklist.objects.exclude(expires_at__lt=timezone.now()).values_list('token', flat=True)
+        )
+        config = _config('TOKEN_BLACKLIST')
+        # Leave headroom so entries added between refreshes keep the error rate.
+        bloom = BloomFilter(max(len(values) * 2, 1024), config.get('FALSE_POSITIVE_RATE', 0.01))
+        for value in values:
+            bloom.add(value)
+        with self._lock:
+            self._filter = bloom
+            self._built_at = time.monotonic()
+        return bloom
+
+    def _current_filter(self) -> BloomFilter:
+        interval = _config('TOKEN_BLACKLIST').get('REFRESH_INTERVAL', 30)
+        if self._filter is None or time.monotonic() - self._built_at > interval:
+            return self.refresh()
+        return self._filter
+
+
+def blacklist_token(value: str, expires_at=None):
+    """
+    Revoke a JWT ``jti`` or API token hash until ``expires_at`` (or forever).
+    """
+    entry, _ = TokenBlacklist.objects.get_or_create(token=value, defaults={'expires_at': expires_at})
+    return entry
+
+
+api_token_index = APITokenIndex()
+blacklist_index = BlacklistIndex()
+
+
+# -------------------------
+# Security events
+# -------------------------
+
+def normalize_ip(value):
+    """``value`` as a canonical IP address string, or None if it is not one."""
+    try:
+        return str(ipaddress.ip_address(str(value).strip()))
+    except ValueError:
+        return None
+
+
+class SecurityEventWriter:
+    """
+    Buffers SecurityEvent rows and writes them with one bulk INSERT once
+    BUFFER_SIZE events are pending or the oldest is FLUSH_INTERVAL seconds
+    old. Writes happen on a daemon thread, never on the request path; the
+    rest is flushed at exit. If the batch fails it is retried row by row,
+    and kept for the next flush if no row could be written.
+    """
+
+    def __init__(self):
+        self._pending = []
+        self._oldest = None
+        self._lock = threading.Lock()
+        self._due = threading.Event()
+        self._flusher = None
+
+    def add(self, event_type: str, ip_address, user_id=None):
+        config = _config('RATE_LIMIT')
+        event = SecurityEvent(user_id=user_id, event_type=event_type, ip_address=normalize_ip(ip_address))
+        with self._lock:
+            if not self._pending:
+                self._oldest = time.monotonic()
+            self._pending.append(event)
+            due = (
+                len(self._pending) >= config.get('EVENT_BUFFER_SIZE', 100)
+                or time.monotonic() - self._oldest >= config.get('EVENT_FLUSH_INTERVAL', 5)
+            )
+            if self._flusher is None:
+                self._start_flusher()
+        if due:
+            self._due.set()
+
+    def flush(self) -> int:
+        with self._lock:
+            pending, self._pending = self._pending, []
+            self._oldest = None
+        if not pending:
+            return 0
+        try:
+            SecurityEvent.objects.bulk_create(pending)
+            return len(pending)
+        except DatabaseError:
+            logger.exception("Could not write %d buffered security events; retrying one by one", len(pending))
+        failed = []
+        for event in pending:
+            try:
+                event.save(force_insert=True)
+            except DatabaseError:
+                failed.append(event)
+        if len(failed) == len(pending):
+            # Nothing could be written: most likely the database is unavailable.
+            self._requeue(failed)
+        elif failed:
+            logger.error("Dropped %d security events that could not be written", len(failed))
+        return len(pending) - len(failed)
+
+    def _requeue(self, events):
+        limit = _config('RATE_LIMIT').get('EVENT_BUFFER_SIZE', 100) * 10
+        with self._lock:
+            if not self._pending:
+                self._oldest = time.monotonic()
+            self._pending = (events + self._pending)[-limit:]
+
+    def _start_flusher(self):
+        self._flusher = threading.Thread(target=self._run_flusher, name='security-events', daemon=True)
+        self._flusher.start()
+        atexit.register(self.flush)
+
+    def _run_flusher(self):
+        interval = _config('RATE_LIMIT').get('EVENT_FLUSH_INTERVAL', 5)
+        while True:
+            self._due.wait(interval)
+            self._due.clear()
+            try:
+                self.flush()
+            except DatabaseError:
+                logger.exception("Could not write buffered security events")
+            finally:
+                close_old_connections()
+
+
+security_events = SecurityEventWriter()
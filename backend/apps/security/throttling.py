@@ -0,0 +1,199 @@
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from rest_framework.throttling import BaseThrottle
+
+from .services import normalize_ip, security_events
+
+# -------------------------
+# Rate limiting
+# -------------------------
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def _config() -> dict:
+    return getattr(settings, 'RATE_LIMIT', {})
+
+
+def parse_rate(rate: str) -> tuple:
+    """Parse a DRF-style rate such as ``'10/min'`` into ``(limit, seconds)``."""
+    count, period = rate.split('/')
+    return int(count), PERIODS[period[0]]
+
+
+@dataclass
+class Decision:
+    allowed: bool
+    retry_after: float = 0.0
+
+
+class LocalRateLimitBackend:
+    """
+    In-process token buckets: each key holds up to ``limit`` tokens refilled at
+    ``limit / period`` per second. Exact and lock-protected, but every worker
+    process counts separately.
+    """
+
+    def __init__(self):
+        self._buckets = {}
+        self._bursts = {}
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, limit: int, period: int) -> Decision:
+        now = time.monotonic()
+        refill = limit / period
+        with self._lock:
+            tokens, stamp = self._buckets.pop(key, (limit, now))
+            tokens = min(limit, tokens + (now - stamp) * refill)
+            if tokens >= 1:
+                decision = Decision(True)
+                tokens -= 1
+            else:
+                decision = Decision(False, (1 - tokens) / refill)
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > _config().get('MAX_LOCAL_KEYS', 100000):
+                self._buckets.pop(next(iter(self._buckets)))
+        return decision
+
+    def start_burst(self, key: str, period: int) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            if self._bursts.get(key, 0) > now:
+                return False
+            self._bursts[key] = now + period
+            if len(self._bursts) > _config().get('MAX_LOCAL_KEYS', 100000):
+                self._bursts.pop(next(iter(self._bursts)))
+        return True
+
+
+class CacheRateLimitBackend:
+    """
+    Sliding-window counters in the shared cache, so limits hold across worker
+    processes. The current fixed window is counted with an atomic ``incr`` and
+    the previous one is weighted by how much of it still overlaps the window.
+    """
+
+    PREFIX = 'ratelimit:'
+
+    @property
+    def cache(self):
+        return caches[_config().get('CACHE_ALIAS', 'default')]
+
+    def hit(self, key: str, limit: int, period: int) -> Decision:
+        now = time.time()
+        window, offset = divmod(now, period)
+        current = f'{self.PREFIX}{key}:{int(window)}'
+        previous = f'{self.PREFIX}{key}:{int(window) - 1}'
+        self.cache.add(current, 0, period * 2)
+        try:
+            count = self.cache.incr(current)
+        except ValueError:
+            # Evicted between add() and incr().
+            self.cache.set(current, 1, period * 2)
+            count = 1
+        weight = 1 - offset / period
+        estimated = count + self.cache.get(previous, 0) * weight
+        if estimated <= limit:
+            return Decision(True)
+        return Decision(False, period - offset)
+
+    def start_burst(self, key: str, period: int) -> bool:
+        return self.cache.add(f'{self.PREFIX}burst:{key}', 1, period)
+
+
+class RateLimiter:
+    """
+    Applies the per-scope rates in ``settings.RATE_LIMIT['RATES']``, e.g.
+    ``{'token': {'ip': '30/min', 'username': '10/min'}}``, to the identities
+    passed to ``check()``. The first rejection of a key within its period is
+    recorded as a SecurityEvent; the rest of the burst is not.
+    """
+
+    def __init__(self, backend=None):
+        self._backend = backend
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            path = _config().get('BACKEND', 'apps.security.throttling.CacheRateLimitBackend')
+            self._backend = import_string(path)()
+        return self._backend
+
+    def check(self, scope: str, ip: str, **identities) -> Decision:
+        config = _config()
+        if not config.get('ENABLED', True):
+            return Decision(True)
+        identities['ip'] = ip
+        rejected = None
+        for kind, rate in config.get('RATES', {}).get(scope, {}).items():
+            value = identities.get(kind)
+            if not value:
+                continue
+            limit, period = parse_rate(rate)
+            key = f'{scope}:{kind}:{self._digest(value)}'
+            decision = self.backend.hit(key, limit, period)
+            if decision.allowed:
+                continue
+            if self.backend.start_burst(key, period) and ip:
+                security_events.add(f'rate_limited:{scope}:{kind}', ip)
+            if rejected is None or decision.retry_after > rejected.retry_after:
+                rejected = decision
+        return rejected or Decision(True)
+
+    @staticmethod
+    def _digest(value) -> str:
+        # Usernames may hold characters that are unsafe in cache keys.
+        return hashlib.sha256(str(value).strip().lower().encode()).hexdigest()[:32]
+
+
+rate_limiter = RateLimiter()
+
+
+def client_ident(request):
+    """
+    Client IP as DRF's throttles see it: REMOTE_ADDR, or the address
+    REST_FRAMEWORK['NUM_PROXIES'] hops from the right of X-Forwarded-For.
+    None if that is not an IP address.
+    """
+    return normalize_ip(BaseThrottle().get_ident(request))
+
+
+class ScopedRateLimitThrottle(BaseThrottle):
+    """
+    DRF throttle backed by ``rate_limiter``. Throttles run in
+    ``APIView.initial()``, before the serializer validates credentials, so a
+    rejected request never reaches the password hasher or the database.
+    """
+
+    scope = None
+    username_field = None
+
+    def allow_request(self, request, view):
+        identities = {}
+        if self.username_field and isinstance(request.data, dict):
+            username = request.data.get(self.username_field)
+            if isinstance(username, str):
+                identities['username'] = username
+        self.decision = rate_limiter.check(self.scope, self.get_ident(request), **identities)
+        return self.decision.allowed
+
+    def get_ident(self, request):
+        return client_ident(request)
+
+    def wait(self):
+        return self.decision.retry_after
+
+
+class TokenObtainRateThrottle(ScopedRateLimitThrottle):
+    scope = 'token'
+    username_field = 'username'
+
+
+class TokenRefreshRateThrottle(ScopedRateLimitThrottle):
+    scope = 'token_refresh'
@@ -18,7 +18,7 @@ class RoleAdmin(admin.ModelAdmin):
 
 @admin.register(Permission)
 class PermissionAdmin(admin.ModelAdmin):
-    list_display = ("id", "code", "description")
+    list_display = ("id", "code", "bit", "description")
     search_fields = ("code",)
 
 
@@ -6,4 +6,6 @@ class UsersConfig(AppConfig):
     name = 'apps.users'
     label = 'users'
 
-
+    def ready(self):
+        from . import handlers  # noqa: F401
+        return super().ready()
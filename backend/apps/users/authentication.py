@@ -0,0 +1,97 @@
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from apps.security.services import blacklist_index
+from .services import permission_cache
+
+
+class PermissionClaimsUser(TokenUser):
+    """
+    Token-backed user carrying the permission mask stamped into the token, so
+    permission classes can authorize it without touching the database.
+    """
+
+    def __init__(self, token):
+        super().__init__(token)
+        self._permission_mask = int(token['perm_mask'], 16)
+
+
+class PermissionClaimsAuthentication(JWTAuthentication):
+    """
+    JWT authentication that trusts embedded permission claims instead of
+    loading the user row. Only active when JWT_PERMISSION_CLAIMS is enabled and
+    the token carries claims; otherwise it behaves like JWTAuthentication.
+
+    Tokens whose permission version no longer matches the user's are refused,
+    so revoking a role takes effect without waiting for the token to expire.
+    Tokens whose ``jti`` is blacklisted are refused as well.
+
+    ``aauthenticate`` is the same check for async views (core.async_views),
+    with the user row and grants read through the async ORM.
+    """
+
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        jti = validated_token.get(api_settings.JTI_CLAIM)
+        if jti and blacklist_index.is_blacklisted(jti):
+            raise InvalidToken(_("Token is blacklisted"))
+        return validated_token
+
+    def get_user(self, validated_token):
+        if not getattr(settings, 'JWT_PERMISSION_CLAIMS', False) or 'perm_version' not in validated_token:
+            return super().get_user(validated_token)
+
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        if permission_cache.get_version(user_id) != validated_token['perm_version']:
+            raise AuthenticationFailed(
+                _("Permissions have changed, please sign in again."),
+                code='permissions_changed',
+            )
+        return PermissionClaimsUser(validated_token)
+
+    async def aauthenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = JWTAuthentication.get_validated_token(self, raw_token)
+        jti = validated_token.get(api_settings.JTI_CLAIM)
+        if jti and await blacklist_index.ais_blacklisted(jti):
+            raise InvalidToken(_("Token is blacklisted"))
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        if getattr(settings, 'JWT_PERMISSION_CLAIMS', False) and 'perm_version' in validated_token:
+            if await permission_cache.aget_version(user_id) != validated_token['perm_version']:
+                raise AuthenticationFailed(
+                    _("Permissions have changed, please sign in again."),
+                    code='permissions_changed',
+                )
+            return PermissionClaimsUser(validated_token)
+
+        try:
+            user = await self.user_model.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code='user_not_found')
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code='user_inactive')
+        if api_settings.CHECK_REVOKE_TOKEN and (
+            validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password)
+        ):
+            raise AuthenticationFailed(_("The user's password has been changed."), code='password_changed')
+        return user
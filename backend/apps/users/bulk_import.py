@@ -0,0 +1,298 @@
+import csv
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
+
+from .models import Role, User, UserProfile, UserRole
+from .services import DEFAULT_ROLE_NAME, password_problem
+
+# -------------------------
+# Streaming bulk user import
+# -------------------------
+
+FORMATS = ('csv', 'jsonl')
+MAX_REPORTED_ERRORS = 1000
+
+
+def guess_format(filename: str, default='csv') -> str:
+    lowered = filename.lower()
+    if lowered.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    if lowered.endswith('.csv'):
+        return 'csv'
+    return default
+
+
+def count_rows(binary_file, fmt: str, limit: int) -> int:
+    """
+    Count the rows of a UTF-8 ``binary_file``, stopping at ``limit``, and
+    rewind it. Counting stops quietly where the file cannot be read; the
+    import reports that itself.
+    """
+    lines = io.TextIOWrapper(binary_file, encoding='utf-8', newline='')
+    count = 0
+    try:
+        for _ in islice(iter_rows(lines, fmt), limit):
+            count += 1
+    except (UnicodeDecodeError, csv.Error):
+        pass
+    finally:
+        lines.detach()
+        binary_file.seek(0)
+    return count
+
+
+def iter_rows(lines, fmt: str):
+    """
+    Yield ``(line_number, row_dict)`` from an iterable of text lines without
+    reading the whole input. Unparseable JSONL lines yield a ValueError.
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(lines)
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == 'jsonl':
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                yield number, exc
+                continue
+            yield number, row if isinstance(row, dict) else ValueError("Expected a JSON object")
+    else:
+        raise ValueError(f"Unsupported format {fmt!r}; expected one of {', '.join(FORMATS)}")
+
+
+def _hash_many(passwords):
+    return [make_password(password) for password in passwords]
+
+
+def _init_worker():
+    import django
+    django.setup()
+
+
+@dataclass
+class ImportReport:
+    """
+    Counters plus per-row errors. Errors are streamed to ``error_writer`` when
+    given (a csv.writer), otherwise the first MAX_REPORTED_ERRORS are kept.
+    """
+
+    error_writer: object = None
+    created: int = 0
+    failed: int = 0
+    errors: list = field(default_factory=list)
+    # Why reading stopped before the end of the input, if it did.
+    stopped: str = None
+
+    def add_error(self, line, email, message):
+        self.failed += 1
+        if self.error_writer is not None:
+            self.error_writer.writerow([line, email, message])
+        elif len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'email': email, 'error': message})
+
+    def as_dict(self):
+        report = {'created': self.created, 'failed': self.failed, 'errors': self.errors}
+        if self.stopped:
+            report['stopped'] = self.stopped
+        return report
+
+
+@dataclass
+class _PreparedRow:
+    line: int
+    email: str
+    password: str
+    first_name: str
+    last_name: str
+    affiliation: str
+    bio: str
+    role_id: int = None
+
+
+class BulkUserImporter:
+    """
+    Create users from a stream of rows in fixed-size batches.
+
+    Each batch is validated with one existing-email query, its passwords are
+    hashed while the previous batch is being written, and User, UserProfile
+    and UserRole rows are written with one bulk INSERT per table inside a
+    transaction. At most two batches are held in memory.
+
+    Passwords are hashed on ``executor`` when given (the web process passes
+    its shared hashing pool), in ``workers`` chunks per batch; otherwise on a
+    process pool of ``workers`` processes started for the run. Input that cannot be read (bad encoding,
+    broken CSV) ends the import after the rows read so far; committed
+    batches stay and the report says where it stopped.
+    """
+
+    def __init__(self, batch_size=1000, workers=None, default_role=DEFAULT_ROLE_NAME, report=None, executor=None):
+        self.batch_size = batch_size
+        self.executor = executor
+        self.workers = workers or os.cpu_count() or 1
+        self.report = report or ImportReport()
+        self.role_ids = dict(Role.objects.values_list('name', 'id'))
+        self.default_role_id = self.role_ids.get(default_role)
+
+    def run(self, rows) -> ImportReport:
+        if self.executor is not None:
+            return self._run(self.executor, rows)
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker) as executor:
+            return self._run(executor, rows)
+
+    def _run(self, executor, rows) -> ImportReport:
+        pending = None
+        for batch in self._batches(rows):
+            pending_emails = {row.email for row in pending[0]} if pending else set()
+            prepared = self._prepare(batch, pending_emails)
+            futures = self._submit_hashes(executor, prepared)
+            if pending:
+                self._write(*pending)
+            pending = (prepared, futures)
+        if pending:
+            self._write(*pending)
+        return self.report
+
+    def _batches(self, rows):
+        batch = []
+        last_line = 0
+        try:
+            for item in rows:
+                last_line = item[0]
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    yield batch
+                    batch = []
+        except (UnicodeDecodeError, csv.Error) as exc:
+            self.report.stopped = f"Could not read past line {last_line}: {exc}"
+        if batch:
+            yield batch
+
+    def _prepare(self, batch, pending_emails):
+        candidates = []
+        seen = set(pending_emails)
+        for line, row in batch:
+            if isinstance(row, Exception):
+                self.report.add_error(line, '', f"Invalid row: {row}")
+                continue
+            email = str(row.get('email') or '').strip().lower()
+            try:
+                validate_email(email)
+            except ValidationError:
+                self.report.add_error(line, email, "Enter a valid email address.")
+                continue
+            too_long = self._too_long(email, row)
+            if too_long:
+                self.report.add_error(line, email, too_long)
+                continue
+            if email in seen:
+                self.report.add_error(line, email, "Duplicate email in import.")
+                continue
+            password = row.get('password') or ''
+            if password:
+                problem = password_problem(password)
+                if problem:
+                    self.report.add_error(line, email, problem)
+                    continue
+            role_name = (row.get('role') or '').strip()
+            role_id = self.role_ids.get(role_name) if role_name else self.default_role_id
+            if role_name and role_id is None:
+                self.report.add_error(line, email, f"Unknown role {role_name!r}.")
+                continue
+            seen.add(email)
+            candidates.append(_PreparedRow(
+                line=line,
+                email=email,
+                password=password,
+                first_name=row.get('first_name') or '',
+                last_name=row.get('last_name') or '',
+                affiliation=row.get('organization') or row.get('affiliation') or '',
+                bio=row.get('biography') or row.get('bio') or '',
+                role_id=role_id,
+            ))
+
+        existing = set(
+            User.objects.annotate(email_lower=Lower('email'))
+            .filter(email_lower__in=[row.email for row in candidates])
+            .values_list('email_lower', flat=True)
+        )
+        prepared = []
+        for row in candidates:
+            if row.email in existing:
+                self.report.add_error(row.line, row.email, "Email already in use.")
+            else:
+                prepared.append(row)
+        return prepared
+
+    @staticmethod
+    def _too_long(email, row):
+        # The database would reject these with a DataError, failing the whole batch.
+        columns = (
+            ('email', email, User, 'username'),
+            ('first_name', row.get('first_name'), User, 'first_name'),
+            ('last_name', row.get('last_name'), User, 'last_name'),
+            ('organization', row.get('organization') or row.get('affiliation'), UserProfile, 'affiliation'),
+        )
+        for column, value, model, field_name in columns:
+            limit = model._meta.get_field(field_name).max_length
+            if value and len(str(value)) > limit:
+                return f"{column} is longer than {limit} characters."
+        return None
+
+    def _submit_hashes(self, executor, prepared):
+        # Rows without a password get an unusable one; they reset it later.
+        passwords = [row.password or None for row in prepared]
+        chunk = max(1, -(-len(passwords) // self.workers))
+        return [executor.submit(_hash_many, passwords[i:i + chunk]) for i in range(0, len(passwords), chunk)]
+
+    def _write(self, prepared, futures):
+        hashes = [password_hash for future in futures for password_hash in future.result()]
+        try:
+            with transaction.atomic():
+                self._insert(prepared, hashes)
+            self.report.created += len(prepared)
+        except IntegrityError:
+            # Lost a race with a concurrent registration; retry row by row so
+            # only the conflicting rows fail.
+            for row, password_hash in zip(prepared, hashes):
+                try:
+                    with transaction.atomic():
+                        self._insert([row], [password_hash])
+                    self.report.created += 1
+                except IntegrityError:
+                    self.report.add_error(row.line, row.email, "Email already in use.")
+
+    @staticmethod
+    def _insert(prepared, hashes):
+        users = User.objects.bulk_create([
+            User(
+                username=row.email,
+                email=row.email,
+                first_name=row.first_name,
+                last_name=row.last_name,
+                password=password_hash,
+            )
+            for row, password_hash in zip(prepared, hashes)
+        ])
+        UserProfile.objects.bulk_create([
+            UserProfile(user=user, affiliation=row.affiliation, bio=row.bio)
+            for user, row in zip(users, prepared)
+        ])
+        UserRole.objects.bulk_create([
+            UserRole(user=user, role_id=row.role_id)
+            for user, row in zip(users, prepared)
+            if row.role_id is not None
+        ])
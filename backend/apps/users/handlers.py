@@ -0,0 +1,96 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Permission, Role, RolePermission, User, UserProfile, UserRole
+from .repositories import assign_permission_bits, bump_permission_version, touch_profile
+from .services import forget_role_ids, permission_cache, set_profile_revision
+
+# User fields rendered by the profile endpoint.
+PROFILE_USER_FIELDS = {'email', 'first_name', 'last_name'}
+# User fields stamped into permission claims or checked with them.
+ACCESS_USER_FIELDS = ('is_superuser', 'is_staff', 'is_active')
+
+
+# Versions are bumped inside the writing transaction; cache versions are
+# replaced after commit so a concurrent request cannot re-cache the pre-change grants.
+
+@receiver(pre_save, sender=UserRole)
+def user_role_changing(sender, instance, **kwargs):
+    if instance.pk is not None:
+        # The row may be moving away from its current user.
+        bump_permission_version(userrole__pk=instance.pk)
+        transaction.on_commit(permission_cache.invalidate_all)
+
+
+@receiver(post_save, sender=UserRole)
+def user_role_saved(sender, instance, **kwargs):
+    bump_permission_version(pk=instance.user_id)
+    transaction.on_commit(partial(permission_cache.invalidate_user, instance.user_id))
+
+
+@receiver(post_delete, sender=UserRole)
+def user_role_deleted(sender, instance, **kwargs):
+    bump_permission_version(pk=instance.user_id)
+    transaction.on_commit(partial(permission_cache.invalidate_user, instance.user_id))
+
+
+@receiver([post_save, post_delete], sender=RolePermission)
+def role_permission_changed(sender, instance, **kwargs):
+    bump_permission_version(userrole__role_id=instance.role_id)
+    transaction.on_commit(permission_cache.invalidate_all)
+
+
+@receiver([post_save, post_delete], sender=Permission)
+def permission_changed(sender, **kwargs):
+    # Bit indexes are stable, so holders' masks are unaffected; deletions
+    # cascade through RolePermission and bump versions there.
+    transaction.on_commit(permission_cache.invalidate_all)
+
+
+@receiver(post_migrate)
+def permissions_migrated(sender, app_config=None, **kwargs):
+    # Data migrations create permissions through historical models, which
+    # bypass Permission.save(); give those their bits once migrate is done.
+    if app_config is not None and app_config.label == 'users':
+        assign_permission_bits()
+
+
+@receiver(pre_save, sender=User)
+def user_changing(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or instance.pk is None:
+        return
+    fields = [f for f in ACCESS_USER_FIELDS if update_fields is None or f in update_fields]
+    stored = User.objects.filter(pk=instance.pk).values_list(*fields).first() if fields else None
+    # Tokens issued before the change carry the old flags; retire them.
+    instance._access_changed = stored is not None and stored != tuple(getattr(instance, f) for f in fields)
+
+
+@receiver([post_save, post_delete], sender=User)
+def user_changed(sender, instance, **kwargs):
+    if instance.__dict__.pop('_access_changed', False):
+        bump_permission_version(pk=instance.pk)
+        instance.refresh_from_db(fields=['permission_version'])
+    # Deactivated or deleted users must stop passing the token version check.
+    transaction.on_commit(partial(permission_cache.invalidate_user, instance.pk))
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, update_fields=None, **kwargs):
+    if created or (update_fields is not None and not PROFILE_USER_FIELDS.intersection(update_fields)):
+        return
+    revision = touch_profile(instance.pk)
+    if revision is not None:
+        transaction.on_commit(partial(set_profile_revision, instance.pk, revision))
+
+
+@receiver(post_save, sender=UserProfile)
+def profile_saved(sender, instance, **kwargs):
+    transaction.on_commit(partial(set_profile_revision, instance.user_id, instance.updated_at))
+
+
+@receiver([post_save, post_delete], sender=Role)
+def role_changed(sender, **kwargs):
+    forget_role_ids()
@@ -0,0 +1,51 @@
+import csv
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.users.bulk_import import FORMATS, BulkUserImporter, ImportReport, guess_format, iter_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Create user accounts from a CSV or JSONL file. Columns: email, password, "
+        "first_name, last_name, organization, biography, role."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Input file, or '-' for stdin")
+        parser.add_argument('--format', choices=FORMATS, help="Defaults to the file extension")
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--workers', type=int, help="Password hashing processes (default: CPU count)")
+        parser.add_argument('--role', default=None, help="Role for rows without a role column")
+        parser.add_argument('--report', help="Write per-row errors to this CSV file")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or guess_format(path)
+        stream = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8')
+        report_file = open(options['report'], 'w', newline='', encoding='utf-8') if options['report'] else None
+        try:
+            report = ImportReport()
+            if report_file:
+                report.error_writer = csv.writer(report_file)
+                report.error_writer.writerow(['line', 'email', 'error'])
+            importer_kwargs = {'batch_size': options['batch_size'], 'workers': options['workers'], 'report': report}
+            if options['role']:
+                importer_kwargs['default_role'] = options['role']
+            importer = BulkUserImporter(**importer_kwargs)
+            try:
+                importer.run(iter_rows(stream, fmt))
+            except ValueError as exc:
+                raise CommandError(str(exc))
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+            if report_file:
+                report_file.close()
+
+        for error in report.errors:
+            self.stderr.write(f"line {error['line']} ({error['email']}): {error['error']}")
+        if report.stopped:
+            self.stderr.write(report.stopped)
+        self.stdout.write(self.style.SUCCESS(f"Created {report.created} users, {report.failed} rows failed"))
@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+
+def assign_bits(apps, schema_editor):
+    Permission = apps.get_model('users', 'Permission')
+    for bit, permission in enumerate(Permission.objects.order_by('id')):
+        permission.bit = bit
+        permission.save(update_fields=['bit'])
+
+
+def noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('users', '0006_remove_user_unique_user_email'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='permission',
+            name='bit',
+            field=models.PositiveSmallIntegerField(editable=False, null=True, unique=True),
+        ),
+        migrations.RunPython(assign_bits, noop),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('users', '0007_permission_bit'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='permission_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,32 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def create_missing_profiles(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    UserProfile = apps.get_model('users', 'UserProfile')
+    missing = User.objects.filter(userprofile__isnull=True).values_list('pk', flat=True)
+    UserProfile.objects.bulk_create(
+        [UserProfile(user_id=pk) for pk in missing.iterator()],
+        batch_size=1000,
+    )
+
+
+def noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('users', '0009_user_email_lower_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(create_missing_profiles, noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:36
+
+from django.db import migrations, models
+
+
+def seed_counter(apps, schema_editor):
+    Permission = apps.get_model('users', 'Permission')
+    PermissionBitCounter = apps.get_model('users', 'PermissionBitCounter')
+    highest = Permission.objects.aggregate(highest=models.Max('bit'))['highest']
+    next_bit = 0 if highest is None else highest + 1
+    # Permissions created around Permission.save() so far get bits too.
+    for permission in Permission.objects.filter(bit=None).order_by('id'):
+        permission.bit = next_bit
+        permission.save(update_fields=['bit'])
+        next_bit += 1
+    PermissionBitCounter.objects.create(pk=1, next_bit=next_bit)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0010_userprofile_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PermissionBitCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('next_bit', models.PositiveSmallIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(seed_counter, migrations.RunPython.noop),
+    ]
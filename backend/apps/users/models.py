@@ -1,11 +1,21 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Lower
 from django.contrib.auth.models import AbstractUser
 
 # --------------------
 # User & Roles
 # --------------------
 class User(AbstractUser):
-    pass
+    # Bumped whenever the user's roles or their roles' grants change, so
+    # permission claims embedded in issued tokens can be recognised as stale.
+    permission_version = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta(AbstractUser.Meta):
+        constraints = [
+            # One account per email regardless of case; its index also serves
+            # the case-insensitive lookups (registration, login by email).
+            models.UniqueConstraint(Lower('email'), name='users_user_email_lower_uniq'),
+        ]
 
 class Role(models.Model):
     name = models.CharField(max_length=50, unique=True)
@@ -17,10 +27,46 @@ class Role(models.Model):
 class Permission(models.Model):
     code = models.CharField(max_length=50, unique=True)
     description = models.TextField(blank=True)
+    # Position of this permission in compiled role/user bitmasks. Assigned once
+    # and never reused, so masks stay comparable across processes and tokens.
+    bit = models.PositiveSmallIntegerField(unique=True, null=True, editable=False)
 
     def __str__(self):
         return self.code
 
+    def save(self, *args, **kwargs):
+        if self.bit is not None:
+            return super().save(*args, **kwargs)
+        with transaction.atomic():
+            self.bit = PermissionBitCounter.allocate()
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'bit'}
+            super().save(*args, **kwargs)
+
+class PermissionBitCounter(models.Model):
+    """
+    Single row holding the next unassigned permission bit. Bits are handed
+    out under a row lock and the counter only moves forward, so a deleted
+    permission's bit is never given to another one.
+    """
+
+    next_bit = models.PositiveSmallIntegerField(default=0)
+
+    @classmethod
+    def allocate(cls) -> int:
+        """Reserve a bit; call inside the transaction that stores it."""
+        counter, _ = cls.objects.select_for_update().get_or_create(pk=1, defaults={'next_bit': cls._first_free})
+        bit = counter.next_bit
+        counter.next_bit = bit + 1
+        counter.save(update_fields=['next_bit'])
+        return bit
+
+    @staticmethod
+    def _first_free() -> int:
+        # Only if the counter row itself is lost; migration 0011 creates it.
+        highest = Permission.objects.aggregate(highest=models.Max('bit'))['highest']
+        return 0 if highest is None else highest + 1
+
 class RolePermission(models.Model):
     role = models.ForeignKey(Role, on_delete=models.CASCADE)
     permission = models.ForeignKey(Permission, on_delete=models.CASCADE)
@@ -45,6 +91,8 @@ class UserProfile(models.Model):
     gender = models.CharField(max_length=16, blank=True)
     birth_date = models.DateField(null=True, blank=True)
     title = models.CharField(max_length=64, blank=True)
+    # Revision stamp for conditional GETs; also bumped when the user's name changes.
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"Profile({self.user})"
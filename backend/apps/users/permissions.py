@@ -1,20 +1,46 @@
 from rest_framework.permissions import BasePermission
-from apps.users.models import RolePermission
+from apps.users.services import permission_cache
+from core.metrics import PERMISSION_CHECK_SECONDS
 
 
-def require_permission(code: str):
+def _build_requirement(codes, match_all: bool, name: str):
+    codes = tuple(codes)
+    timer = PERMISSION_CHECK_SECONDS.labels(name)
+
     class _HasPermission(BasePermission):
         def has_permission(self, request, view):
-            user = request.user
-            if not user or not user.is_authenticated:
-                return False
-            if getattr(user, 'is_superuser', False):
-                return True
-            return RolePermission.objects.filter(
-                role__userrole__user=user,
-                permission__code=code
-            ).exists()
-
-    _HasPermission.__name__ = f"HasPermission_{code}"
+            with timer.time():
+                user = request.user
+                if not user or not user.is_authenticated:
+                    return False
+                if getattr(user, 'is_superuser', False):
+                    return True
+                if match_all:
+                    return permission_cache.has_all(user, codes)
+                return permission_cache.has_any(user, codes)
+
+        async def ahas_permission(self, request, view):
+            with timer.time():
+                user = request.user
+                if not user or not user.is_authenticated:
+                    return False
+                if getattr(user, 'is_superuser', False):
+                    return True
+                if match_all:
+                    return await permission_cache.ahas_all(user, codes)
+                return await permission_cache.ahas_any(user, codes)
+
+    _HasPermission.__name__ = name
     return _HasPermission
 
+
+def require_permission(code: str):
+    return _build_requirement((code,), True, f"HasPermission_{code}")
+
+
+def require_all_permissions(*codes: str):
+    return _build_requirement(codes, True, f"HasAllPermissions_{'_'.join(codes)}")
+
+
+def require_any_permission(*codes: str):
+    return _build_requirement(codes, False, f"HasAnyPermission_{'_'.join(codes)}")
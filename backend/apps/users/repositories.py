@@ -0,0 +1,124 @@
+import logging
+
+from django.db.models import F
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from .models import Permission, Role, RolePermission, User, UserProfile
+
+logger = logging.getLogger(__name__)
+
+
+def get_permission_bits() -> dict:
+    """
+    Map every permission code to its single-bit mask.
+    """
+    return _permission_bits(Permission.objects.values_list('code', 'bit'))
+
+
+def get_role_masks() -> dict:
+    """
+    Map every role id to the OR of the bits of the permissions it grants.
+    """
+    return _role_masks(RolePermission.objects.values_list('role_id', 'permission__code', 'permission__bit'))
+
+
+def _permission_bits(rows) -> dict:
+    bits = {}
+    for code, bit in rows:
+        if _has_bit(code, bit):
+            bits[code] = 1 << bit
+    return bits
+
+
+def _role_masks(rows) -> dict:
+    masks = {}
+    for role_id, code, bit in rows:
+        if _has_bit(code, bit):
+            masks[role_id] = masks.get(role_id, 0) | (1 << bit)
+    return masks
+
+
+def _has_bit(code, bit) -> bool:
+    # Rows written around Permission.save() (bulk_create, data migrations) have
+    # no bit. They are left out, so only that permission is denied, and
+    # reported rather than failing every permission check.
+    if bit is None:
+        logger.error(
+            "Permission %r has no bit and is denied to everyone; run 'manage.py migrate' "
+            "or assign_permission_bits().", code,
+        )
+        return False
+    return True
+
+
+def assign_permission_bits() -> int:
+    """Give every permission without a bit the next free one. Returns how many were assigned."""
+    permissions = list(Permission.objects.filter(bit=None).order_by('id'))
+    for permission in permissions:
+        permission.save(update_fields=['bit'])
+    return len(permissions)
+
+
+def get_user_grants(user_id) -> tuple:
+    """
+    Return ``(permission_version, role_ids)`` for a user in a single query.
+    The version is None for missing or inactive users.
+    """
+    rows = User.objects.filter(pk=user_id, is_active=True).values_list('permission_version', 'userrole__role_id')
+    version = None
+    role_ids = set()
+    for version, role_id in rows:
+        if role_id is not None:
+            role_ids.add(role_id)
+    return version, tuple(sorted(role_ids))
+
+
+async def aget_permission_bits() -> dict:
+    return _permission_bits([row async for row in Permission.objects.values_list('code', 'bit')])
+
+
+async def aget_role_masks() -> dict:
+    rows = RolePermission.objects.values_list('role_id', 'permission__code', 'permission__bit')
+    return _role_masks([row async for row in rows])
+
+
+async def aget_user_grants(user_id) -> tuple:
+    """Async get_user_grants(), for the async request path."""
+    rows = User.objects.filter(pk=user_id, is_active=True).values_list('permission_version', 'userrole__role_id')
+    version = None
+    role_ids = set()
+    async for version, role_id in rows:
+        if role_id is not None:
+            role_ids.add(role_id)
+    return version, tuple(sorted(role_ids))
+
+
+def bump_permission_version(**filters):
+    """
+    Increment ``permission_version`` for every user matching ``filters``.
+    """
+    return User.objects.filter(**filters).update(permission_version=F('permission_version') + 1)
+
+
+def email_in_use(email: str, exclude_pk=None) -> bool:
+    """Case-insensitive email check served by the unique lower(email) index."""
+    users = User.objects.alias(email_lower=Lower('email')).filter(email_lower=email.lower())
+    if exclude_pk is not None:
+        users = users.exclude(pk=exclude_pk)
+    return users.exists()
+
+
+def get_role_id(name: str):
+    return Role.objects.filter(name=name).values_list('id', flat=True).first()
+
+
+def touch_profile(user_id):
+    """
+    Move the profile's revision stamp forward without loading it. Returns the
+    new stamp, or None if the user has no profile.
+    """
+    now = timezone.now()
+    if UserProfile.objects.filter(user_id=user_id).update(updated_at=now):
+        return now
+    return None
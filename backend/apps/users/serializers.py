@@ -1,6 +1,18 @@
 from rest_framework import serializers
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from .models import User, UserProfile, Role, UserRole
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import AccessToken
+from django.contrib.auth.hashers import make_password
+from core.serializers import DynamicFieldsModelSerializer
+from .models import User, UserProfile
+from .repositories import email_in_use
+from .bulk_import import FORMATS, count_rows, guess_format
+from .services import EmailInUse, add_permission_claims, password_problem, register_user
+
+
+EMAIL_IN_USE = "Email already in use."
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -8,6 +20,20 @@ class UserSerializer(serializers.ModelSerializer):
         model = User
         fields = ("id", "email", "is_active", "is_staff", "is_superuser")
 
+    def validate_email(self, value):
+        # The lower(email) constraint is an expression DRF cannot turn into a validator.
+        if value and email_in_use(value, exclude_pk=getattr(self.instance, 'pk', None)):
+            raise serializers.ValidationError(EMAIL_IN_USE)
+        return value
+
+
+class UserSummarySerializer(DynamicFieldsModelSerializer):
+    """Public view of a user, used when a relation to one is expanded."""
+
+    class Meta:
+        model = User
+        fields = ("id", "first_name", "last_name")
+
 
 class RegisterSerializer(serializers.Serializer):
     email = serializers.EmailField()
@@ -18,48 +44,40 @@ class RegisterSerializer(serializers.Serializer):
     biography = serializers.CharField(required=False, allow_blank=True)
 
     def validate_email(self, value):
-        if User.objects.filter(email__iexact=value).exists():
-            raise serializers.ValidationError("Email already in use.")
+        if email_in_use(value):
+            raise serializers.ValidationError(EMAIL_IN_USE)
         return value
 
     def validate(self, attrs):
-        password = attrs.get('password', '')
         # Enforce stronger password rules
-        if len(password) < 8:
-            raise serializers.ValidationError({"password": "Password must be at least 8 characters."})
-        if password.islower() or password.isupper():
-            raise serializers.ValidationError({"password": "Password must include both upper and lower case letters."})
-        if not any(ch.isdigit() for ch in password):
-            raise serializers.ValidationError({"password": "Password must include at least one digit."})
+        problem = password_problem(attrs.get('password', ''))
+        if problem:
+            raise serializers.ValidationError({"password": problem})
         return attrs
 
     def create(self, validated_data):
-        email = validated_data["email"].lower()
-        user = User(
-            username=email,
-            email=email,
-            first_name=validated_data.get("first_name", ""),
-            last_name=validated_data.get("last_name", ""),
-        )
-        user.set_password(validated_data["password"])
-        user.save()
-
-        # ensure a profile row exists and store initial data
-        profile, _ = UserProfile.objects.get_or_create(
-            user=user,
-            defaults={}
-        )
-        profile.affiliation = validated_data.get("organization", "")
-        profile.bio = validated_data.get("biography", "")
-        profile.save()
-
         try:
-            role = Role.objects.get(name='Visitor / Reader')
-            UserRole.objects.get_or_create(user=user, role=role)
-        except Role.DoesNotExist:
-            pass
+            return register_user(validated_data, make_password(validated_data["password"]))
+        except EmailInUse:
+            raise serializers.ValidationError({"email": [EMAIL_IN_USE]})
+
 
-        return user
+class UserImportSerializer(serializers.Serializer):
+    file = serializers.FileField()
+    # Defaults to the file extension.
+    format = serializers.ChoiceField(choices=FORMATS, required=False)
+    batch_size = serializers.IntegerField(min_value=1, max_value=5000, default=1000)
+
+    def validate(self, attrs):
+        # The import runs inside the request; larger files would outlast the
+        # worker and proxy timeouts part-way through.
+        limit = settings.USER_IMPORT['MAX_HTTP_ROWS']
+        attrs['format'] = attrs.get('format') or guess_format(attrs['file'].name)
+        if count_rows(attrs['file'].file, attrs['format'], limit + 1) > limit:
+            raise serializers.ValidationError({
+                "file": [f"More than {limit} rows; import larger files with 'manage.py import_users'."],
+            })
+        return attrs
 
 
 class UserProfileSerializer(serializers.ModelSerializer):
@@ -74,3 +92,21 @@ class UserProfileSerializer(serializers.ModelSerializer):
         ]
 
 
+class PermissionClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        if getattr(settings, 'JWT_PERMISSION_CLAIMS', False):
+            add_permission_claims(token, user)
+        return token
+
+
+class PermissionClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        if getattr(settings, 'JWT_PERMISSION_CLAIMS', False):
+            # Claims copied from the refresh token may be stale; restamp them.
+            access = AccessToken(data['access'])
+            user = User.objects.get(**{jwt_settings.USER_ID_FIELD: access[jwt_settings.USER_ID_CLAIM]})
+            data['access'] = str(add_permission_claims(access, user))
+        return data
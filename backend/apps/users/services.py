@@ -0,0 +1,437 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache, caches
+from django.db import IntegrityError, transaction
+from django.utils.http import quote_etag
+
+from core.metrics import CACHE_LOOKUPS
+from .models import User, UserProfile, UserRole
+from .repositories import (
+    aget_permission_bits, aget_role_masks, aget_user_grants,
+    get_permission_bits, get_role_id, get_role_masks, get_user_grants,
+)
+
+DEFAULT_ROLE_NAME = 'Visitor / Reader'
+
+_LOCAL_HITS = CACHE_LOOKUPS.labels('permission', 'local_hit')
+_SHARED_HITS = CACHE_LOOKUPS.labels('permission', 'shared_hit')
+_MISSES = CACHE_LOOKUPS.labels('permission', 'miss')
+
+
+# -------------------------
+# Permission cache
+# -------------------------
+
+class PermissionRegistry:
+    """
+    Compiled view of the RBAC tables: one bit per permission code and one
+    precomputed mask per role.
+    """
+
+    __slots__ = ('bits', 'role_masks')
+
+    def __init__(self, bits: dict, role_masks: dict):
+        self.bits = bits
+        self.role_masks = role_masks
+
+    def mask_for_codes(self, codes):
+        """
+        Return ``(mask, complete)`` where ``complete`` is False if any code is
+        unknown to the registry.
+        """
+        mask = 0
+        complete = True
+        for code in codes:
+            bit = self.bits.get(code)
+            if bit is None:
+                complete = False
+            else:
+                mask |= bit
+        return mask, complete
+
+    def mask_for_roles(self, role_ids) -> int:
+        mask = 0
+        for role_id in role_ids:
+            mask |= self.role_masks.get(role_id, 0)
+        return mask
+
+
+class PermissionCache:
+    """
+    Two-tier cache of the permission registry and of each user's grants
+    (permission version and role ids).
+
+    The first tier is process-local and its entries live for LOCAL_TTL seconds,
+    the second is the shared Django cache. Shared entries are stamped with a
+    global version which is replaced whenever grants change, so every process
+    stops trusting them at once; a user's entry is also stamped with that
+    user's version, replaced when only their grants change. A user's effective permissions are the OR of
+    their role masks, so every check is a single integer AND.
+    """
+
+    VERSION_KEY = 'perms:version'
+    REGISTRY_KEY = 'perms:registry'
+    USER_KEY = 'perms:user:{}'
+    USER_VERSION_KEY = 'perms:user-version:{}'
+
+    def __init__(self):
+        self._local = {}
+        self._registry = None
+        self._lock = threading.Lock()
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    @property
+    def config(self):
+        return getattr(settings, 'PERMISSION_CACHE', {})
+
+    @property
+    def shared(self):
+        return caches[self.config.get('CACHE_ALIAS', 'default')]
+
+    def get_registry(self) -> PermissionRegistry:
+        now = time.monotonic()
+        entry = self._registry
+        if entry is not None and entry[0] > now:
+            self.local_hits += 1
+            _LOCAL_HITS.inc()
+            return entry[1]
+
+        bits, role_masks = self._lookup(self.REGISTRY_KEY, self._load_registry, (self.VERSION_KEY,))
+        registry = PermissionRegistry(bits, role_masks)
+        self._registry = (now + self.config.get('LOCAL_TTL', 5), registry)
+        return registry
+
+    def get_grants(self, user_id) -> tuple:
+        # Token claims carry ids as strings; key everything the same way.
+        user_id = str(user_id)
+        now = time.monotonic()
+        entry = self._local.get(user_id)
+        if entry is not None and entry[0] > now:
+            self.local_hits += 1
+            _LOCAL_HITS.inc()
+            return entry[1]
+
+        grants = self._lookup(
+            self.USER_KEY.format(user_id), lambda: get_user_grants(user_id), self._user_version_keys(user_id),
+        )
+        self._remember(user_id, now, grants)
+        return grants
+
+    def get_role_ids(self, user_id) -> tuple:
+        return self.get_grants(user_id)[1]
+
+    def get_version(self, user_id):
+        return self.get_grants(user_id)[0]
+
+    def get_mask(self, user) -> int:
+        # Memoise on the user object so several permission classes on one
+        # request only consult the cache once.
+        mask = getattr(user, '_permission_mask', None)
+        if mask is None:
+            mask = self.get_registry().mask_for_roles(self.get_role_ids(user.pk))
+            user._permission_mask = mask
+        return mask
+
+    def has_all(self, user, codes) -> bool:
+        required, complete = self.get_registry().mask_for_codes(codes)
+        return complete and self.get_mask(user) & required == required
+
+    def has_any(self, user, codes) -> bool:
+        required, _ = self.get_registry().mask_for_codes(codes)
+        return bool(self.get_mask(user) & required)
+
+    def has_permission(self, user, code: str) -> bool:
+        return self.has_all(user, (code,))
+
+    # Async variants for the async request path (core.async_views). Local hits
+    # are answered inline; misses use the cache's async API and the async ORM.
+
+    async def aget_registry(self) -> PermissionRegistry:
+        now = time.monotonic()
+        entry = self._registry
+        if entry is not None and entry[0] > now:
+            self.local_hits += 1
+            _LOCAL_HITS.inc()
+            return entry[1]
+
+        bits, role_masks = await self._alookup(self.REGISTRY_KEY, self._aload_registry, (self.VERSION_KEY,))
+        registry = PermissionRegistry(bits, role_masks)
+        self._registry = (now + self.config.get('LOCAL_TTL', 5), registry)
+        return registry
+
+    async def aget_grants(self, user_id) -> tuple:
+        user_id = str(user_id)
+        now = time.monotonic()
+        entry = self._local.get(user_id)
+        if entry is not None and entry[0] > now:
+            self.local_hits += 1
+            _LOCAL_HITS.inc()
+            return entry[1]
+
+        grants = await self._alookup(
+            self.USER_KEY.format(user_id), lambda: aget_user_grants(user_id), self._user_version_keys(user_id),
+        )
+        self._remember(user_id, now, grants)
+        return grants
+
+    async def aget_version(self, user_id):
+        return (await self.aget_grants(user_id))[0]
+
+    async def aget_mask(self, user) -> int:
+        mask = getattr(user, '_permission_mask', None)
+        if mask is None:
+            registry = await self.aget_registry()
+            mask = registry.mask_for_roles((await self.aget_grants(user.pk))[1])
+            user._permission_mask = mask
+        return mask
+
+    async def ahas_all(self, user, codes) -> bool:
+        required, complete = (await self.aget_registry()).mask_for_codes(codes)
+        return complete and await self.aget_mask(user) & required == required
+
+    async def ahas_any(self, user, codes) -> bool:
+        required, _ = (await self.aget_registry()).mask_for_codes(codes)
+        return bool(await self.aget_mask(user) & required)
+
+    def invalidate_user(self, user_id):
+        user_id = str(user_id)
+        with self._lock:
+            self._local.pop(user_id, None)
+        # Replace the user's version rather than deleting the entry: a miss that
+        # loaded the grants before the change committed would write them back.
+        self._reset_version(self.USER_VERSION_KEY.format(user_id), force=True)
+
+    def invalidate_all(self):
+        with self._lock:
+            self._local.clear()
+            self._registry = None
+        self._reset_version(force=True)
+
+    def stats(self) -> dict:
+        lookups = self.local_hits + self.shared_hits + self.misses
+        return {
+            'local_hits': self.local_hits,
+            'shared_hits': self.shared_hits,
+            'misses': self.misses,
+            'hit_ratio': (lookups - self.misses) / lookups if lookups else 0.0,
+            'local_entries': len(self._local),
+        }
+
+    def _user_version_keys(self, user_id) -> tuple:
+        return self.VERSION_KEY, self.USER_VERSION_KEY.format(user_id)
+
+    def _lookup(self, key, load, version_keys):
+        # The versions are read before the rows, so a load racing a change is
+        # stored under the versions that change replaces.
+        found = self.shared.get_many([*version_keys, key])
+        version = tuple(
+            found[version_key] if found.get(version_key) is not None else self._reset_version(version_key)
+            for version_key in version_keys
+        )
+        cached = found.get(key)
+        if cached is not None and cached[0] == version:
+            self.shared_hits += 1
+            _SHARED_HITS.inc()
+            return cached[1]
+        self.misses += 1
+        _MISSES.inc()
+        value = load()
+        self.shared.set(key, (version, value), self.config.get('SHARED_TTL', 300))
+        return value
+
+    async def _alookup(self, key, load, version_keys):
+        found = await self.shared.aget_many([*version_keys, key])
+        version = tuple([
+            found[version_key] if found.get(version_key) is not None else await self._areset_version(version_key)
+            for version_key in version_keys
+        ])
+        cached = found.get(key)
+        if cached is not None and cached[0] == version:
+            self.shared_hits += 1
+            _SHARED_HITS.inc()
+            return cached[1]
+        self.misses += 1
+        _MISSES.inc()
+        value = await load()
+        await self.shared.aset(key, (version, value), self.config.get('SHARED_TTL', 300))
+        return value
+
+    def _remember(self, user_id, now, grants):
+        with self._lock:
+            if len(self._local) >= self.config.get('MAX_LOCAL_ENTRIES', 10000):
+                self._local.pop(next(iter(self._local)), None)
+            self._local[user_id] = (now + self.config.get('LOCAL_TTL', 5), grants)
+
+    @staticmethod
+    def _load_registry():
+        return get_permission_bits(), get_role_masks()
+
+    @staticmethod
+    async def _aload_registry():
+        return await aget_permission_bits(), await aget_role_masks()
+
+    def _reset_version(self, key=VERSION_KEY, force=False):
+        # A fresh timestamp rather than a counter, so an evicted version key can
+        # never be recreated with a value that old entries still carry.
+        version = time.time_ns()
+        if force:
+            self.shared.set(key, version, None)
+            return version
+        if self.shared.add(key, version, None):
+            return version
+        return self.shared.get(key, version)
+
+    async def _areset_version(self, key=VERSION_KEY):
+        version = time.time_ns()
+        if await self.shared.aadd(key, version, None):
+            return version
+        return await self.shared.aget(key, version)
+
+
+permission_cache = PermissionCache()
+
+
+def add_permission_claims(token, user):
+    """
+    Stamp a JWT with the user's role ids, effective permission mask and
+    permission version so it can be authorized without a database lookup.
+    """
+    version, role_ids = permission_cache.get_grants(user.pk)
+    token['username'] = user.get_username()
+    token['is_staff'] = user.is_staff
+    token['is_superuser'] = user.is_superuser
+    token['roles'] = list(role_ids)
+    token['perm_mask'] = format(permission_cache.get_registry().mask_for_roles(role_ids), 'x')
+    token['perm_version'] = version
+    return token
+
+
+# -------------------------
+# Registration
+# -------------------------
+
+def password_problem(password: str):
+    """Return why ``password`` is too weak, or None if it is acceptable."""
+    if len(password) < 8:
+        return "Password must be at least 8 characters."
+    if password.islower() or password.isupper():
+        return "Password must include both upper and lower case letters."
+    if not any(ch.isdigit() for ch in password):
+        return "Password must include at least one digit."
+    return None
+
+
+_hash_executor = None
+_hash_executor_lock = threading.Lock()
+_role_ids = {}
+
+
+def get_hash_executor() -> ThreadPoolExecutor:
+    global _hash_executor
+    if _hash_executor is None:
+        with _hash_executor_lock:
+            if _hash_executor is None:
+                _hash_executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'PASSWORD_HASH_WORKERS', 4),
+                    thread_name_prefix='password-hash',
+                )
+    return _hash_executor
+
+
+async def hash_password(raw_password: str) -> str:
+    """
+    Hash a password on the bounded hashing pool so the event loop (and the
+    request thread under WSGI) is not pinned by the CPU-bound hasher.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_hash_executor(), make_password, raw_password)
+
+
+def default_role_id():
+    """Id of the role granted on registration, looked up once per process."""
+    if DEFAULT_ROLE_NAME not in _role_ids:
+        _role_ids[DEFAULT_ROLE_NAME] = get_role_id(DEFAULT_ROLE_NAME)
+    return _role_ids[DEFAULT_ROLE_NAME]
+
+
+def forget_role_ids():
+    _role_ids.clear()
+
+
+class EmailInUse(Exception):
+    """Another account registered the email between validation and insert."""
+
+
+def register_user(validated_data, password_hash: str) -> User:
+    """
+    Create the user, their profile and default role in one transaction with a
+    single INSERT per table. ``password_hash`` must already be hashed. Raises
+    EmailInUse if the unique lower(email) constraint rejects the insert.
+    """
+    email = validated_data["email"].lower()
+    try:
+        with transaction.atomic():
+            user = _create_user(email, validated_data, password_hash)
+    except IntegrityError:
+        raise EmailInUse(email) from None
+    return user
+
+
+def _create_user(email, validated_data, password_hash: str) -> User:
+    user = User.objects.create(
+        username=email,
+        email=email,
+        first_name=validated_data.get("first_name", ""),
+        last_name=validated_data.get("last_name", ""),
+        password=password_hash,
+    )
+    UserProfile.objects.create(
+        user=user,
+        affiliation=validated_data.get("organization", ""),
+        bio=validated_data.get("biography", ""),
+    )
+    role_id = default_role_id()
+    if role_id is not None:
+        # bulk_create skips the UserRole signals: a brand-new user has no
+        # cached grants or issued tokens to invalidate.
+        UserRole.objects.bulk_create([UserRole(user=user, role_id=role_id)])
+    return user
+
+
+# -------------------------
+# Profile revisions
+# -------------------------
+
+PROFILE_REVISION_KEY = 'profile:revision:{}'
+# Short, so a process that missed an update (per-process cache, no
+# REDIS_URL) stops answering the old ETag with 304 soon after.
+PROFILE_REVISION_TTL = 60
+
+
+def get_profile_revision(user_id):
+    """Cached ``UserProfile.updated_at`` for the user, or None."""
+    return cache.get(PROFILE_REVISION_KEY.format(user_id))
+
+
+def set_profile_revision(user_id, revision):
+    cache.set(PROFILE_REVISION_KEY.format(user_id), revision, PROFILE_REVISION_TTL)
+
+
+def remember_profile_revision(user_id, revision):
+    # Readers only replace an older stamp, never a newer one written by a
+    # concurrent update.
+    key = PROFILE_REVISION_KEY.format(user_id)
+    cached = cache.get(key)
+    if cached is None or cached < revision:
+        cache.set(key, revision, PROFILE_REVISION_TTL)
+
+
+def profile_etag(user_id, revision) -> str:
+    return quote_etag(f"{user_id}-{revision.timestamp():.6f}")
@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import UserViewSet, RegisterView, ProfileMeView
+from .views import UserViewSet, RegisterView, ProfileMeView, UserImportView
 
 router = DefaultRouter()
 router.register(r'users', UserViewSet, basename='user')
@@ -8,6 +8,7 @@ router.register(r'users', UserViewSet, basename='user')
 urlpatterns = [
     path('register/', RegisterView.as_view(), name='register'),
     path('profile/', ProfileMeView.as_view(), name='profile_me'),
+    path('import/', UserImportView.as_view(), name='user_import'),
     path('', include(router.urls)),
 ]
 
@@ -1,8 +1,42 @@
+import io
+import json
+import math
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.http import JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.decorators import method_decorator
+from django.utils.http import http_date
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 from rest_framework import viewsets, permissions, status
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from apps.security.throttling import (
+    TokenObtainRateThrottle,
+    TokenRefreshRateThrottle,
+    client_ident,
+    rate_limiter,
+)
+from .bulk_import import BulkUserImporter, iter_rows
 from .models import User, UserProfile
-from .serializers import UserSerializer, RegisterSerializer, UserProfileSerializer
+from .serializers import (
+    EMAIL_IN_USE, UserSerializer, RegisterSerializer, UserImportSerializer, UserProfileSerializer,
+)
+from .services import (
+    EmailInUse,
+    get_hash_executor,
+    get_profile_revision,
+    hash_password,
+    profile_etag,
+    register_user,
+    remember_profile_revision,
+)
 
 
 class UserViewSet(viewsets.ModelViewSet):
@@ -11,54 +45,170 @@ class UserViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAdminUser]
 
 
-class RegisterView(APIView):
-    permission_classes = [permissions.AllowAny]
+class UserImportView(APIView):
+    """
+    Admin upload of a CSV/JSONL membership file (multipart field ``file``) of
+    at most USER_IMPORT['MAX_HTTP_ROWS'] rows; larger files go through the
+    import_users command. The upload is streamed from Django's temporary file
+    in batches; the response reports counts, the first per-row errors and, if
+    the file could not be read to the end, where the import stopped.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+    parser_classes = [MultiPartParser]
 
     def post(self, request):
-        serializer = RegisterSerializer(data=request.data)
+        serializer = UserImportSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        user = serializer.save()
-        return Response({"id": user.id, "email": user.email}, status=status.HTTP_201_CREATED)
+        upload = serializer.validated_data['file']
+        fmt = serializer.validated_data['format']
+        lines = io.TextIOWrapper(upload.file, encoding='utf-8', newline='')
+        # Hash on the process's bounded hashing pool rather than starting
+        # worker processes inside a web worker.
+        importer = BulkUserImporter(
+            batch_size=serializer.validated_data['batch_size'],
+            workers=settings.PASSWORD_HASH_WORKERS,
+            executor=get_hash_executor(),
+        )
+        report = importer.run(iter_rows(lines, fmt))
+        return Response(report.as_dict(), status=status.HTTP_201_CREATED if report.created else status.HTTP_200_OK)
+
+
+class ThrottledTokenObtainPairView(TokenObtainPairView):
+    throttle_classes = [TokenObtainRateThrottle]
+
+
+class ThrottledTokenRefreshView(TokenRefreshView):
+    throttle_classes = [TokenRefreshRateThrottle]
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class RegisterView(View):
+    """
+    Async registration: validation and the transactional insert run on the
+    ORM's thread, password hashing on the bounded hashing pool.
+    """
+
+    http_method_names = ['post', 'options']
+
+    async def post(self, request):
+        if request.content_type == 'application/json':
+            try:
+                data = json.loads(request.body or b'{}')
+            except ValueError as exc:
+                return JsonResponse({"detail": f"JSON parse error - {exc}"}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            data = request.POST.dict()
+
+        email = data.get("email") if isinstance(data, dict) else None
+        decision = await sync_to_async(rate_limiter.check)(
+            'register',
+            client_ident(request),
+            username=email if isinstance(email, str) else None,
+        )
+        if not decision.allowed:
+            wait = math.ceil(decision.retry_after)
+            response = JsonResponse(
+                {"detail": f"Request was throttled. Expected available in {wait} seconds."},
+                status=status.HTTP_429_TOO_MANY_REQUESTS,
+            )
+            response.headers['Retry-After'] = str(wait)
+            return response
+
+        serializer = RegisterSerializer(data=data)
+        if not await sync_to_async(serializer.is_valid)():
+            return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        password_hash = await hash_password(serializer.validated_data["password"])
+        try:
+            user = await sync_to_async(register_user)(serializer.validated_data, password_hash)
+        except EmailInUse:
+            # A concurrent registration claimed the email after validation.
+            return JsonResponse({"email": [EMAIL_IN_USE]}, status=status.HTTP_400_BAD_REQUEST)
+        return JsonResponse({"id": user.id, "email": user.email}, status=status.HTTP_201_CREATED)
 
 
 class ProfileMeView(APIView):
+    """
+    The signed-in user's profile. Responses carry an ETag and Last-Modified
+    derived from the profile's revision stamp, which is cached per user, so a
+    matching If-None-Match is answered with a 304 before the profile is read.
+    """
+
+    # Needs the real user row, never the stateless token user.
+    authentication_classes = [JWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        profile, _ = UserProfile.objects.get_or_create(user=request.user)
-        profile_data = UserProfileSerializer(profile).data
-        data = {
-            "email": request.user.email,
-            "first_name": getattr(request.user, "first_name", ""),
-            "last_name": getattr(request.user, "last_name", ""),
-            **profile_data,
-        }
-        return Response(data)
+        user = request.user
+        revision = get_profile_revision(user.pk)
+        if revision is not None:
+            not_modified = self._conditional_response(request, user, revision)
+            if not_modified is not None:
+                return not_modified
+
+        profile = self._get_profile(user)
+        remember_profile_revision(user.pk, profile.updated_at)
+        return (
+            self._conditional_response(request, user, profile.updated_at)
+            or self._profile_response(user, profile, UserProfileSerializer(profile).data)
+        )
 
     def put(self, request):
-        profile, _ = UserProfile.objects.get_or_create(user=request.user)
-        # Update user basic fields if provided
-        first_name = request.data.get('first_name')
-        last_name = request.data.get('last_name')
-        changed = False
-        if isinstance(first_name, str):
-            request.user.first_name = first_name
-            changed = True
-        if isinstance(last_name, str):
-            request.user.last_name = last_name
-            changed = True
-        if changed:
-            request.user.save()
-
-        serializer = UserProfileSerializer(instance=profile, data=request.data, partial=True)
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
-        data = {
-            "email": request.user.email,
-            "first_name": getattr(request.user, "first_name", ""),
-            "last_name": getattr(request.user, "last_name", ""),
-            **serializer.data,
+        user = request.user
+        names = {
+            field: request.data[field]
+            for field in ('first_name', 'last_name')
+            if isinstance(request.data.get(field), str)
         }
-        return Response(data)
+        with transaction.atomic():
+            profile = self._get_profile(user)
+            serializer = UserProfileSerializer(instance=profile, data=request.data, partial=True)
+            serializer.is_valid(raise_exception=True)
+            if names:
+                # A queryset update skips the User signals: saving the profile
+                # below moves its revision stamp anyway.
+                User.objects.filter(pk=user.pk).update(**names)
+                for field, value in names.items():
+                    setattr(user, field, value)
+            serializer.save()
+        return self._profile_response(user, profile, serializer.data)
+
+    @staticmethod
+    def _get_profile(user):
+        try:
+            return UserProfile.objects.get(user=user)
+        except UserProfile.DoesNotExist:
+            # Registration creates the profile; this only covers accounts made
+            # through the admin or createsuperuser.
+            profile, _ = UserProfile.objects.get_or_create(user=user)
+            return profile
+
+    @staticmethod
+    def _conditional_response(request, user, revision):
+        response = get_conditional_response(
+            request,
+            etag=profile_etag(user.pk, revision),
+            last_modified=int(revision.timestamp()),
+        )
+        if response is not None:
+            ProfileMeView._add_validators(response, user, revision)
+        return response
 
+    @staticmethod
+    def _profile_response(user, profile, profile_data):
+        data = {
+            "email": user.email,
+            "first_name": getattr(user, "first_name", ""),
+            "last_name": getattr(user, "last_name", ""),
+            **profile_data,
+        }
+        return ProfileMeView._add_validators(Response(data), user, profile.updated_at)
 
+    @staticmethod
+    def _add_validators(response, user, revision):
+        response.headers['ETag'] = profile_etag(user.pk, revision)
+        response.headers['Last-Modified'] = http_date(revision.timestamp())
+        # Private to the user, and always revalidated.
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
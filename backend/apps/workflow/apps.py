@@ -7,5 +7,5 @@ class WorkflowConfig(AppConfig):
     label = 'workflow'
 
     def ready(self):
-        # Place for workflow signals/hooks if needed later
+        from . import handlers  # noqa: F401
         return super().ready()
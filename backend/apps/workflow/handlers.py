@@ -0,0 +1,13 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import WorkflowState, WorkflowTransition
+from .services import workflow_cache
+
+
+@receiver([post_save, post_delete], sender=WorkflowState)
+@receiver([post_save, post_delete], sender=WorkflowTransition)
+def workflow_changed(sender, **kwargs):
+    # Deleting a state cascades to its transitions; one invalidation covers both.
+    transaction.on_commit(workflow_cache.invalidate)
@@ -0,0 +1,8 @@
+from core.serializers import DynamicFieldsModelSerializer
+from .models import WorkflowState
+
+
+class WorkflowStateSerializer(DynamicFieldsModelSerializer):
+    class Meta:
+        model = WorkflowState
+        fields = ('id', 'name')
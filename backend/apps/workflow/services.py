@@ -0,0 +1,101 @@
+import threading
+import time
+
+from django.conf import settings
+
+from core.caching import bump_generation, get_generations
+from .models import WorkflowState, WorkflowTransition
+
+# -------------------------
+# Compiled workflow
+# -------------------------
+
+
+class TransitionNotAllowed(Exception):
+    pass
+
+
+class StaleState(Exception):
+    """The row left the state the transition was validated against."""
+
+
+class WorkflowGraph:
+    """
+    Compiled view of the workflow tables: state names and, per state, the
+    set of states it may move to. Rows without a state may enter any state
+    that no transition leads into.
+    """
+
+    __slots__ = ('names', 'next_states')
+
+    def __init__(self, names: dict, edges):
+        self.names = names
+        next_states = {}
+        for from_id, to_id in edges:
+            next_states.setdefault(from_id, set()).add(to_id)
+        targets = {to_id for to_ids in next_states.values() for to_id in to_ids}
+        next_states[None] = {state_id for state_id in names if state_id not in targets}
+        self.next_states = {from_id: frozenset(to_ids) for from_id, to_ids in next_states.items()}
+
+    def allowed(self, from_id) -> frozenset:
+        return self.next_states.get(from_id, frozenset())
+
+    def allows(self, from_id, to_id) -> bool:
+        return to_id in self.allowed(from_id)
+
+    def check(self, from_id, to_id):
+        if not self.allows(from_id, to_id):
+            raise TransitionNotAllowed(f'{self.names.get(from_id)} -> {self.names.get(to_id, to_id)}')
+
+
+def compile_workflow() -> WorkflowGraph:
+    names = dict(WorkflowState.objects.values_list('id', 'name'))
+    return WorkflowGraph(names, WorkflowTransition.objects.values_list('from_state_id', 'to_state_id'))
+
+
+class WorkflowCache:
+    """
+    The compiled graph, kept per process. After LOCAL_TTL seconds it is
+    revalidated against the WorkflowTransition generation (one cache
+    lookup) and only recompiled if a state or transition has changed since,
+    or if it is older than MAX_AGE: with a per-process cache the generation
+    never moves for changes made by other workers.
+    """
+
+    def __init__(self):
+        self._entry = None
+        self._lock = threading.Lock()
+
+    @property
+    def config(self):
+        return getattr(settings, 'WORKFLOW', {})
+
+    def get(self) -> WorkflowGraph:
+        now = time.monotonic()
+        entry = self._entry
+        if entry is not None and entry[0] > now:
+            return entry[2]
+
+        # Read the generation before the rows: a graph compiled while a
+        # change commits is stored under the generation that change retires.
+        (generation,) = get_generations((WorkflowTransition,))
+        if entry is not None and entry[1] == generation and entry[3] > now:
+            graph, compiled_until = entry[2], entry[3]
+        else:
+            graph, compiled_until = compile_workflow(), now + self.config.get('MAX_AGE', 60)
+        with self._lock:
+            self._entry = (now + self.config.get('LOCAL_TTL', 5), generation, graph, compiled_until)
+        return graph
+
+    def invalidate(self):
+        """Drop this process's graph and, after commit, every other process's."""
+        bump_generation(WorkflowTransition)
+        with self._lock:
+            self._entry = None
+
+
+workflow_cache = WorkflowCache()
+
+
+def get_workflow() -> WorkflowGraph:
+    return workflow_cache.get()
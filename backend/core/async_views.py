@@ -0,0 +1,183 @@
+from asgiref.sync import markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.http import Http404
+from rest_framework import exceptions
+from rest_framework.permissions import AllowAny, BasePermission, IsAdminUser, IsAuthenticated
+from rest_framework.request import ForcedAuthentication
+from rest_framework.response import Response
+
+# -------------------------
+# Async views
+# -------------------------
+
+# Sync checks known not to do I/O; they run inline instead of on a thread.
+_INLINE_CHECKS = {
+    BasePermission.has_permission,
+    BasePermission.has_object_permission,
+    AllowAny.has_permission,
+    IsAuthenticated.has_permission,
+    IsAdminUser.has_permission,
+    ForcedAuthentication.authenticate,
+}
+
+
+def async_views_enabled() -> bool:
+    return getattr(settings, 'ASYNC_VIEWS', False)
+
+
+async def _call(obj, name, *args):
+    """Await ``obj.a<name>(*args)`` if defined, otherwise run ``obj.<name>`` off the event loop."""
+    method = getattr(obj, f'a{name}', None)
+    if method is not None:
+        return await method(*args)
+    if getattr(type(obj), name, None) in _INLINE_CHECKS:
+        return getattr(obj, name)(*args)
+    return await sync_to_async(getattr(obj, name))(*args)
+
+
+class AsyncViewSetMixin:
+    """
+    Serve a viewset as a coroutine when ``settings.ASYNC_VIEWS`` is on, which
+    core/settings/asgi.py does by default.
+
+    Authentication, permission checks and every action with an ``a<action>``
+    coroutine (see AsyncListModelMixin and AsyncRetrieveModelMixin) then run
+    on the event loop through the async ORM and cache API, so a request
+    waiting on I/O does not hold a worker thread. Other actions run as usual,
+    on a thread through sync_to_async. With ASYNC_VIEWS off, as under WSGI,
+    the viewset is the plain synchronous one.
+
+    Authenticators and permissions may implement ``aauthenticate(request)``,
+    ``ahas_permission(request, view)`` and ``ahas_object_permission(request,
+    view, obj)``; those that don't are called through sync_to_async.
+    """
+
+    async_dispatch = False
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        if async_views_enabled():
+            initkwargs.setdefault('async_dispatch', True)
+        view = super().as_view(actions, **initkwargs)
+        if initkwargs.get('async_dispatch'):
+            # The view returns dispatch()'s coroutine; let Django await it.
+            markcoroutinefunction(view)
+        return view
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.async_dispatch:
+            return super().dispatch(request, *args, **kwargs)
+        return self.adispatch(request, *args, **kwargs)
+
+    async def adispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+            handler = self.get_async_handler(request)
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    def get_async_handler(self, request):
+        method = request.method.lower()
+        if method not in self.http_method_names or not hasattr(self, method):
+            return sync_to_async(self.http_method_not_allowed)
+        handler = getattr(self, f'a{self.action}', None) if self.action else None
+        return handler or sync_to_async(getattr(self, method))
+
+    async def ainitial(self, request, *args, **kwargs):
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+        request.accepted_renderer, request.accepted_media_type = self.perform_content_negotiation(request)
+        request.version, request.versioning_scheme = self.determine_version(request, *args, **kwargs)
+
+        await self.aperform_authentication(request)
+        await self.acheck_permissions(request)
+        if self.get_throttles():
+            await sync_to_async(self.check_throttles)(request)
+
+    async def aperform_authentication(self, request):
+        for authenticator in request.authenticators:
+            try:
+                user_auth_tuple = await _call(authenticator, 'authenticate', request)
+            except exceptions.APIException:
+                request._not_authenticated()
+                raise
+            if user_auth_tuple is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = user_auth_tuple
+                return
+        request._not_authenticated()
+
+    async def acheck_permissions(self, request):
+        for permission in self.get_permissions():
+            if not await _call(permission, 'has_permission', request, self):
+                self.permission_denied(
+                    request,
+                    message=getattr(permission, 'message', None),
+                    code=getattr(permission, 'code', None),
+                )
+
+    async def acheck_object_permissions(self, request, obj):
+        for permission in self.get_permissions():
+            if not await _call(permission, 'has_object_permission', request, self, obj):
+                self.permission_denied(
+                    request,
+                    message=getattr(permission, 'message', None),
+                    code=getattr(permission, 'code', None),
+                )
+
+    async def apaginate_queryset(self, queryset):
+        paginator = self.paginator
+        if paginator is None:
+            return None
+        if hasattr(paginator, 'apaginate_queryset'):
+            return await paginator.apaginate_queryset(queryset, self.request, view=self)
+        return await sync_to_async(paginator.paginate_queryset)(queryset, self.request, view=self)
+
+    async def aget_object(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        filter_kwargs = {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        try:
+            obj = await queryset.aget(**filter_kwargs)
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404
+        await self.acheck_object_permissions(self.request, obj)
+        return obj
+
+
+class AsyncListModelMixin:
+    """
+    ``list`` through the async ORM, including the values() path of
+    ValuesListMixin. Serializers must not touch relations the queryset has
+    not loaded; Django refuses lazy queries on the event loop.
+    """
+
+    async def alist(self, request, *args, **kwargs):
+        values = self.get_values_queryset() if hasattr(self, 'get_values_queryset') else None
+        if values is None:
+            reader, queryset = None, self.filter_queryset(self.get_queryset())
+        else:
+            reader, queryset = values
+
+        rows = await self.apaginate_queryset(queryset)
+        paginated = rows is not None
+        if not paginated:
+            rows = [row async for row in queryset]
+        data = reader.render(rows) if reader is not None else self.get_serializer(rows, many=True).data
+        return self.get_paginated_response(data) if paginated else Response(data)
+
+
+class AsyncRetrieveModelMixin:
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        return Response(self.get_serializer(instance).data)
@@ -0,0 +1,213 @@
+import asyncio
+import contextvars
+import io
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import HttpRequest, HttpResponse, JsonResponse, QueryDict
+from django.urls import Resolver404, resolve
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+
+from .renderers import ORJSONRenderer
+
+logger = logging.getLogger(__name__)
+
+# -------------------------
+# Batch API
+# -------------------------
+
+READ_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+WRITE_METHODS = {'POST', 'PUT', 'PATCH', 'DELETE'}
+# Sub-request headers inherited from the batch request; authentication is
+# not among them, sub-requests reuse the batch request's user.
+INHERITED_META = ('HTTP_HOST', 'SERVER_NAME', 'SERVER_PORT', 'REMOTE_ADDR', 'HTTP_X_FORWARDED_FOR',
+                  'HTTP_ACCEPT_LANGUAGE', 'HTTP_USER_AGENT', 'HTTP_X_FORWARDED_PROTO')
+
+_renderer = ORJSONRenderer()
+_executor = None
+
+
+def _config() -> dict:
+    return getattr(settings, 'BATCH_API', {})
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        # Each worker thread holds its own database connection.
+        _executor = ThreadPoolExecutor(max_workers=_config().get('MAX_WORKERS', 4), thread_name_prefix='batch')
+    return _executor
+
+
+class _SubRequest(HttpRequest):
+    """A GET/POST/... against an API URL, made on behalf of the batch request's user."""
+
+    def __init__(self, parent, method, path, query, body, match, user, auth):
+        super().__init__()
+        self.method = method
+        self.path = self.path_info = path
+        self.META = {key: parent.META[key] for key in INHERITED_META if key in parent.META}
+        self.META.update(REQUEST_METHOD=method, PATH_INFO=path, QUERY_STRING=query, HTTP_ACCEPT='application/json')
+        self.GET = QueryDict(query)
+        if body is not None:
+            self._body = json.dumps(body).encode()
+            self._stream = io.BytesIO(self._body)
+            self._read_started = False
+            self.META.update(CONTENT_TYPE='application/json', CONTENT_LENGTH=str(len(self._body)))
+        self.resolver_match = match
+        self._scheme = parent.scheme
+        # DRF's Request authenticates these with ForcedAuthentication, so the
+        # token is decoded once and the permission mask memoised on the user
+        # is shared by every sub-request.
+        self.user = self._force_auth_user = user
+        self._force_auth_token = auth
+
+    def _get_scheme(self):
+        return self._scheme
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class BatchView(View):
+    """
+    ``POST /api/batch/`` with ``{"requests": [{"method", "path", "body"?}, ...]}``
+    runs each sub-request against the API's DRF views and answers
+    ``{"responses": [{"status", "headers", "body"}, ...]}`` in request order.
+
+    The batch request is authenticated once; sub-requests skip the middleware
+    and authentication and run as that user, under the target view's own
+    permission checks. Consecutive reads run concurrently on a small thread
+    pool; a write waits for everything before it and blocks everything after.
+    """
+
+    http_method_names = ['post', 'options']
+
+    async def post(self, request):
+        try:
+            user, auth = await sync_to_async(self.authenticate)(request)
+        except APIException as exc:
+            return JsonResponse({'detail': exc.detail}, status=exc.status_code)
+        if user is None or not user.is_authenticated:
+            return JsonResponse(
+                {'detail': 'Authentication credentials were not provided.'}, status=status.HTTP_401_UNAUTHORIZED,
+            )
+
+        try:
+            items = json.loads(request.body or b'{}').get('requests')
+        except (ValueError, AttributeError):
+            items = None
+        max_requests = _config().get('MAX_REQUESTS', 20)
+        if not isinstance(items, list) or not items or len(items) > max_requests:
+            return JsonResponse(
+                {'detail': f'Expected {{"requests": [...]}} with 1 to {max_requests} sub-requests.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        results = [None] * len(items)
+        reads = []
+        for index, item in enumerate(items):
+            prepared = self.prepare(request, item, user, auth)
+            if isinstance(prepared, bytes):
+                results[index] = prepared
+            elif prepared.method in READ_METHODS:
+                reads.append((index, prepared))
+            else:
+                await self.run_reads(reads, results)
+                reads = []
+                results[index] = await self.run(prepared)
+        await self.run_reads(reads, results)
+
+        return HttpResponse(b'{"responses":[' + b','.join(results) + b']}', content_type='application/json')
+
+    @staticmethod
+    def authenticate(request):
+        drf_request = Request(request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+        return drf_request.user, drf_request.auth
+
+    def prepare(self, request, item, user, auth):
+        """A _SubRequest for ``item``, or the encoded error response for it."""
+        if not isinstance(item, dict) or not isinstance(item.get('path'), str):
+            return _encode(status.HTTP_400_BAD_REQUEST, {}, _json({'detail': 'Each sub-request needs a "path".'}))
+        method = str(item.get('method', 'GET')).upper()
+        if method not in READ_METHODS | WRITE_METHODS:
+            return _encode(status.HTTP_405_METHOD_NOT_ALLOWED, {}, _json({'detail': f'Method "{method}" not allowed.'}))
+
+        url = urlsplit(item['path'])
+        try:
+            match = resolve(url.path)
+        except Resolver404:
+            match = None
+        view_class = getattr(match.func, 'cls', None) if match else None
+        if view_class is None or not issubclass(view_class, APIView):
+            return _encode(status.HTTP_404_NOT_FOUND, {}, _json({'detail': 'Not found.'}))
+        return _SubRequest(request, method, url.path, url.query, item.get('body'), match, user, auth)
+
+    async def run_reads(self, reads, results):
+        responses = await asyncio.gather(*(self.run(sub) for _, sub in reads))
+        for (index, _), response in zip(reads, responses):
+            results[index] = response
+
+    async def run(self, sub):
+        if iscoroutinefunction(sub.resolver_match.func):
+            # Async views (core.async_views) run on this event loop.
+            return await _acall(sub)
+        loop = asyncio.get_running_loop()
+        # Carry the request's context (e.g. its query statistics) onto the pool thread.
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(_get_executor(), context.run, _call, sub)
+
+
+def _call(sub):
+    close_old_connections()
+    try:
+        match = sub.resolver_match
+        return _encode_response(match.func(sub, *match.args, **match.kwargs))
+    except Exception:
+        logger.exception('Batch sub-request %s %s failed', sub.method, sub.path)
+        return _encode(status.HTTP_500_INTERNAL_SERVER_ERROR, {}, _json({'detail': 'A server error occurred.'}))
+    finally:
+        close_old_connections()
+
+
+async def _acall(sub):
+    try:
+        match = sub.resolver_match
+        return _encode_response(await match.func(sub, *match.args, **match.kwargs))
+    except Exception:
+        logger.exception('Batch sub-request %s %s failed', sub.method, sub.path)
+        return _encode(status.HTTP_500_INTERNAL_SERVER_ERROR, {}, _json({'detail': 'A server error occurred.'}))
+
+
+def _encode_response(response) -> bytes:
+    if hasattr(response, 'render') and not response.is_rendered:
+        response.render()
+    body = b''.join(response.streaming_content) if response.streaming else response.content
+    headers = {
+        name: value for name, value in response.items()
+        if name.lower() not in ('content-type', 'content-length', 'vary', 'allow')
+    }
+    return _encode(response.status_code, headers, body, response.get('Content-Type', ''))
+
+
+def _json(data) -> bytes:
+    return _renderer.render(data)
+
+
+def _encode(status_code, headers, body, content_type='application/json') -> bytes:
+    # JSON bodies are embedded as they are rather than parsed and re-encoded.
+    if not body:
+        body = b'null'
+    elif not content_type.startswith('application/json'):
+        body = _json(body.decode(errors='replace'))
+    return b'{"status":%d,"headers":%s,"body":%s}' % (status_code, _json(headers), body)
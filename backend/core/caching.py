@@ -0,0 +1,209 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from rest_framework.response import Response
+
+from .metrics import CACHE_LOOKUPS
+from .renderers import ORJSONRenderer
+
+# -------------------------
+# Generation counters
+# -------------------------
+
+GENERATION_KEY = 'generation:{}'
+
+_HITS = CACHE_LOOKUPS.labels('response', 'hit')
+_NOT_MODIFIED = CACHE_LOOKUPS.labels('response', 'not_modified')
+_MISSES = CACHE_LOOKUPS.labels('response', 'miss')
+
+
+def _config() -> dict:
+    return getattr(settings, 'RESPONSE_CACHE', {})
+
+
+def _cache():
+    return caches[_config().get('CACHE_ALIAS', 'default')]
+
+
+def is_shared_cache(alias=None) -> bool:
+    """
+    Whether every process sees the same cache. With a per-process backend
+    (locmem, dummy) a bump only reaches the process that made it, so other
+    processes must bound their staleness with short timeouts.
+    """
+    return not isinstance(caches[alias or _config().get('CACHE_ALIAS', 'default')], (LocMemCache, DummyCache))
+
+
+def content_etag(data) -> str:
+    """ETag for rendered ``data`` itself, for when a generation cannot vouch for it."""
+    return quote_etag(hashlib.sha256(ORJSONRenderer().render(data)).hexdigest()[:32])
+
+
+def _generation_key(model, scope=None) -> str:
+    key = GENERATION_KEY.format(model._meta.label_lower)
+    return key if scope is None else f'{key}:{scope}'
+
+
+def get_generations(models, scope=None) -> tuple:
+    """
+    Current generation of each model, in one cache round-trip. ``scope``
+    narrows the counters to one slice of the model's rows, such as a single
+    manuscript. A missing counter is seeded from the clock rather than
+    restarted at 1, so a counter lost to eviction cannot revive ETags issued
+    before it was lost.
+    """
+    cache = _cache()
+    keys = [_generation_key(model, scope) for model in models]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, time.time_ns(), None)
+            found[key] = cache.get(key)
+    return tuple(found[key] for key in keys)
+
+
+async def aget_generations(models, scope=None) -> tuple:
+    """get_generations() through the cache's async API."""
+    cache = _cache()
+    keys = [_generation_key(model, scope) for model in models]
+    found = await cache.aget_many(keys)
+    for key in keys:
+        if key not in found:
+            await cache.aadd(key, time.time_ns(), None)
+            found[key] = await cache.aget(key)
+    return tuple(found[key] for key in keys)
+
+
+def bump_generation(model, scope=None):
+    """
+    Invalidate everything cached against ``model`` (or against ``scope``
+    of it). The bump runs after the surrounding transaction commits, so a
+    request racing the write cannot cache the old rows under the new
+    generation.
+    """
+    def bump():
+        cache = _cache()
+        key = _generation_key(model, scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+    transaction.on_commit(bump)
+
+
+# -------------------------
+# Response cache
+# -------------------------
+
+
+class CachedResponseMixin:
+    """
+    Generation-keyed caching for read-mostly viewsets.
+
+    ``list`` and ``retrieve`` responses are cached under the request path,
+    the negotiated media type and the current generation of every model in
+    ``cache_models``; saving or deleting one of those models (see
+    bump_generation) retires every entry at once. The ETag is derived from
+    the same key, so ``If-None-Match`` is answered with a 304 after the
+    permission checks but before any queryset is built.
+
+    Only for viewsets whose output does not depend on the requesting user.
+    Writes that bypass model signals (``QuerySet.update()``, raw SQL) must
+    call bump_generation themselves.
+
+    On async viewsets (core.async_views) ``alist`` and ``aretrieve`` do the
+    same through the cache's async API; list before AsyncListModelMixin and
+    AsyncRetrieveModelMixin.
+    """
+
+    cache_models = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        return await self.acached_response(super().alist, request, *args, **kwargs)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return await self.acached_response(super().aretrieve, request, *args, **kwargs)
+
+    def get_cache_models(self):
+        return self.cache_models or (self.get_queryset().model,)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        config = _config()
+        if not config.get('ENABLED', True):
+            return handler(request, *args, **kwargs)
+
+        key = self.get_response_key(request, get_generations(self.get_cache_models()))
+        etag = quote_etag(key[:32])
+        response = get_conditional_response(request, etag=etag)
+        if response is not None:
+            _NOT_MODIFIED.inc()
+        else:
+            cache = _cache()
+            cached = cache.get(f'response:{key}')
+            if cached is not None:
+                _HITS.inc()
+                data, headers = cached
+                response = Response(data, headers=headers)
+            else:
+                _MISSES.inc()
+                response = handler(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+                cache.set(f'response:{key}', _cache_entry(response), config.get('TIMEOUT', 300))
+        return _validated(response, etag, config)
+
+    async def acached_response(self, handler, request, *args, **kwargs):
+        config = _config()
+        if not config.get('ENABLED', True):
+            return await handler(request, *args, **kwargs)
+
+        key = self.get_response_key(request, await aget_generations(self.get_cache_models()))
+        etag = quote_etag(key[:32])
+        response = get_conditional_response(request, etag=etag)
+        if response is not None:
+            _NOT_MODIFIED.inc()
+        else:
+            cache = _cache()
+            cached = await cache.aget(f'response:{key}')
+            if cached is not None:
+                _HITS.inc()
+                data, headers = cached
+                response = Response(data, headers=headers)
+            else:
+                _MISSES.inc()
+                response = await handler(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+                await cache.aset(f'response:{key}', _cache_entry(response), config.get('TIMEOUT', 300))
+        return _validated(response, etag, config)
+
+    def get_response_key(self, request, generations) -> str:
+        # Pagination links are absolute URLs, so the host and scheme are part of the response.
+        return hashlib.sha256(repr((
+            type(self).__module__, type(self).__qualname__, self.action,
+            request.scheme, request.get_host(), request.get_full_path(), request.accepted_media_type, generations,
+        )).encode()).hexdigest()
+
+
+def _cache_entry(response) -> tuple:
+    headers = {name: value for name, value in response.items() if name.lower().startswith('x-')}
+    return response.data, headers
+
+
+def _validated(response, etag, config):
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, max_age=config.get('MAX_AGE', 60))
+    return response
@@ -0,0 +1,223 @@
+import csv
+import io
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotAcceptable
+
+from .renderers import ORJSONRenderer
+from .serializers import DynamicFieldsModelSerializer, get_values_reader
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Parquet export is optional
+    pyarrow = None
+
+# -------------------------
+# Streaming exports
+# -------------------------
+
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+}
+FORMATS = tuple(CONTENT_TYPES)
+
+# Spreadsheets evaluate cells starting with these as formulas.
+_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+_INTEGER_FIELDS = {
+    'AutoField', 'BigAutoField', 'SmallAutoField', 'IntegerField', 'BigIntegerField', 'SmallIntegerField',
+    'PositiveIntegerField', 'PositiveBigIntegerField', 'PositiveSmallIntegerField',
+}
+_json = ORJSONRenderer()
+
+
+def iter_export(queryset, serializer_class, fmt, fields=None, chunk_size=2000, context=None):
+    """
+    Yield ``queryset`` encoded as ``fmt`` in byte chunks, one chunk per
+    ``chunk_size`` rows read with ``QuerySet.iterator()``. Rows are rendered
+    as ``serializer_class`` renders them, through its ValuesReader when it
+    has one. No query runs until the first chunk is requested.
+    """
+    if fmt == 'parquet' and pyarrow is None:
+        raise ValueError("Parquet export requires pyarrow.")
+    kwargs = {'fields': fields} if fields and issubclass(serializer_class, DynamicFieldsModelSerializer) else {}
+    serializer = serializer_class(context=context or {}, **kwargs)
+    names = [field.field_name for field in serializer._readable_fields]
+
+    reader = get_values_reader(serializer_class, fields)
+    if reader is not None:
+        rows = queryset.values(*reader.columns).iterator(chunk_size=chunk_size)
+        render = reader.render
+    else:
+        rows = queryset.iterator(chunk_size=chunk_size)
+
+        def render(batch):
+            return [serializer.to_representation(obj) for obj in batch]
+
+    def batches():
+        while True:
+            batch = list(islice(rows, chunk_size))
+            if not batch:
+                return
+            yield render(batch)
+
+    if fmt == 'csv':
+        return _iter_csv(names, batches())
+    if fmt == 'jsonl':
+        return _iter_jsonl(batches())
+    if fmt == 'parquet':
+        return _iter_parquet(names, batches(), serializer)
+    raise ValueError(f"Unsupported format {fmt!r}; expected one of {', '.join(FORMATS)}")
+
+
+def _iter_csv(names, batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def drain():
+        text = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return text.encode()
+
+    # The header goes out before the first query runs.
+    writer.writerow(names)
+    yield drain()
+    for batch in batches:
+        writer.writerows([_cell(row[name]) for name in names] for row in batch)
+        yield drain()
+
+
+def _cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        return _json.render(value).decode()
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _iter_jsonl(batches):
+    for batch in batches:
+        yield b''.join(_json.render(row) + b'\n' for row in batch)
+
+
+def _iter_parquet(names, batches, serializer):
+    columns = [(name, _arrow_type(serializer, name)) for name in names]
+    schema = pyarrow.schema(columns)
+    text_columns = [name for name, arrow_type in columns if arrow_type == pyarrow.string()]
+    sink = _ChunkSink()
+    # One row group per chunk; the footer is written when the writer closes.
+    with pyarrow.parquet.ParquetWriter(sink, schema) as writer:
+        for batch in batches:
+            for row in batch:
+                for name in text_columns:
+                    value = row[name]
+                    if value is not None and not isinstance(value, str):
+                        row[name] = _cell(value) if isinstance(value, (dict, list)) else str(value)
+            writer.write_table(pyarrow.Table.from_pylist(batch, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def _arrow_type(serializer, name):
+    """Typed columns for integers, booleans and floats; the API's text form for the rest."""
+    model = serializer.Meta.model
+    source = serializer.fields[name].source
+    source = model._meta.pk.name if source == 'pk' else source
+    model_field = next((f for f in model._meta.concrete_fields if f.name == source), None)
+    if model_field is None:
+        return pyarrow.string()
+    if model_field.is_relation:
+        model_field = model_field.target_field
+    internal_type = model_field.get_internal_type()
+    if internal_type in _INTEGER_FIELDS:
+        return pyarrow.int64()
+    if internal_type == 'BooleanField':
+        return pyarrow.bool_()
+    if internal_type == 'FloatField':
+        return pyarrow.float64()
+    return pyarrow.string()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands back what was written since the last drain()."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def _aiter_chunks(chunks):
+    # Each step runs on the request's ORM thread, where the cursor lives.
+    step = sync_to_async(next, thread_sensitive=True)
+    while True:
+        chunk = await step(chunks, None)
+        if chunk is None:
+            return
+        yield chunk
+
+
+def export_response(request, chunks, fmt, filename):
+    """StreamingHttpResponse for ``chunks``, as an async iterator when served over ASGI."""
+    if isinstance(getattr(request, '_request', request), ASGIRequest):
+        # Django would otherwise buffer a sync iterator in full before sending.
+        chunks = _aiter_chunks(chunks)
+    response = StreamingHttpResponse(chunks, content_type=CONTENT_TYPES[fmt])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{fmt}"'
+    # Keep reverse proxies from buffering the stream.
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+class ExportMixin:
+    """
+    ``GET <prefix>/export/<csv|jsonl|parquet>/`` streams every row the list
+    would show, across all pages: the same scoping, permissions, filters
+    (``?journal=3``), ``?ordering=`` and ``?fields=``, and the same field
+    representations. Memory stays flat however many rows match, and the
+    first bytes leave once the first chunk is read. Parquet needs pyarrow.
+    """
+
+    export_chunk_size = 2000
+
+    @action(detail=False, methods=['get'], url_path=f'export/(?P<export_format>{"|".join(FORMATS)})')
+    def export(self, request, export_format=None, *args, **kwargs):
+        if export_format == 'parquet' and pyarrow is None:
+            raise NotAcceptable('Parquet export is not available on this server.')
+        fields, _ = self.get_sparse_trees() if hasattr(self, 'get_sparse_trees') else (None, None)
+        queryset = self.filter_queryset(self.get_queryset())
+        if not queryset.query.order_by:
+            # The list's order: ?ordering=, then the view's, the model's, the key.
+            queryset = queryset.order_by(
+                *(getattr(self, 'ordering', None) or queryset.model._meta.ordering or ('pk',))
+            )
+        chunks = iter_export(
+            queryset, self.get_serializer_class(), export_format, fields=fields,
+            chunk_size=self.export_chunk_size, context=self.get_serializer_context(),
+        )
+        return export_response(request, chunks, export_format, queryset.model._meta.model_name)
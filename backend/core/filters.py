@@ -0,0 +1,102 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+# -------------------------
+# Declarative filtering and ordering
+# -------------------------
+
+LOOKUPS = {'exact', 'in', 'gt', 'gte', 'lt', 'lte'}
+MAX_IN_VALUES = 100
+
+
+class FieldFilterBackend(BaseFilterBackend):
+    """
+    Filters declared on the view as ``filter_fields``, a mapping of model
+    field name to allowed lookups::
+
+        filter_fields = {'journal': ('exact', 'in'), 'submitted_at': ('gte', 'lt')}
+
+    accepts ``?journal=3``, ``?journal__in=3,4`` and
+    ``?submitted_at__gte=2025-01-01``. Values are parsed by the model field;
+    a bad value answers 400. Only declare fields an index can serve (see
+    tests/bench_filters.py).
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        spec = getattr(view, 'filter_fields', None)
+        if not spec:
+            return queryset
+        conditions = {}
+        errors = {}
+        for name, lookups in spec.items():
+            field = queryset.model._meta.get_field(name)
+            for lookup in lookups:
+                param = name if lookup == 'exact' else f'{name}__{lookup}'
+                raw = request.query_params.get(param)
+                if raw is None or raw == '':
+                    continue
+                try:
+                    if lookup == 'in':
+                        values = [part for part in raw.split(',') if part]
+                        if len(values) > MAX_IN_VALUES:
+                            raise DjangoValidationError(f'At most {MAX_IN_VALUES} values.')
+                        value = [self.parse(field, part) for part in values]
+                    else:
+                        value = self.parse(field, raw)
+                except DjangoValidationError as exc:
+                    errors[param] = exc.messages
+                    continue
+                conditions[f'{field.attname}__{lookup}'] = value
+        if errors:
+            raise ValidationError(errors)
+        return queryset.filter(**conditions) if conditions else queryset
+
+    @staticmethod
+    def parse(field, raw):
+        if field.is_relation:
+            field = field.target_field
+        if field.get_internal_type() == 'BooleanField':
+            # Query strings say true/false; the model field wants True/False.
+            raw = raw.capitalize()
+        value = field.to_python(raw)
+        if value is None:
+            raise DjangoValidationError('Enter a valid value.')
+        if settings.USE_TZ and field.get_internal_type() == 'DateTimeField' and timezone.is_naive(value):
+            value = timezone.make_aware(value)
+        return value
+
+
+class KeysetOrderingFilter(BaseFilterBackend):
+    """
+    ``?ordering=submitted_at`` or ``?ordering=-submitted_at`` among the view's
+    ``ordering_fields``. The result stays keyset-paginated: KeysetPagination
+    reads the ordering from the queryset and appends the primary key. Each
+    listed field should lead an index ending in ``id``.
+    """
+
+    ordering_param = 'ordering'
+
+    def filter_queryset(self, request, queryset, view):
+        allowed = getattr(view, 'ordering_fields', None)
+        requested = request.query_params.get(self.ordering_param)
+        if not allowed or not requested:
+            return queryset
+        names = [term.strip() for term in requested.split(',') if term.strip()]
+        invalid = [term for term in names if term.lstrip('-') not in allowed]
+        if invalid:
+            raise ValidationError({self.ordering_param: [f'Cannot order by {", ".join(invalid)}.']})
+
+        # A sparse-fieldset queryset (only()) must still load the key columns.
+        loaded, deferred = queryset.query.deferred_loading
+        if loaded and not deferred:
+            queryset = queryset.only(*loaded, *(term.lstrip('-') for term in names))
+        return queryset.order_by(*names)
+
+
+def ordering_names(queryset, view) -> list:
+    """Field names (without direction) the list will be ordered by."""
+    ordering = queryset.query.order_by or getattr(view, 'ordering', None) or ()
+    return [name.lstrip('-') for name in ordering if isinstance(name, str)]
@@ -0,0 +1,136 @@
+import hmac
+import os
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest,
+)
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.multiprocess import MultiProcessCollector
+
+# -------------------------
+# Metrics
+# -------------------------
+# With several worker processes, set PROMETHEUS_MULTIPROC_DIR before start-up
+# so every process writes its samples where /metrics can aggregate them.
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Time to response (first byte for streams), by route.',
+    ['method', 'route', 'status'],
+)
+REQUESTS_IN_FLIGHT = Gauge('http_requests_in_flight', 'Requests being served.', multiprocess_mode='livesum')
+REQUEST_DB_QUERIES = Histogram(
+    'http_request_db_queries', 'SQL statements per request, by route.', ['method', 'route'],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144, float('inf')),
+)
+REQUEST_DB_SECONDS = Histogram(
+    'http_request_db_seconds', 'Time spent in SQL per request, by route.', ['method', 'route'],
+    buckets=(.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, float('inf')),
+)
+CACHE_LOOKUPS = Counter(
+    'cache_lookups_total', 'Cache lookups by cache and outcome; hit ratio is hits over all lookups.',
+    ['cache', 'result'],
+)
+PERMISSION_CHECK_SECONDS = Histogram(
+    'permission_check_seconds', 'Time spent in permission checks, by permission class.', ['permission'],
+    buckets=(.00005, .0001, .00025, .0005, .001, .0025, .005, .01, .025, .05, .1, float('inf')),
+)
+
+
+def _config() -> dict:
+    return getattr(settings, 'METRICS', {})
+
+
+def metrics_enabled() -> bool:
+    return _config().get('ENABLED', True)
+
+
+# -------------------------
+# Domain gauges
+# -------------------------
+
+SNAPSHOT_KEY = 'metrics:domain'
+_domain_gauges = []
+
+
+def domain_gauge(name, documentation, labels):
+    """
+    Register ``compute() -> iterable of (label values, value)`` as a gauge.
+    Gauges are read from a snapshot shared through the cache and recomputed
+    at most every DOMAIN_REFRESH_INTERVAL seconds, however often or by how
+    many processes /metrics is scraped.
+    """
+    def decorator(compute):
+        _domain_gauges.append((name, documentation, tuple(labels), compute))
+        return compute
+    return decorator
+
+
+def domain_snapshot() -> dict:
+    config = _config()
+    cache = caches[config.get('CACHE_ALIAS', 'default')]
+    snapshot = cache.get(SNAPSHOT_KEY)
+    if snapshot is None:
+        snapshot = {
+            name: [(tuple(str(value) for value in labels), value) for labels, value in compute()]
+            for name, _, _, compute in _domain_gauges
+        }
+        cache.set(SNAPSHOT_KEY, snapshot, config.get('DOMAIN_REFRESH_INTERVAL', 60))
+    return snapshot
+
+
+class DomainCollector:
+    def describe(self):
+        # Without describe() the registry would collect, and query, on registration.
+        return [GaugeMetricFamily(name, documentation, labels=labels)
+                for name, documentation, labels, _ in _domain_gauges]
+
+    def collect(self):
+        snapshot = domain_snapshot()
+        for name, documentation, labels, _ in _domain_gauges:
+            family = GaugeMetricFamily(name, documentation, labels=labels)
+            for label_values, value in snapshot.get(name, ()):
+                family.add_metric(label_values, value)
+            yield family
+
+
+_domain_registry = CollectorRegistry()
+_domain_registry.register(DomainCollector())
+
+
+# -------------------------
+# Exposition
+# -------------------------
+
+
+def _allowed(request) -> bool:
+    config = _config()
+    token = config.get('TOKEN')
+    if token:
+        header = request.headers.get('Authorization', '')
+        return hmac.compare_digest(header.encode(), f'Bearer {token}'.encode())
+    if config.get('REQUIRE_TOKEN'):
+        # Behind a proxy REMOTE_ADDR is the proxy's, so the allowlist would admit everyone.
+        return False
+    return request.META.get('REMOTE_ADDR') in config.get('ALLOWED_IPS', ('127.0.0.1', '::1'))
+
+
+def metrics_view(request):
+    """
+    Prometheus text exposition. Scrapers authenticate with ``Authorization:
+    Bearer <METRICS_TOKEN>``; without a configured token only ALLOWED_IPS
+    may scrape, and nobody may when REQUIRE_TOKEN is set.
+    """
+    if not metrics_enabled():
+        raise Http404
+    if not _allowed(request):
+        return HttpResponseForbidden()
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    body = generate_latest(registry) + generate_latest(_domain_registry)
+    return HttpResponse(body, content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,62 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.core.exceptions import MiddlewareNotUsed
+
+from core.metrics import (
+    REQUEST_DB_QUERIES, REQUEST_DB_SECONDS, REQUEST_LATENCY, REQUESTS_IN_FLIGHT, metrics_enabled,
+)
+
+from .queries import current_query_stats
+
+UNMATCHED_ROUTE = '<unmatched>'
+# Clients choose the method string; anything else is one label, not a new series.
+KNOWN_METHODS = frozenset({'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'})
+OTHER_METHOD = 'other'
+
+
+class MetricsMiddleware:
+    """
+    Per-route request metrics for /metrics (core.metrics): latency by method,
+    route pattern and status, requests in flight and, when it is listed
+    after QueryInstrumentationMiddleware, SQL statements and time per
+    request. Routes are URL patterns, never paths, to keep label sets small.
+    Streaming responses are measured up to their first byte.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not metrics_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        start = time.perf_counter()
+        with REQUESTS_IN_FLIGHT.track_inprogress():
+            response = self.get_response(request)
+        self.observe(request, response, start)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        with REQUESTS_IN_FLIGHT.track_inprogress():
+            response = await self.get_response(request)
+        self.observe(request, response, start)
+        return response
+
+    def observe(self, request, response, start):
+        match = getattr(request, 'resolver_match', None)
+        route = match.route if match is not None else UNMATCHED_ROUTE
+        method = request.method if request.method in KNOWN_METHODS else OTHER_METHOD
+        REQUEST_LATENCY.labels(method, route, response.status_code).observe(time.perf_counter() - start)
+        stats = current_query_stats()
+        if stats is not None:
+            REQUEST_DB_QUERIES.labels(method, route).observe(stats.count)
+            REQUEST_DB_SECONDS.labels(method, route).observe(stats.duration)
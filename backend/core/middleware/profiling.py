@@ -0,0 +1,114 @@
+import random
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils import timezone
+
+from core.profiling import folded_text, make_profiler, read_token, store_profile
+
+
+class ProfilingMiddleware:
+    """
+    Profile selected requests in production: those carrying a valid signed
+    PROFILING['HEADER'] token (see core.profiling.make_token and
+    POST /api/profiles/token/), plus a SAMPLE_RATE share of all traffic.
+    Everything else pays one header lookup.
+
+    The result goes to the shared ring buffer (core.profiling) and the
+    response names the entry in ``X-Profile-Id``; staff download it from
+    /api/profiles/<id>/folded/ (sampling) or /api/profiles/<id>/pstats/
+    (cProfile). At most MAX_CONCURRENT requests per process are profiled at
+    once; further requests run unprofiled.
+
+    Under WSGI only the request's thread is profiled. Under ASGI the event
+    loop and ORM threads serve many requests at once, so the sampler records
+    every thread of the process for the request's duration (stacks are
+    prefixed ``thread:<name>``) and cProfile mode falls back to sampling.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        config = getattr(settings, 'PROFILING', {})
+        if not config.get('ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.header = 'HTTP_' + config.get('HEADER', 'X-Profile').upper().replace('-', '_')
+        self.sample_rate = config.get('SAMPLE_RATE', 0.0)
+        self.default_mode = config.get('MODE', 'sample')
+        self.slots = threading.BoundedSemaphore(config.get('MAX_CONCURRENT', 2))
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def requested(self, request):
+        """``(mode, trigger)`` if this request is to be profiled, else ``(None, None)``."""
+        token = request.META.get(self.header)
+        if token:
+            mode = read_token(token)
+            if mode is not None:
+                return mode, 'header'
+        if self.sample_rate and random.random() < self.sample_rate:
+            return self.default_mode, 'sampled'
+        return None, None
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        mode, trigger = self.requested(request)
+        if mode is None or not self.slots.acquire(blocking=False):
+            return self.get_response(request)
+        try:
+            profiler = make_profiler(mode, thread_ids={threading.get_ident()})
+            start = time.perf_counter()
+            profiler.start()
+            try:
+                response = self.get_response(request)
+            finally:
+                result = profiler.stop()
+        finally:
+            self.slots.release()
+        entry = self.entry(request, response, mode, trigger, 'thread', start, result)
+        response['X-Profile-Id'] = store_profile(entry)
+        return response
+
+    async def __acall__(self, request):
+        mode, trigger = self.requested(request)
+        if mode is None or not self.slots.acquire(blocking=False):
+            return await self.get_response(request)
+        try:
+            profiler = make_profiler('sample')
+            start = time.perf_counter()
+            profiler.start()
+            try:
+                response = await self.get_response(request)
+            finally:
+                result = await sync_to_async(profiler.stop, thread_sensitive=False)()
+        finally:
+            self.slots.release()
+        entry = self.entry(request, response, 'sample', trigger, 'process', start, result)
+        response['X-Profile-Id'] = await sync_to_async(store_profile, thread_sensitive=False)(entry)
+        return response
+
+    def entry(self, request, response, mode, trigger, scope, start, result) -> dict:
+        match = getattr(request, 'resolver_match', None)
+        user = getattr(request, 'user', None)
+        return {
+            'captured_at': timezone.now().isoformat(),
+            'method': request.method,
+            'path': request.path,
+            'route': match.route if match is not None else None,
+            'status': response.status_code,
+            'duration_ms': round((time.perf_counter() - start) * 1000, 2),
+            'mode': mode,
+            'trigger': trigger,
+            'scope': scope,
+            'samples': result['samples'],
+            'user': user.pk if user is not None and user.is_authenticated else None,
+            'folded': folded_text(result['folded']) if result['folded'] is not None else None,
+            'pstats': result['pstats'],
+        }
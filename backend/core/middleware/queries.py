@@ -0,0 +1,271 @@
+import contextvars
+import heapq
+import logging
+import random
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError, connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger('core.sql')
+slow_logger = logging.getLogger('core.sql.slow')
+
+# -------------------------
+# Per-request query statistics
+# -------------------------
+
+_current = contextvars.ContextVar('query_stats', default=None)
+
+
+def _config() -> dict:
+    return getattr(settings, 'SQL_INSTRUMENTATION', {})
+
+
+def current_query_stats():
+    """QueryStats of the request being served in this context, or None."""
+    return _current.get()
+
+
+class QueryStats:
+    """
+    Queries run on behalf of one request: how many, how long in total, the
+    ``top`` slowest, and a sample of the slow SELECTs to EXPLAIN afterwards.
+    Statement parameters are kept only for the EXPLAIN and never logged.
+    """
+
+    def __init__(self, top=3, slow_ms=100.0, explain_rate=0.0, max_explains=2, max_sql_length=2000):
+        self.count = 0
+        self.duration = 0.0
+        self.slow_count = 0
+        self.slowest = []
+        self.explain_candidates = []
+        self.top = top
+        self.slow_seconds = slow_ms / 1000
+        self.explain_rate = explain_rate
+        self.max_explains = max_explains
+        self.max_sql_length = max_sql_length
+        self.started = time.perf_counter()
+        # Batch sub-requests record from several threads at once.
+        self._lock = threading.Lock()
+
+    def record(self, alias, sql, params, many, seconds):
+        with self._lock:
+            self.count += 1
+            self.duration += seconds
+            entry = (seconds, self.count, alias, sql)
+            if len(self.slowest) < self.top:
+                heapq.heappush(self.slowest, entry)
+            elif self.top:
+                heapq.heappushpop(self.slowest, entry)
+            if seconds < self.slow_seconds:
+                return
+            self.slow_count += 1
+            if (not many and len(self.explain_candidates) < self.max_explains and _is_select(sql)
+                    and random.random() < self.explain_rate):
+                self.explain_candidates.append((seconds, alias, sql, params))
+
+    def summary(self) -> dict:
+        return {
+            'db_queries': self.count,
+            'db_time_ms': round(self.duration * 1000, 2),
+            'db_slow_queries': self.slow_count,
+            'slowest': [
+                {'ms': round(seconds * 1000, 2), 'alias': alias, 'sql': sql[:self.max_sql_length]}
+                for seconds, _, alias, sql in sorted(self.slowest, reverse=True)
+            ],
+        }
+
+
+def _is_select(sql) -> bool:
+    return sql.lstrip()[:6].upper() == 'SELECT'
+
+
+def _execute_wrapper(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.record(context['connection'].alias, sql, params, many, time.perf_counter() - start)
+
+
+def _install(connection, **kwargs):
+    if _execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_execute_wrapper)
+
+
+def explain(alias, sql, params) -> str:
+    """The database's plan for one statement, as text; never ANALYZE, so nothing runs."""
+    connection = connections[alias]
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}', params)
+            return '\n'.join(' '.join(str(column) for column in row) for row in cursor.fetchall())
+    except DatabaseError as exc:
+        return f'EXPLAIN failed: {exc}'
+
+
+# -------------------------
+# Middleware
+# -------------------------
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Attribute every SQL statement to the request (and the view) it ran for.
+
+    A single execute wrapper on each database connection records into the
+    QueryStats of the current request, found through a context variable, so
+    statements run on ORM threads under ASGI and on /api/batch/'s read pool
+    are counted too. After the response, one ``core.sql`` INFO record per
+    request carries the route, view, status, query count, database time and
+    slowest statements, and ``Server-Timing`` reports the same totals to
+    the client. A sample of SELECTs slower than ``SLOW_QUERY_MS`` is
+    EXPLAINed and logged to ``core.sql.slow``.
+
+    Streaming responses are attributed until the stream ends; their
+    headers are sent before that, so they carry no Server-Timing.
+    List first in MIDDLEWARE so other middleware's queries are included.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.config = _config()
+        if not self.config.get('ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        connection_created.connect(_install, dispatch_uid='core.middleware.queries')
+        for connection in connections.all(initialized_only=True):
+            _install(connection)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        stats = self.new_stats()
+        token = _current.set(stats)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        if response.streaming:
+            return self.attribute_stream(request, response, stats)
+        self.explain_slow(stats)
+        return self.finish(request, response, stats)
+
+    async def __acall__(self, request):
+        stats = self.new_stats()
+        token = _current.set(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        if response.streaming:
+            return self.attribute_stream(request, response, stats)
+        if stats.explain_candidates:
+            # On the request's ORM thread, where its connection lives.
+            await sync_to_async(self.explain_slow)(stats)
+        return self.finish(request, response, stats)
+
+    def new_stats(self) -> QueryStats:
+        config = self.config
+        return QueryStats(
+            top=config.get('TOP_STATEMENTS', 3),
+            slow_ms=config.get('SLOW_QUERY_MS', 100),
+            explain_rate=config.get('EXPLAIN_SAMPLE_RATE', 0.0),
+            max_explains=config.get('MAX_EXPLAINS_PER_REQUEST', 2),
+            max_sql_length=config.get('MAX_SQL_LENGTH', 2000),
+        )
+
+    def attribute_stream(self, request, response, stats):
+        content = response.streaming_content
+        if response.is_async:
+            response.streaming_content = self._aattributed(request, response, content, stats)
+        else:
+            response.streaming_content = self._attributed(request, response, content, stats)
+        return response
+
+    def _attributed(self, request, response, content, stats):
+        try:
+            iterator = iter(content)
+            while True:
+                token = _current.set(stats)
+                try:
+                    chunk = next(iterator, None)
+                finally:
+                    _current.reset(token)
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            self.explain_slow(stats)
+            self.log(request, response, stats)
+
+    async def _aattributed(self, request, response, content, stats):
+        try:
+            iterator = aiter(content)
+            while True:
+                token = _current.set(stats)
+                try:
+                    chunk = await anext(iterator, None)
+                finally:
+                    _current.reset(token)
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            if stats.explain_candidates:
+                await sync_to_async(self.explain_slow)(stats)
+            self.log(request, response, stats)
+
+    def explain_slow(self, stats):
+        for seconds, alias, sql, params in stats.explain_candidates:
+            slow_logger.warning(
+                'Slow query (%.1f ms) on %s', seconds * 1000, alias,
+                extra={'ms': round(seconds * 1000, 2), 'alias': alias,
+                       'sql': sql[:stats.max_sql_length], 'plan': explain(alias, sql, params)},
+            )
+        stats.explain_candidates = []
+
+    def finish(self, request, response, stats):
+        if self.config.get('SERVER_TIMING', True):
+            total = (time.perf_counter() - stats.started) * 1000
+            timing = f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries", total;dur={total:.2f}'
+            existing = response.get('Server-Timing')
+            response['Server-Timing'] = f'{existing}, {timing}' if existing else timing
+        self.log(request, response, stats)
+        return response
+
+    def log(self, request, response, stats):
+        route, view = _route(request)
+        summary = stats.summary()
+        logger.info(
+            '%s %s -> %s: %d queries in %.1f ms', request.method, route or request.path, response.status_code,
+            summary['db_queries'], summary['db_time_ms'],
+            extra={
+                'method': request.method, 'path': request.path, 'route': route, 'view': view,
+                'status': response.status_code, 'streamed': response.streaming,
+                'duration_ms': round((time.perf_counter() - stats.started) * 1000, 2),
+                **summary,
+            },
+        )
+
+
+def _route(request):
+    """``(route pattern, dotted view[.action])`` of the resolved view, or ``(None, None)``."""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return None, None
+    action = getattr(match.func, 'actions', {}).get(request.method.lower())
+    view = f'{match._func_path}.{action}' if action else match._func_path
+    return match.route, view
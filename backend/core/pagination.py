@@ -0,0 +1,223 @@
+import base64
+import binascii
+import json
+from collections import OrderedDict
+from types import SimpleNamespace
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured, ValidationError
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+# -------------------------
+# Keyset pagination
+# -------------------------
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over a composite key such as ``(-submitted_at, -id)``.
+
+    Each page is fetched with a ``WHERE (key) < (cursor)`` predicate and a
+    LIMIT, so with an index on the key columns every page costs the same
+    however deep the client pages. The cursor is an opaque token holding the
+    key of the row at the edge of the current page.
+
+    The ordering comes from, in turn: an explicit ``order_by()`` on the
+    queryset, the view's ``ordering`` attribute, the model's Meta.ordering,
+    and finally ``pk``. The primary key is appended as a tie-breaker. Key
+    columns must be non-null fields on the model itself.
+
+    ``?count=estimate`` adds an ``X-Estimated-Count`` header taken from the
+    planner's row estimate instead of running ``COUNT(*)``.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    count_query_param = 'count'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.prepare(queryset, request, view)
+        if request.query_params.get(self.count_query_param) == 'estimate':
+            self.estimated_count = self.estimate_count(queryset)
+        page, values, reverse = self.page_queryset(queryset, request)
+        return self.finish_page(list(page), values, reverse)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset() for async views, through the async ORM."""
+        self.prepare(queryset, request, view)
+        if request.query_params.get(self.count_query_param) == 'estimate':
+            self.estimated_count = await self.aestimate_count(queryset)
+        page, values, reverse = self.page_queryset(queryset, request)
+        return self.finish_page([row async for row in page], values, reverse)
+
+    def prepare(self, queryset, request, view):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset, view)
+        self.fields = [self._get_field(queryset.model, name) for name, _ in self.ordering]
+        self.estimated_count = None
+
+    def page_queryset(self, queryset, request):
+        """``(queryset of the page plus one row, cursor values, reverse)``."""
+        values, reverse = self.decode_cursor(request)
+        ordering = [(name, not desc) if reverse else (name, desc) for name, desc in self.ordering]
+        queryset = queryset.order_by(*[f'-{name}' if desc else name for name, desc in ordering])
+        if values is not None:
+            queryset = queryset.filter(self._after(ordering, values))
+        return queryset[:self.page_size + 1], values, reverse
+
+    def finish_page(self, rows, values, reverse):
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        # Paging backwards there is always a page after; forwards there is one
+        # before whenever we started from a cursor.
+        self.has_next = has_more if not reverse else True
+        self.has_previous = has_more if reverse else values is not None
+        self.first_key = self._key(rows[0]) if rows else values
+        self.last_key = self._key(rows[-1]) if rows else values
+        return rows
+
+    def get_paginated_response(self, data):
+        response = Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+        if self.estimated_count is not None:
+            response['X-Estimated-Count'] = str(self.estimated_count)
+        return response
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        page_size = api_settings.PAGE_SIZE or 50
+        if self.page_size_query_param:
+            try:
+                requested = int(request.query_params[self.page_size_query_param])
+            except (KeyError, ValueError):
+                return page_size
+            if requested > 0:
+                return min(requested, self.max_page_size)
+        return page_size
+
+    def get_ordering(self, queryset, view):
+        if queryset.query.order_by:
+            ordering = queryset.query.order_by
+        else:
+            ordering = getattr(view, 'ordering', None) or queryset.model._meta.ordering or ('pk',)
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+
+        pk_name = queryset.model._meta.pk.name
+        parsed = []
+        for item in ordering:
+            if not isinstance(item, str):
+                raise ImproperlyConfigured(f"{type(self).__name__} only supports field-name orderings, got {item!r}.")
+            desc = item.startswith('-')
+            name = item.lstrip('-')
+            parsed.append((pk_name if name == 'pk' else name, desc))
+        if not any(name == pk_name for name, _ in parsed):
+            parsed.append((pk_name, parsed[-1][1]))
+        return parsed
+
+    def estimate_count(self, queryset):
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return queryset.count()
+        plan = json.loads(queryset.order_by().explain(format='json'))
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    async def aestimate_count(self, queryset):
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return await queryset.acount()
+        plan = json.loads(await sync_to_async(queryset.order_by().explain)(format='json'))
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.last_key, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(self.first_key, reverse=True)
+
+    def encode_cursor(self, key, reverse):
+        payload = {'k': [
+            field.value_to_string(SimpleNamespace(**{field.attname: value}))
+            for field, value in zip(self.fields, key)
+        ]}
+        if reverse:
+            payload['r'] = 1
+        token = base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode()
+        url = remove_query_param(self.request.build_absolute_uri(), self.count_query_param)
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode()))
+            raw = payload['k']
+            if len(raw) != len(self.fields):
+                raise ValueError
+            values = [field.to_python(value) for field, value in zip(self.fields, raw)]
+        except (TypeError, ValueError, KeyError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return values, bool(payload.get('r'))
+
+    def _key(self, row):
+        if isinstance(row, dict):
+            return [row[field.attname] if field.attname in row else row[field.name] for field in self.fields]
+        return [getattr(row, field.attname) for field in self.fields]
+
+    @staticmethod
+    def _after(ordering, values):
+        """
+        ``(a, b, c) > (x, y, z)`` with per-column direction, expanded to
+        ``a >= x AND (a > x OR (a = x AND (b > y OR ...)))``. The leading
+        bound lets the database start an index range scan at the cursor.
+        """
+        condition = None
+        for (name, desc), value in reversed(list(zip(ordering, values))):
+            beyond = Q(**{f'{name}__lt' if desc else f'{name}__gt': value})
+            condition = beyond if condition is None else beyond | (Q(**{name: value}) & condition)
+        first_name, first_desc = ordering[0]
+        return Q(**{f'{first_name}__lte' if first_desc else f'{first_name}__gte': values[0]}) & condition
+
+    @staticmethod
+    def _get_field(model, name):
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            field = None
+        if field is None or not field.concrete or field.null:
+            raise ImproperlyConfigured(
+                f"Cannot paginate {model.__name__} by {name!r}: keyset columns must be "
+                f"non-null fields on the model itself."
+            )
+        return field
+
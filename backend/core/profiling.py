@@ -0,0 +1,259 @@
+import collections
+import cProfile
+import marshal
+import pstats
+import sys
+import threading
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import caches
+from django.http import Http404, HttpResponse
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+# -------------------------
+# Profilers
+# -------------------------
+
+MODES = ('sample', 'cprofile')
+
+
+def _config() -> dict:
+    return getattr(settings, 'PROFILING', {})
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{frame.f_globals.get('__name__', '?')}.{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class StackSampler:
+    """
+    Statistical profiler: a background thread records the stacks of
+    ``thread_ids`` (every other thread when None) every ``interval``
+    seconds, as folded ``outer;...;inner`` stacks with sample counts.
+    """
+
+    def __init__(self, thread_ids=None, interval=0.005, max_depth=128):
+        self.thread_ids = thread_ids
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks = collections.Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self) -> dict:
+        self._stop.set()
+        self._thread.join()
+        return {'folded': self.stacks, 'samples': self.samples, 'pstats': None}
+
+    def _run(self):
+        own = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            self.samples += 1
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own or (self.thread_ids is not None and thread_id not in self.thread_ids):
+                    continue
+                stack = self._stack(frame)
+                if stack is None:
+                    continue
+                if self.thread_ids is None:
+                    # Process-wide samples keep threads apart.
+                    if thread_id not in names:
+                        names.update((thread.ident, thread.name) for thread in threading.enumerate())
+                    stack.append(f'thread:{names.get(thread_id, thread_id)}')
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def _stack(self, frame):
+        """Frame names, innermost first; None for samplers and threads stopping one."""
+        stack = []
+        while frame is not None and len(stack) < self.max_depth:
+            if frame.f_code in _SAMPLER_CODES:
+                return None
+            stack.append(_frame_name(frame))
+            frame = frame.f_back
+        return stack
+
+
+_SAMPLER_CODES = {StackSampler.stop.__code__, StackSampler._run.__code__}
+
+
+class DeterministicProfiler:
+    """
+    cProfile over the calling thread, kept in pstats' own dump format.
+    cProfile keeps per-function totals, not stacks, so it yields no folded
+    output; Django's nested middleware wrappers share one function, which
+    defeats rebuilding stacks from caller totals.
+    """
+
+    def __init__(self):
+        self._profile = cProfile.Profile()
+
+    def start(self):
+        self._profile.enable()
+
+    def stop(self) -> dict:
+        self._profile.disable()
+        stats = pstats.Stats(self._profile).stats
+        return {'folded': None, 'samples': sum(entry[1] for entry in stats.values()), 'pstats': marshal.dumps(stats)}
+
+
+def folded_text(stacks) -> str:
+    """``stack count`` lines, heaviest first: the input of flamegraph.pl, inferno and speedscope."""
+    return ''.join(f'{stack} {count}\n' for stack, count in stacks.most_common())
+
+
+def make_profiler(mode, thread_ids=None):
+    config = _config()
+    if mode == 'cprofile':
+        return DeterministicProfiler()
+    return StackSampler(
+        thread_ids, interval=config.get('INTERVAL_MS', 5) / 1000, max_depth=config.get('MAX_STACK_DEPTH', 128),
+    )
+
+
+# -------------------------
+# Ring buffer
+# -------------------------
+# Slots live in the shared cache, so a profile captured by one worker can be
+# downloaded through any other.
+
+SEQUENCE_KEY = 'profiles:seq'
+SLOT_KEY = 'profiles:slot:{}'
+
+
+def _cache():
+    return caches[_config().get('CACHE_ALIAS', 'default')]
+
+
+def store_profile(entry) -> int:
+    """Save ``entry`` over the oldest slot and return its id."""
+    cache = _cache()
+    cache.add(SEQUENCE_KEY, 0, None)
+    profile_id = cache.incr(SEQUENCE_KEY)
+    entry['id'] = profile_id
+    config = _config()
+    cache.set(SLOT_KEY.format(profile_id % config.get('BUFFER_SIZE', 50)), entry, config.get('TTL', 86400))
+    return profile_id
+
+
+def list_profiles() -> list:
+    keys = [SLOT_KEY.format(slot) for slot in range(_config().get('BUFFER_SIZE', 50))]
+    return sorted(_cache().get_many(keys).values(), key=lambda entry: entry['id'], reverse=True)
+
+
+def get_profile(profile_id):
+    entry = _cache().get(SLOT_KEY.format(profile_id % _config().get('BUFFER_SIZE', 50)))
+    return entry if entry is not None and entry['id'] == profile_id else None
+
+
+# -------------------------
+# Header tokens
+# -------------------------
+
+SIGNING_SALT = 'core.profiling'
+
+
+def make_token(mode='sample') -> str:
+    """Value for the PROFILING['HEADER'] request header that profiles requests in ``mode``."""
+    return signing.TimestampSigner(salt=SIGNING_SALT).sign(mode)
+
+
+def read_token(value):
+    """The mode a header token asks for, or None if it is forged, expired or unknown."""
+    try:
+        signer = signing.TimestampSigner(salt=SIGNING_SALT)
+        mode = signer.unsign(value, max_age=_config().get('TOKEN_MAX_AGE', 3600))
+    except signing.BadSignature:
+        return None
+    return mode if mode in MODES else None
+
+
+# -------------------------
+# Views
+# -------------------------
+
+SUMMARY_FIELDS = ('id', 'captured_at', 'method', 'path', 'route', 'status', 'duration_ms', 'mode', 'trigger',
+                  'scope', 'samples', 'user')
+
+
+class ProfileListView(APIView):
+    """Profiles in the ring buffer, newest first."""
+
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request):
+        return Response([{field: entry.get(field) for field in SUMMARY_FIELDS} for entry in list_profiles()])
+
+
+class ProfileTokenView(APIView):
+    """Issue a header token: ``{"mode": "sample" | "cprofile"}``."""
+
+    permission_classes = (IsAdminUser,)
+
+    def post(self, request):
+        mode = request.data.get('mode', 'sample')
+        if mode not in MODES:
+            return Response({'mode': [f"Expected one of {', '.join(MODES)}."]}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'header': _config().get('HEADER', 'X-Profile'),
+            'value': make_token(mode),
+            'expires_in': _config().get('TOKEN_MAX_AGE', 3600),
+        })
+
+
+class ProfileDownloadView(APIView):
+    """
+    ``folded/``: one ``frame;frame;... count`` line per sampled stack, for
+    flamegraph.pl, inferno or speedscope. ``pstats/``: cProfile's dump, for
+    pstats, snakeviz or flameprof.
+    """
+
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request, profile_id, output):
+        entry = get_profile(profile_id)
+        if entry is None or output not in ('folded', 'pstats') or entry.get(output) is None:
+            raise Http404
+        return _download(entry[output], output, f'profile-{profile_id}')
+
+
+class MergedProfileView(APIView):
+    """
+    Folded stacks of every sampled profile in the buffer, summed; narrow
+    with ``?route=`` (as listed) or ``?path=``. Sampling at a few
+    milliseconds sees little of one fast request, but a flame graph over
+    many requests to the same route is representative.
+    """
+
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request):
+        route, path = request.query_params.get('route'), request.query_params.get('path')
+        stacks = collections.Counter()
+        for entry in list_profiles():
+            if entry.get('folded') is None or (route and entry['route'] != route) or (path and entry['path'] != path):
+                continue
+            for line in entry['folded'].splitlines():
+                stack, _, count = line.rpartition(' ')
+                stacks[stack] += int(count)
+        return _download(folded_text(stacks), 'folded', 'profiles')
+
+
+def _download(content, output, name):
+    if output == 'pstats':
+        response = HttpResponse(content, content_type='application/octet-stream')
+        extension = 'prof'
+    else:
+        response = HttpResponse(content, content_type='text/plain; charset=utf-8')
+        extension = 'folded'
+    response['Content-Disposition'] = f'attachment; filename="{name}.{extension}"'
+    return response
@@ -0,0 +1,172 @@
+import codecs
+import json
+import re
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.response import Response
+from rest_framework.utils import json as drf_json
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None
+
+# -------------------------
+# orjson renderer and parser
+# -------------------------
+
+# Datetimes, dates and times go through DRF's encoder so their text matches;
+# dataclasses are passed through so they fail exactly as before.
+ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+    if orjson else 0
+)
+
+# orjson formats floats below 1e-4 or from 1e16 differently from json.dumps
+# ("1e16" vs "1e+16", "0.00001" vs "1e-05"). Output that may contain such a
+# float (the pattern can also match inside strings) is re-encoded with json.
+_FLOAT_MISMATCH = re.compile(rb'\de-?\d|0\.0000')
+
+# Integers past 64 bits, which orjson would read as floats; json keeps them exact.
+_LONG_NUMBER = re.compile(rb'\d{19}')
+
+_drf_encoder = JSONEncoder()
+
+
+def _default(obj):
+    # Lazy strings, Decimals, UUIDs, querysets... exactly as DRF encodes them.
+    return _drf_encoder.default(obj)
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    """
+    JSONRenderer producing the same bytes as DRF's, encoded with orjson when
+    it is installed. Indented output (the browsable API), non-compact or
+    ASCII-only settings, and anything orjson cannot reproduce exactly fall
+    back to the stdlib encoder.
+
+    ``iter_render()`` yields a list (or a paginated page's ``results``) in
+    chunks, for StreamingJSONMixin.
+    """
+
+    chunk_size = 500
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if not self._accelerated(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+        return self._dumps(data)
+
+    def iter_render(self, data, accepted_media_type=None, renderer_context=None):
+        if not self._accelerated(accepted_media_type, renderer_context):
+            yield self.render(data, accepted_media_type, renderer_context)
+            return
+        if isinstance(data, list):
+            yield from self._iter_list(data)
+        elif isinstance(data, dict) and isinstance(data.get('results'), list):
+            yield b'{'
+            for position, (key, value) in enumerate(data.items()):
+                yield (b',' if position else b'') + self._dumps(key) + b':'
+                if key == 'results':
+                    yield from self._iter_list(value)
+                else:
+                    yield self._dumps(value)
+            yield b'}'
+        else:
+            yield self._dumps(data)
+
+    def _accelerated(self, accepted_media_type, renderer_context):
+        return (
+            orjson is not None
+            and self.compact
+            and not self.ensure_ascii
+            and self.get_indent(accepted_media_type, renderer_context or {}) is None
+        )
+
+    def _iter_list(self, items):
+        yield b'['
+        for start in range(0, len(items), self.chunk_size):
+            chunk = self._dumps(items[start:start + self.chunk_size])
+            yield (b',' if start else b'') + chunk[1:-1]
+        yield b']'
+
+    def _dumps(self, data):
+        try:
+            ret = orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits; json raises the usual errors.
+            ret = None
+        if ret is None or _FLOAT_MISMATCH.search(ret):
+            ret = json.dumps(
+                data, cls=self.encoder_class, ensure_ascii=False,
+                allow_nan=not self.strict, separators=renderers.SHORT_SEPARATORS,
+            ).encode()
+        # Same strict-javascript-subset escaping as DRF.
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+
+class ORJSONParser(JSONParser):
+    """
+    JSONParser decoding UTF-8 bodies with orjson. Other charsets, and bodies
+    orjson rejects, go through DRF's parser so accepted input and error
+    messages are unchanged.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read() if stream is not None else b''
+        if not _LONG_NUMBER.search(body):
+            try:
+                return orjson.loads(body)
+            except orjson.JSONDecodeError:
+                pass
+        try:
+            # Big integers, NaN when not strict, or a genuine syntax error.
+            parse_constant = drf_json.strict_constant if self.strict else None
+            return drf_json.loads(body.decode(encoding), parse_constant=parse_constant)
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+class StreamingJSONMixin:
+    """
+    Stream list responses of at least ``stream_threshold`` rows through
+    ORJSONRenderer.iter_render() instead of building one large bytestring.
+    Paginated lists never hold more than the paginator's ``max_page_size``
+    rows, so for them the threshold is capped there and full pages stream.
+    """
+
+    stream_threshold = 1000
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        renderer = getattr(response, 'accepted_renderer', None)
+        if not isinstance(response, Response) or response.exception or not isinstance(renderer, ORJSONRenderer):
+            return response
+        data = response.data
+        rows = data.get('results') if isinstance(data, dict) else data
+        if not isinstance(rows, list) or len(rows) < self.get_stream_threshold():
+            return response
+
+        streaming = StreamingHttpResponse(
+            renderer.iter_render(data, response.accepted_media_type, response.renderer_context),
+            status=response.status_code,
+            content_type=renderer.media_type,
+        )
+        for header, value in response.items():
+            if header.lower() != 'content-type':
+                streaming[header] = value
+        return streaming
+
+    def get_stream_threshold(self) -> int:
+        max_page_size = getattr(getattr(self, 'paginator', None), 'max_page_size', None)
+        return min(self.stream_threshold, max_page_size) if max_page_size else self.stream_threshold
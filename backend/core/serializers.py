@@ -0,0 +1,262 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from django.utils.module_loading import import_string
+from rest_framework import ISO_8601, serializers
+from rest_framework.exceptions import ParseError
+from rest_framework.settings import api_settings
+
+# -------------------------
+# Sparse fieldsets and expansion
+# -------------------------
+
+
+def parse_field_tree(value):
+    """
+    Parse ``"id,title,journal.name"`` into ``{'id': {}, 'title': {}, 'journal': {'name': {}}}``.
+    Returns None for a missing or blank parameter.
+    """
+    if not value:
+        return None
+    tree = {}
+    for path in value.split(','):
+        node = tree
+        for part in path.strip().split('.'):
+            if part:
+                node = node.setdefault(part, {})
+    return tree or None
+
+
+class DynamicFieldsModelSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer accepting ``fields`` and ``expand`` trees (see
+    parse_field_tree). ``fields`` limits the output to the named fields;
+    ``expand`` replaces the listed relations, which must appear in
+    ``expandable_fields`` (name -> dotted serializer path), with nested
+    read-only representations.
+    """
+
+    expandable_fields = {}
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._sparse_fields = fields
+        self._expand = expand or {}
+
+    @classmethod
+    def get_expandable_serializer(cls, name):
+        path = cls.expandable_fields.get(name)
+        if path is None:
+            return None
+        return import_string(path) if isinstance(path, str) else path
+
+    def get_fields(self):
+        fields = super().get_fields()
+        model = self.Meta.model
+        for name, subtree in self._expand.items():
+            serializer_class = self.get_expandable_serializer(name)
+            if serializer_class is None:
+                continue
+            if self._sparse_fields is not None and name not in self._sparse_fields:
+                continue
+            relation = model._meta.get_field(name)
+            fields[name] = serializer_class(
+                read_only=True,
+                many=relation.one_to_many or relation.many_to_many,
+                fields=(self._sparse_fields or {}).get(name) or None,
+                expand=subtree,
+            )
+        if self._sparse_fields is not None:
+            for name in list(fields):
+                if name not in self._sparse_fields:
+                    del fields[name]
+        return fields
+
+
+def plan_queryset(queryset, serializer_class, fields=None, expand=None, keep=()):
+    """
+    Add the select_related/prefetch_related/only() calls needed to render
+    ``serializer_class`` with the given ``fields`` and ``expand`` trees:
+    expanded foreign keys are joined, expanded reverse and many-to-many
+    relations are prefetched with their own plans, and only the columns the
+    output needs (plus ``keep``) are selected.
+
+    Raises ParseError for relations that cannot be expanded.
+    """
+    plan = _Plan()
+    plannable = plan.walk(queryset.model, serializer_class, fields, expand or {}, prefix='')
+    if plan.select:
+        queryset = queryset.select_related(*plan.select)
+    if plan.prefetch:
+        queryset = queryset.prefetch_related(*plan.prefetch)
+    if plannable:
+        queryset = queryset.only(*plan.only, *keep)
+    return queryset
+
+
+class _Plan:
+    def __init__(self):
+        self.select = []
+        self.prefetch = []
+        self.only = set()
+
+    def walk(self, model, serializer_class, fields, expand, prefix):
+        for name in expand:
+            if not issubclass(serializer_class, DynamicFieldsModelSerializer) or \
+                    serializer_class.get_expandable_serializer(name) is None:
+                raise ParseError(f"Cannot expand {prefix.replace('__', '.')}{name!r}.")
+
+        serializer = serializer_class(fields=fields, expand=expand)
+        self.only.add(prefix + model._meta.pk.name)
+        plannable = True
+        for name, field in serializer.fields.items():
+            try:
+                relation = model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                # Computed or dotted source: we cannot tell which columns it reads.
+                plannable = False
+                continue
+
+            if name in expand:
+                nested = field.child if isinstance(field, serializers.ListSerializer) else field
+                nested_fields = (fields or {}).get(name) or None
+                if relation.many_to_one or relation.one_to_one:
+                    self.select.append(prefix + relation.name)
+                    if relation.concrete:
+                        self.only.add(prefix + relation.name)
+                    plannable &= self.walk(
+                        relation.related_model, type(nested), nested_fields, expand[name],
+                        prefix=f'{prefix}{relation.name}__',
+                    )
+                else:
+                    self.prefetch.append(self._prefetch(prefix, relation, type(nested), nested_fields, expand[name]))
+            elif relation.many_to_many or relation.one_to_many:
+                # Default rendering is a list of primary keys.
+                self.prefetch.append(prefix + relation.name)
+            elif relation.concrete:
+                self.only.add(prefix + relation.name)
+        return plannable
+
+    @staticmethod
+    def _prefetch(prefix, relation, serializer_class, fields, expand):
+        related = relation.related_model
+        keep = ()
+        if relation.one_to_many:
+            # The prefetcher matches rows back to parents through this column.
+            keep = (relation.field.name,)
+        queryset = plan_queryset(related._default_manager.all(), serializer_class, fields, expand, keep=keep)
+        return Prefetch(prefix + relation.name, queryset=queryset)
+
+
+# -------------------------
+# values()-based read path
+# -------------------------
+
+# to_representation() implementations that return database values unchanged.
+_PASSTHROUGH = {
+    serializers.CharField.to_representation,
+    serializers.EmailField.to_representation,
+    serializers.SlugField.to_representation,
+    serializers.IntegerField.to_representation,
+    serializers.FloatField.to_representation,
+    serializers.BooleanField.to_representation,
+}
+
+
+class ValuesReader:
+    """
+    Renders rows from ``QuerySet.values(*columns)`` exactly as the serializer
+    it was compiled from renders model instances, without building either.
+    ``plan`` holds ``(output name, column, converter)`` per field; converter
+    is None where the database value is already the output value.
+    """
+
+    def __init__(self, plan):
+        self.plan = tuple(plan)
+        self.columns = tuple(column for _, column, _ in self.plan)
+
+    def render(self, rows):
+        plan = [
+            (name, column, convert.bind() if isinstance(convert, _DateTimeConverter) else convert)
+            for name, column, convert in self.plan
+        ]
+        return [
+            {
+                name: value if value is None or convert is None else convert(value)
+                for name, column, convert in plan
+                for value in (row[column],)
+            }
+            for row in rows
+        ]
+
+
+class _DateTimeConverter:
+    """
+    serializers.DateTimeField.to_representation with the field's timezone
+    resolved once per render rather than once per row. Values it cannot
+    shortcut (naive datetimes, non-ISO formats) go through the field.
+    """
+
+    def __init__(self, field):
+        self.field = field
+
+    def bind(self):
+        field = self.field
+        output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+        tz = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+        if output_format is None or output_format.lower() != ISO_8601 or tz is None:
+            return field.to_representation
+        fallback = field.to_representation
+
+        def convert(value):
+            if isinstance(value, str) or value.tzinfo is None:
+                return fallback(value)
+            text = value.astimezone(tz).isoformat()
+            return text[:-6] + 'Z' if text.endswith('+00:00') else text
+        return convert
+
+
+_readers = {}
+MAX_READERS = 1000
+
+
+def get_values_reader(serializer_class, fields=None):
+    """
+    Compile (once per serializer class and field selection) a ValuesReader,
+    or return None when a field needs the model instance: computed fields,
+    nested serializers, many-to-many and file fields.
+    """
+    key = (serializer_class, frozenset(fields) if fields is not None else None)
+    if key not in _readers:
+        if len(_readers) >= MAX_READERS:
+            # ?fields= combinations are client-controlled; keep the cache bounded.
+            _readers.clear()
+        _readers[key] = _compile_reader(serializer_class, fields)
+    return _readers[key]
+
+
+def _compile_reader(serializer_class, fields):
+    kwargs = {'fields': fields} if issubclass(serializer_class, DynamicFieldsModelSerializer) else {}
+    serializer = serializer_class(**kwargs)
+    model = serializer.Meta.model
+    plan = []
+    for field in serializer._readable_fields:
+        source = model._meta.pk.name if field.source == 'pk' else field.source
+        try:
+            model_field = model._meta.get_field(source)
+        except FieldDoesNotExist:
+            return None
+        if not model_field.concrete or model_field.many_to_many or isinstance(field, serializers.FileField):
+            return None
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            if field.pk_field is not None:
+                return None
+            convert = None
+        elif isinstance(field, (serializers.BaseSerializer, serializers.RelatedField)):
+            return None
+        elif type(field).to_representation is serializers.DateTimeField.to_representation:
+            convert = _DateTimeConverter(field)
+        else:
+            to_representation = type(field).to_representation
+            convert = None if to_representation in _PASSTHROUGH else field.to_representation
+        plan.append((field.field_name, model_field.attname, convert))
+    return ValuesReader(plan)
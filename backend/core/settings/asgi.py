@@ -3,6 +3,8 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings.dev')
+# Async-capable viewsets (core.async_views) run on the event loop.
+os.environ.setdefault('ASYNC_VIEWS', '1')
 
 application = get_asgi_application()
 
@@ -41,6 +41,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.queries.QueryInstrumentationMiddleware',
+    'core.middleware.metrics.MetricsMiddleware',
+    'core.middleware.profiling.ProfilingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -72,6 +75,11 @@ TEMPLATES = [
 WSGI_APPLICATION = 'core.settings.wsgi.application'
 ASGI_APPLICATION = 'core.settings.asgi.application'
 
+# Serve AsyncViewSetMixin viewsets as coroutines. core/settings/asgi.py turns
+# this on; under WSGI they stay synchronous, since each async view would need
+# an event loop per request there.
+ASYNC_VIEWS = os.getenv('ASYNC_VIEWS', '0') == '1'
+
 # Database configuration - supports both DATABASE_URL and individual env vars
 DATABASE_URL = os.getenv('DATABASE_URL')
 if DATABASE_URL:
@@ -96,6 +104,16 @@ else:
         }
     }
 
+# Under ASGI the ORM runs on a new thread per request, so persistent
+# per-thread connections would be opened for every request and never reused.
+# Share a psycopg connection pool instead.
+if ASYNC_VIEWS and DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+        'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+        'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '20')),
+    }
+
 AUTH_USER_MODEL = 'users.User'
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -105,6 +123,15 @@ AUTH_PASSWORD_VALIDATORS = [
     { 'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator' },
 ]
 
+# Threads used to hash passwords off the request path during registration
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', '4'))
+
+# POST /api/users/import/ runs inside the request, hashing included; larger
+# files must go through "manage.py import_users".
+USER_IMPORT = {
+    'MAX_HTTP_ROWS': int(os.getenv('USER_IMPORT_MAX_HTTP_ROWS', '200')),
+}
+
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
 USE_I18N = True
@@ -117,13 +144,127 @@ MEDIA_ROOT = BASE_DIR / 'uploads'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Shared cache - Redis when REDIS_URL is set, otherwise per-process memory
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Generation-keyed response cache used by core.caching.CachedResponseMixin
+RESPONSE_CACHE = {
+    'ENABLED': os.getenv('RESPONSE_CACHE_ENABLED', '1') == '1',
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': int(os.getenv('RESPONSE_CACHE_TIMEOUT', '300')),
+    # Clients reuse a response this long before revalidating with If-None-Match.
+    'MAX_AGE': int(os.getenv('RESPONSE_CACHE_MAX_AGE', '60')),
+}
+
+# /api/batch/ (core.batch.BatchView)
+BATCH_API = {
+    'MAX_REQUESTS': int(os.getenv('BATCH_API_MAX_REQUESTS', '20')),
+    # Threads running concurrent reads; each holds its own database connection.
+    'MAX_WORKERS': int(os.getenv('BATCH_API_MAX_WORKERS', '4')),
+}
+
+# Per-request SQL statistics (core.middleware.queries.QueryInstrumentationMiddleware)
+SQL_INSTRUMENTATION = {
+    'ENABLED': os.getenv('SQL_INSTRUMENTATION_ENABLED', '1') == '1',
+    # Server-Timing: db;dur=...;desc="N queries", total;dur=...
+    'SERVER_TIMING': os.getenv('SQL_SERVER_TIMING', '1') == '1',
+    'TOP_STATEMENTS': 3,
+    'SLOW_QUERY_MS': float(os.getenv('SLOW_QUERY_MS', '100')),
+    # Share of slow SELECTs logged with their EXPLAIN plan to core.sql.slow
+    'EXPLAIN_SAMPLE_RATE': float(os.getenv('SLOW_QUERY_EXPLAIN_RATE', '0.1')),
+    'MAX_EXPLAINS_PER_REQUEST': 2,
+    'MAX_SQL_LENGTH': 2000,
+}
+
+# Prometheus exposition at /metrics (core.metrics). Scrapers send
+# "Authorization: Bearer <METRICS_TOKEN>"; without a token only ALLOWED_IPS
+# may scrape, unless REQUIRE_TOKEN is set (as in production). Domain gauges are recomputed at most every
+# DOMAIN_REFRESH_INTERVAL seconds and shared through the cache.
+METRICS = {
+    'ENABLED': os.getenv('METRICS_ENABLED', '1') == '1',
+    'TOKEN': os.getenv('METRICS_TOKEN', ''),
+    'ALLOWED_IPS': os.getenv('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(','),
+    'REQUIRE_TOKEN': os.getenv('METRICS_REQUIRE_TOKEN', '0') == '1',
+    'CACHE_ALIAS': 'default',
+    'DOMAIN_REFRESH_INTERVAL': int(os.getenv('METRICS_DOMAIN_REFRESH_INTERVAL', '60')),
+}
+
+# On-demand request profiling (core.middleware.profiling). Requests carrying
+# a signed HEADER token from POST /api/profiles/token/ are profiled, plus a
+# SAMPLE_RATE share of all traffic; staff download the results from
+# /api/profiles/. MODE is 'sample' (statistical) or 'cprofile'.
+PROFILING = {
+    'ENABLED': os.getenv('PROFILING_ENABLED', '1') == '1',
+    'HEADER': 'X-Profile',
+    'TOKEN_MAX_AGE': int(os.getenv('PROFILING_TOKEN_MAX_AGE', '3600')),
+    'SAMPLE_RATE': float(os.getenv('PROFILING_SAMPLE_RATE', '0')),
+    'MODE': os.getenv('PROFILING_MODE', 'sample'),
+    'INTERVAL_MS': float(os.getenv('PROFILING_INTERVAL_MS', '5')),
+    'MAX_STACK_DEPTH': 128,
+    'MAX_CONCURRENT': 2,
+    'CACHE_ALIAS': 'default',
+    'BUFFER_SIZE': int(os.getenv('PROFILING_BUFFER_SIZE', '50')),
+    'TTL': 86400,
+}
+
+# Compiled transition graph (apps.workflow.services); changes reach other
+# processes within LOCAL_TTL seconds through the shared cache, and within
+# MAX_AGE seconds when the cache is per-process (no REDIS_URL).
+WORKFLOW = {
+    'LOCAL_TTL': int(os.getenv('WORKFLOW_LOCAL_TTL', '5')),
+    'MAX_AGE': int(os.getenv('WORKFLOW_MAX_AGE', '60')),
+}
+
+# Per-user permission cache used by apps.users.permissions
+PERMISSION_CACHE = {
+    'CACHE_ALIAS': 'default',
+    'LOCAL_TTL': int(os.getenv('PERMISSION_CACHE_LOCAL_TTL', '5')),
+    'SHARED_TTL': int(os.getenv('PERMISSION_CACHE_SHARED_TTL', '300')),
+    'MAX_LOCAL_ENTRIES': 10000,
+}
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.users.authentication.PermissionClaimsAuthentication',
+        'apps.security.authentication.APITokenAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # Byte-compatible with DRF's JSON classes; orjson is used when installed.
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'core.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    # No-ops unless the view declares filter_fields / ordering_fields.
+    'DEFAULT_FILTER_BACKENDS': (
+        'core.filters.FieldFilterBackend',
+        'core.filters.KeysetOrderingFilter',
+    ),
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.KeysetPagination',
+    'PAGE_SIZE': 50,
+    # Reverse proxies in front of the app. Client IPs (throttling, security
+    # events) are read that many hops from the right of X-Forwarded-For;
+    # with 0 the header is ignored and REMOTE_ADDR is used.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', '0')),
 }
 
 # JWT Settings
@@ -150,11 +291,72 @@ SIMPLE_JWT = {
 
     'JTI_CLAIM': 'jti',
 
+    'TOKEN_OBTAIN_SERIALIZER': 'apps.users.serializers.PermissionClaimsTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'apps.users.serializers.PermissionClaimsTokenRefreshSerializer',
+
     'SLIDING_TOKEN_REFRESH_EXP_CLAIM': 'refresh_exp',
     'SLIDING_TOKEN_LIFETIME': timedelta(minutes=5),
     'SLIDING_TOKEN_REFRESH_LIFETIME': timedelta(days=1),
 }
 
+# APIToken authentication ("Authorization: Token <key>")
+API_TOKEN_AUTH = {
+    'PREFIX_LENGTH': 8,
+    'CACHE_TTL': 60,
+    'MAX_CACHED_PREFIXES': 10000,
+}
+
+# In-process Bloom filter over TokenBlacklist rows
+TOKEN_BLACKLIST = {
+    'REFRESH_INTERVAL': int(os.getenv('TOKEN_BLACKLIST_REFRESH_INTERVAL', '30')),
+    'FALSE_POSITIVE_RATE': 0.01,
+}
+
+# Rate limits for the credential endpoints, per client IP and per username.
+# BACKEND is CacheRateLimitBackend (shared sliding windows in the cache) or
+# LocalRateLimitBackend (per-process token buckets).
+RATE_LIMIT = {
+    'ENABLED': os.getenv('RATE_LIMIT_ENABLED', '1') == '1',
+    'BACKEND': os.getenv('RATE_LIMIT_BACKEND', 'apps.security.throttling.CacheRateLimitBackend'),
+    'CACHE_ALIAS': 'default',
+    'RATES': {
+        'token': {'ip': '30/min', 'username': '10/min'},
+        'token_refresh': {'ip': '60/min'},
+        'register': {'ip': '20/hour', 'username': '5/hour'},
+    },
+    'EVENT_BUFFER_SIZE': 100,
+    'EVENT_FLUSH_INTERVAL': 5,
+}
+
+# Embed role/permission claims in access tokens and authorize from them
+# without loading the user row. Deactivation and role changes are picked up
+# through the permission version within PERMISSION_CACHE['LOCAL_TTL'] seconds.
+JWT_PERMISSION_CLAIMS = os.getenv('JWT_PERMISSION_CLAIMS', '0') == '1'
+
 CORS_ALLOW_ALL_ORIGINS = True
 
+# LOG_FORMAT=json writes one JSON object per record, extra fields included
+# (the per-request SQL summaries of core.sql, for instance).
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'text')
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'text': {'format': '%(asctime)s %(levelname)s %(name)s %(message)s'},
+        'json': {
+            '()': 'pythonjsonlogger.json.JsonFormatter',
+            'fmt': '%(asctime)s %(levelname)s %(name)s %(message)s',
+            'rename_fields': {'asctime': 'time', 'levelname': 'level', 'name': 'logger'},
+        },
+    },
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler', 'formatter': LOG_FORMAT},
+    },
+    'root': {'handlers': ['console'], 'level': 'WARNING'},
+    'loggers': {
+        'django': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+        'core.sql': {'level': os.getenv('SQL_LOG_LEVEL', 'INFO')},
+    },
+}
+
 
@@ -3,6 +3,10 @@ from .base import *  # noqa
 DEBUG = False
 
 SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
+# Render terminates TLS in one proxy hop in front of the service.
+REST_FRAMEWORK['NUM_PROXIES'] = int(os.getenv('NUM_PROXIES', '1'))
+# Every request arrives from the proxy, so /metrics is served to METRICS_TOKEN only.
+METRICS['REQUIRE_TOKEN'] = os.getenv('METRICS_REQUIRE_TOKEN', '1') == '1'
 SESSION_COOKIE_SECURE = True
 CSRF_COOKIE_SECURE = True
 SECURE_SSL_REDIRECT = False if os.getenv('DISABLE_SSL_REDIRECT') == '1' else True
@@ -23,6 +27,9 @@ MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
 # Configure middleware
 MIDDLEWARE = [
+    'core.middleware.queries.QueryInstrumentationMiddleware',
+    'core.middleware.metrics.MetricsMiddleware',
+    'core.middleware.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',   # required
@@ -0,0 +1,7 @@
+from django.dispatch import Signal
+
+# Sent by BulkWriteMixin after a bulk create, update or delete commits, which
+# bypass post_save/post_delete. Arguments: ``sender`` (the model),
+# ``instances`` and ``action`` ('create', 'update' or 'delete'); updates also
+# pass ``previous``, copies of the instances as they were loaded.
+bulk_written = Signal()
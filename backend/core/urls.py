@@ -1,20 +1,27 @@
 from django.contrib import admin
 from django.urls import path, include
-from rest_framework_simplejwt.views import (
-    TokenObtainPairView,
-    TokenRefreshView,
-)
+from apps.users.views import ThrottledTokenObtainPairView, ThrottledTokenRefreshView
+from core.batch import BatchView
+from core.metrics import metrics_view
+from core.profiling import MergedProfileView, ProfileDownloadView, ProfileListView, ProfileTokenView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
-    path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('metrics', metrics_view, name='metrics'),
+    path('api/token/', ThrottledTokenObtainPairView.as_view(), name='token_obtain_pair'),
+    path('api/token/refresh/', ThrottledTokenRefreshView.as_view(), name='token_refresh'),
+    path('api/batch/', BatchView.as_view(), name='batch'),
+    path('api/profiles/', ProfileListView.as_view(), name='profile-list'),
+    path('api/profiles/token/', ProfileTokenView.as_view(), name='profile-token'),
+    path('api/profiles/folded/', MergedProfileView.as_view(), name='profile-merged'),
+    path('api/profiles/<int:profile_id>/<str:output>/', ProfileDownloadView.as_view(), name='profile-download'),
     path('api/users/', include('apps.users.urls')),
     path('api/manuscripts/', include('apps.manuscripts.urls')),
     path('api/reviews/', include('apps.reviews.urls')),
     path('api/workflow/', include('apps.workflow.urls')),
     path('api/files/', include('apps.files.urls')),
     path('api/journals/', include('apps.journals.urls')),
+    path('api/notifications/', include('apps.notifications.urls')),
     path('api/taxonomy/', include('apps.taxonomy.urls')),
 ]
 
@@ -0,0 +1,293 @@
+import copy
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from .filters import ordering_names
+from .serializers import get_values_reader, parse_field_tree, plan_queryset
+from .signals import bulk_written
+
+# -------------------------
+# Shared viewset mixins
+# -------------------------
+
+
+class ScopedQuerysetMixin:
+    """
+    Restrict a viewset's queryset to the rows the requesting user may see.
+
+    ``scope_queryset(queryset, user)`` must return a filtered queryset so the
+    visibility rules run in SQL; list, retrieve, update and destroy all go
+    through it, and rows outside the scope answer 404.
+    """
+
+    scope_queryset = None
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.scope_queryset is None:
+            return queryset
+        return self.scope_queryset(queryset, self.request.user)
+
+
+class SparseFieldsMixin:
+    """
+    ``?fields=id,title,journal.name`` and ``?expand=journal,section`` for
+    safe requests. The serializer class must derive from
+    DynamicFieldsModelSerializer; the queryset gets the joins, prefetches and
+    column list the response needs, so an expanded page costs a fixed number
+    of queries and unrequested columns are never read.
+
+    Writes always use the full serializer.
+    """
+
+    fields_query_param = 'fields'
+    expand_query_param = 'expand'
+
+    def get_sparse_trees(self):
+        if self.request is None or self.request.method not in SAFE_METHODS:
+            return None, None
+        params = self.request.query_params
+        return (
+            parse_field_tree(params.get(self.fields_query_param)),
+            parse_field_tree(params.get(self.expand_query_param)),
+        )
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields, expand = self.get_sparse_trees()
+        if fields is None and expand is None:
+            return queryset
+        # Keyset pagination reads the ordering columns off the last row.
+        keep = [name.lstrip('-') for name in getattr(self, 'ordering', None) or ()]
+        return plan_queryset(queryset, self.get_serializer_class(), fields, expand, keep=keep)
+
+    def get_serializer(self, *args, **kwargs):
+        fields, expand = self.get_sparse_trees()
+        if fields is not None:
+            kwargs.setdefault('fields', fields)
+        if expand is not None:
+            kwargs.setdefault('expand', expand)
+        return super().get_serializer(*args, **kwargs)
+
+
+class ValuesListMixin:
+    """
+    Serve ``list`` from ``QuerySet.values()`` through a ValuesReader compiled
+    from the viewset's serializer, skipping model and serializer-field
+    instantiation per row. Output is identical to the serializer's; lists
+    the reader cannot render (expansions, computed or file fields) take the
+    regular path.
+    """
+
+    def list(self, request, *args, **kwargs):
+        values = self.get_values_queryset()
+        if values is None:
+            return super().list(request, *args, **kwargs)
+
+        reader, rows = values
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(reader.render(page))
+        return Response(reader.render(rows))
+
+    def get_values_queryset(self):
+        """``(reader, values() queryset)`` for this list, or None to take the regular path."""
+        fields, expand = self.get_sparse_trees() if hasattr(self, 'get_sparse_trees') else (None, None)
+        reader = None if expand else get_values_reader(self.get_serializer_class(), fields)
+        if reader is None:
+            return None
+
+        queryset = self.filter_queryset(self.get_queryset())
+        model = queryset.model
+        # Keyset pagination reads the ordering columns off each page's edges.
+        keys = {model._meta.pk.attname}
+        for name in ordering_names(queryset, self):
+            keys.add(model._meta.get_field(name).attname)
+        return reader, queryset.values(*reader.columns, *(keys - set(reader.columns)))
+
+
+class BulkWriteMixin:
+    """
+    ``POST``, ``PATCH`` and ``DELETE`` on ``<prefix>/bulk/`` with a list
+    payload: objects to create, ``{"id": ..., <fields>}`` partial updates, or
+    ids to delete. Every item is validated first, with one ``in_bulk()`` per
+    related field instead of a lookup per item; then all of them are written
+    with a single bulk_create/bulk_update/delete in one transaction, or, if
+    any item fails, none are.
+
+    The response lists one result per item, in payload order. Items that were
+    valid but not written because another item failed report status 424.
+
+    Runs under the viewset's permissions for the ``bulk`` action and, for
+    updates and deletes, its scoped queryset. Model signals are not sent;
+    ``core.signals.bulk_written`` is, inside the transaction.
+    """
+
+    bulk_max_items = 500
+    bulk_batch_size = 100
+
+    @action(detail=False, methods=['post', 'patch', 'delete'], url_path='bulk')
+    def bulk(self, request, *args, **kwargs):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationError({'non_field_errors': ['Expected a non-empty list of items.']})
+        if len(items) > self.bulk_max_items:
+            raise ValidationError({'non_field_errors': [f'At most {self.bulk_max_items} items per request.']})
+        handler = {
+            'POST': self.bulk_create,
+            'PATCH': self.bulk_update,
+            'DELETE': self.bulk_destroy,
+        }[request.method]
+        return handler(items)
+
+    def bulk_create(self, items):
+        serializer = self.get_serializer()
+        model = serializer.Meta.model
+        _resolve_related(serializer, items)
+        results, objects = [], []
+        for index, item in enumerate(items):
+            try:
+                objects.append(model(**serializer.run_validation(item)))
+                results.append({'index': index})
+            except ValidationError as exc:
+                results.append({'index': index, 'status': status.HTTP_400_BAD_REQUEST, 'errors': exc.detail})
+        if len(objects) < len(items):
+            return self._bulk_failed(results)
+
+        with transaction.atomic():
+            model._default_manager.bulk_create(objects, batch_size=self.bulk_batch_size)
+            bulk_written.send(sender=model, instances=objects, action='create')
+        for result, obj in zip(results, objects):
+            result.update(status=status.HTTP_201_CREATED, data=serializer.to_representation(obj))
+        return Response({'results': results}, status=status.HTTP_201_CREATED)
+
+    def bulk_update(self, items):
+        serializer = self.get_serializer(partial=True)
+        model = serializer.Meta.model
+        keys, results = self._bulk_keys(items, model)
+        _resolve_related(serializer, items)
+        instances = self.get_queryset().in_bulk([key for key in keys if key is not None])
+        changed, previous, fields = [], [], set()
+        for index, (item, key) in enumerate(zip(items, keys)):
+            if results[index] is not None:
+                continue
+            instance = instances.get(key)
+            if instance is None:
+                results[index] = {'index': index, 'status': status.HTTP_404_NOT_FOUND, 'errors': {'id': ['Not found.']}}
+                continue
+            serializer.instance = instance
+            try:
+                validated = serializer.run_validation(item)
+            except ValidationError as exc:
+                results[index] = {'index': index, 'status': status.HTTP_400_BAD_REQUEST, 'errors': exc.detail}
+                continue
+            previous.append(copy.copy(instance))
+            for attr, value in validated.items():
+                setattr(instance, attr, value)
+            fields.update(validated)
+            changed.append(instance)
+            results[index] = {'index': index}
+        if len(changed) < len(items):
+            return self._bulk_failed(results)
+
+        if fields:
+            with transaction.atomic():
+                model._default_manager.bulk_update(changed, sorted(fields), batch_size=self.bulk_batch_size)
+                bulk_written.send(sender=model, instances=changed, action='update', previous=previous)
+        for result, instance in zip(results, changed):
+            result.update(status=status.HTTP_200_OK, data=serializer.to_representation(instance))
+        return Response({'results': results})
+
+    def bulk_destroy(self, items):
+        model = self.get_queryset().model
+        ids = [item.get('id') if isinstance(item, dict) else item for item in items]
+        keys, results = self._bulk_keys([{'id': value} for value in ids], model)
+        found = self.get_queryset().in_bulk([key for key in keys if key is not None])
+        for index, key in enumerate(keys):
+            if results[index] is not None:
+                continue
+            if key not in found:
+                results[index] = {'index': index, 'status': status.HTTP_404_NOT_FOUND, 'errors': {'id': ['Not found.']}}
+            else:
+                results[index] = {'index': index}
+        if any('errors' in result for result in results):
+            return self._bulk_failed(results)
+
+        with transaction.atomic():
+            model._default_manager.filter(pk__in=list(found)).delete()
+            bulk_written.send(sender=model, instances=list(found.values()), action='delete')
+        for result, key in zip(results, keys):
+            result.update(status=status.HTTP_204_NO_CONTENT, id=found[key].pk)
+        return Response({'results': results})
+
+    @staticmethod
+    def _bulk_keys(items, model):
+        """Primary keys of ``items``, and a result list pre-filled for unusable ones."""
+        pk = model._meta.pk
+        keys, results, seen = [], [], set()
+        for index, item in enumerate(items):
+            key, error = None, None
+            value = item.get('id') if isinstance(item, dict) else None
+            try:
+                key = pk.to_python(value)
+            except DjangoValidationError:
+                error = 'A valid id is required.'
+            if key is None and error is None:
+                error = 'This field is required.'
+            elif key in seen:
+                key, error = None, 'Duplicate id.'
+            seen.add(key)
+            keys.append(key)
+            results.append(
+                {'index': index, 'status': status.HTTP_400_BAD_REQUEST, 'errors': {'id': [error]}} if error else None
+            )
+        return keys, results
+
+    @staticmethod
+    def _bulk_failed(results):
+        for result in results:
+            if 'status' not in result:
+                result.update(status=status.HTTP_424_FAILED_DEPENDENCY)
+        return Response({'results': results}, status=status.HTTP_400_BAD_REQUEST)
+
+
+def _resolve_related(serializer, items):
+    """
+    Fetch every primary key the items reference with one ``in_bulk()`` per
+    related field, and have the serializer's field read from that map rather
+    than run ``queryset.get()`` once per item. Error messages are DRF's.
+    """
+    for field in serializer.fields.values():
+        if field.read_only or type(field) is not serializers.PrimaryKeyRelatedField or field.pk_field is not None:
+            continue
+        queryset = field.get_queryset()
+        pk = queryset.model._meta.pk
+        keys = set()
+        for item in items:
+            if isinstance(item, dict) and not isinstance(item.get(field.field_name), bool):
+                try:
+                    keys.add(pk.to_python(item.get(field.field_name)))
+                except DjangoValidationError:
+                    pass  # Reported by the field below.
+        keys.discard(None)
+        field.to_internal_value = _lookup(field, pk, queryset.in_bulk(keys) if keys else {})
+
+
+def _lookup(field, pk, found):
+    def to_internal_value(data):
+        if isinstance(data, bool):
+            field.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            key = pk.to_python(data)
+        except DjangoValidationError:
+            field.fail('incorrect_type', data_type=type(data).__name__)
+        if key not in found:
+            field.fail('does_not_exist', pk_value=data)
+        return found[key]
+    return to_internal_value
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Load comparison of the async (ASGI) and sync (WSGI) serving paths.
+
+Drives core/settings/asgi.py and core/settings/wsgi.py in-process, with a JWT
+bearer token so the full authentication and permission path runs, against
+the endpoints served by core.async_views: the journal, manuscript and
+notification lists. Each mode runs in its own subprocess on an identically
+seeded test database, since ASYNC_VIEWS is read when the URLconf loads.
+
+``--concurrency`` clients keep one request each in flight. The WSGI
+application gets ``--workers`` threads, like a threaded gunicorn worker; the
+ASGI application serves every in-flight request from one event loop.
+``--db-latency`` adds a sleep to each SQL statement to stand in for slow
+I/O: a distant database, file storage or an external lookup.
+
+The async path costs more CPU per request (Django adapts each sync middleware
+hook and every ORM call with a thread hop), so it only comes out ahead once
+requests spend long enough waiting for the WSGI threads to run out:
+
+    python tests/bench_async.py
+    python tests/bench_async.py --concurrency 128 --workers 8 --db-latency 0,50,200
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from harness import grant_role, seed_manuscripts, setup_django, test_database
+
+ENDPOINTS = (
+    ('journals', '/api/journals/journals/', ''),
+    ('manuscripts', '/api/manuscripts/manuscripts/', 'page_size=20'),
+    ('notifications', '/api/notifications/notifications/', 'page_size=20'),
+)
+
+
+def seed(manuscripts):
+    from apps.notifications.models import Notification
+    from apps.users.models import User
+
+    seeded = seed_manuscripts(manuscripts, authors=50, editors=10, reviewers=50)
+    editor = seeded['editors'][0]
+    grant_role(editor, 'Section Editor')
+    grant_role(editor, 'Visitor / Reader')
+    Notification.objects.bulk_create(
+        Notification(recipient=editor, title=f'Notification {n}', message='Seeded.') for n in range(200)
+    )
+    return User.objects.get(pk=editor.pk)
+
+
+def add_db_latency(seconds):
+    """Sleep ``seconds`` before every statement on every connection, present and future."""
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+
+    def wrapper(execute, sql, params, many, context):
+        time.sleep(seconds)
+        return execute(sql, params, many, context)
+
+    def install(connection, **kwargs):
+        if wrapper not in connection.execute_wrappers:
+            connection.execute_wrappers.append(wrapper)
+
+    connection_created.connect(install, weak=False)
+    for connection in connections.all():
+        install(connection)
+
+
+async def asgi_get(application, path, query, token):
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+        'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': query.encode(),
+        'root_path': '', 'client': ('127.0.0.1', 50000), 'server': ('testserver', 80),
+        'headers': [(b'host', b'testserver'), (b'authorization', f'Bearer {token}'.encode())],
+    }
+    received = False
+    status = None
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        # No disconnect: Django cancels this once the response is sent.
+        await asyncio.Future()
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+
+    await application(scope, receive, send)
+    return status
+
+
+def wsgi_get(application, path, query, token):
+    environ = {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': query, 'SCRIPT_NAME': '',
+        'SERVER_NAME': 'testserver', 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+        'REMOTE_ADDR': '127.0.0.1', 'HTTP_HOST': 'testserver', 'HTTP_AUTHORIZATION': f'Bearer {token}',
+        'wsgi.input': io.BytesIO(), 'wsgi.errors': sys.stderr, 'wsgi.url_scheme': 'http',
+        'wsgi.version': (1, 0), 'wsgi.multithread': True, 'wsgi.multiprocess': False, 'wsgi.run_once': False,
+    }
+    status = []
+    body = application(environ, lambda line, headers, exc_info=None: status.append(line))
+    try:
+        for _ in body:
+            pass
+    finally:
+        if hasattr(body, 'close'):
+            body.close()
+    return int(status[0].split()[0])
+
+
+async def load(request, total, concurrency):
+    """Run ``total`` requests with ``concurrency`` in flight; return (seconds, latencies, statuses)."""
+    latencies, statuses = [], set()
+    remaining = total
+
+    async def client():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            statuses.add(await request())
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return time.perf_counter() - start, sorted(latencies), statuses
+
+
+def run_mode(args):
+    """Child process: serve every endpoint in ``args.mode`` and print the results as JSON."""
+    os.environ['ASYNC_VIEWS'] = '1' if args.mode == 'asgi' else '0'
+    setup_django()
+
+    with test_database():
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        user = seed(args.manuscripts)
+        token = str(AccessToken.for_user(user))
+        if args.db_latency:
+            add_db_latency(args.db_latency / 1000)
+
+        if args.mode == 'asgi':
+            from core.settings.asgi import application
+
+            def request_for(path, query):
+                return lambda: asgi_get(application, path, query, token)
+        else:
+            from core.settings.wsgi import application
+            pool = ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix='wsgi')
+
+            def request_for(path, query):
+                loop = asyncio.get_running_loop()
+                return lambda: loop.run_in_executor(pool, wsgi_get, application, path, query, token)
+
+        async def main():
+            results = {}
+            for name, path, query in ENDPOINTS:
+                request = request_for(path, query)
+                await load(request, args.concurrency, args.concurrency)  # warm up
+                seconds, latencies, statuses = await load(request, args.requests, args.concurrency)
+                results[name] = {
+                    'rps': len(latencies) / seconds,
+                    'p50': statistics.median(latencies),
+                    'p95': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+                    'statuses': sorted(statuses),
+                }
+            return results
+
+        print(json.dumps(asyncio.run(main())))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--manuscripts', type=int, default=2000)
+    parser.add_argument('--requests', type=int, default=500, help='Requests per endpoint')
+    parser.add_argument('--concurrency', type=int, default=64, help='Requests kept in flight')
+    parser.add_argument('--workers', type=int, default=8, help='WSGI worker threads')
+    parser.add_argument('--db-latency', default='0,20,100', help='Comma-separated per-statement delays in ms')
+    parser.add_argument('--mode', choices=('asgi', 'wsgi'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        args.db_latency = float(args.db_latency)
+        run_mode(args)
+        return
+
+    failed = False
+    for latency in args.db_latency.split(','):
+        print(f"\n{args.concurrency} concurrent clients, {args.requests} requests per endpoint, "
+              f"{latency} ms per SQL statement, WSGI with {args.workers} threads")
+        measured = {}
+        for mode in ('wsgi', 'asgi'):
+            command = [sys.executable, __file__, '--mode', mode, '--db-latency', latency]
+            for option in ('manuscripts', 'requests', 'concurrency', 'workers'):
+                command += [f'--{option}', str(getattr(args, option))]
+            output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+            measured[mode] = json.loads(output.strip().splitlines()[-1])
+
+        for name, _, _ in ENDPOINTS:
+            wsgi, asgi = measured['wsgi'][name], measured['asgi'][name]
+            print(f"  {name:<14}"
+                  f" WSGI {wsgi['rps']:8.1f} req/s  p50 {wsgi['p50']:7.1f} ms  p95 {wsgi['p95']:7.1f} ms |"
+                  f" ASGI {asgi['rps']:8.1f} req/s  p50 {asgi['p50']:7.1f} ms  p95 {asgi['p95']:7.1f} ms |"
+                  f" x{asgi['rps'] / wsgi['rps']:.2f}")
+            if wsgi['statuses'] != [200] or asgi['statuses'] != [200]:
+                print(f"    unexpected statuses: WSGI {wsgi['statuses']}, ASGI {asgi['statuses']}", file=sys.stderr)
+                failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
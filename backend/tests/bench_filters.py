@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Index check for the declared list filters.
+
+Seeds a large manuscript table (200k rows by default) with one review per
+manuscript, then for every filter declared in ManuscriptViewSet.filter_fields
+and ReviewViewSet.filter_fields (and each ordering_fields entry) builds the
+first-page query exactly as the list endpoint does, prints its plan and
+latency, and fails if the plan scans the table instead of an index:
+
+    python tests/bench_filters.py --manuscripts 200000
+    python tests/bench_filters.py --keepdb --verbose
+"""
+
+import argparse
+import re
+import sys
+from datetime import timedelta
+
+from harness import explain, format_stats, measure, seed_manuscripts, setup_django, test_database
+
+# Full-table scans: PostgreSQL's "Seq Scan", SQLite's "SCAN <table>" without an index.
+_TABLE_SCAN = re.compile(r'Seq Scan on|\bSCAN \w+$', re.M)
+_SORT = re.compile(r'USE TEMP B-TREE FOR ORDER BY|\bSort\b')
+
+
+def seed(count):
+    from django.db import connection
+    from django.db.models.functions import Mod
+    from django.utils import timezone
+    from apps.manuscripts.models import Manuscript
+    from apps.reviews.models import Review, ReviewAssignment
+
+    seed_manuscripts(count, authors=max(count // 20, 1), editors=50, reviewers=max(count // 50, 1),
+                     progress=lambda n: print(f"  {n:,}", end='\r', file=sys.stderr))
+
+    # Spread submissions over two years so date ranges are selective.
+    now = timezone.now()
+    days = 730
+    step = max(count // days, 1)
+    for day in range(days):
+        Manuscript.objects.filter(id__gt=day * step, id__lte=(day + 1) * step).update(
+            submitted_at=now - timedelta(days=days - day),
+        )
+
+    assignments = ReviewAssignment.objects.values_list('review_round_id', 'review_round__manuscript_id', 'reviewer_id')
+    batch = []
+    for round_id, manuscript_id, reviewer_id in assignments.iterator(chunk_size=10000):
+        batch.append(Review(manuscript_id=manuscript_id, review_round_id=round_id, reviewer_id=reviewer_id,
+                            comments='Looks fine.', status='Submitted'))
+        if len(batch) == 10000:
+            Review.objects.bulk_create(batch)
+            batch = []
+    Review.objects.bulk_create(batch)
+    # One review in ten is still outstanding.
+    Review.objects.annotate(bucket=Mod('id', 10)).filter(bucket=0).update(status='Pending')
+
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def cases():
+    """``(viewset, label, query params)`` for every declared filter and ordering."""
+    from apps.manuscripts.models import Manuscript
+    from apps.manuscripts.views import ManuscriptViewSet
+    from apps.reviews.models import Review
+    from apps.reviews.views import ReviewViewSet
+
+    sample = Manuscript.objects.order_by('id')[Manuscript.objects.count() // 2]
+    week_end = sample.submitted_at + timedelta(days=7)
+    review = Review.objects.order_by('id').first()
+    values = {
+        ManuscriptViewSet: {
+            'journal': sample.journal_id,
+            'section': sample.section_id,
+            'current_state': sample.current_state_id,
+            'corresponding_author': sample.corresponding_author_id,
+            'submitted_at__gte': sample.submitted_at.isoformat(),
+            'submitted_at__lt': week_end.isoformat(),
+        },
+        ReviewViewSet: {
+            'status': 'Pending',
+            'reviewer': review.reviewer_id,
+        },
+    }
+
+    for viewset, sample_values in values.items():
+        for name, lookups in viewset.filter_fields.items():
+            for lookup in lookups:
+                param = name if lookup == 'exact' else f'{name}__{lookup}'
+                value = sample_values.get(param, sample_values.get(name))
+                if value is None:
+                    continue
+                if lookup == 'in':
+                    value = f'{value},{value}'
+                yield viewset, param, {param: value}
+        for name in getattr(viewset, 'ordering_fields', ()):
+            yield viewset, f'ordering={name}', {'ordering': name}
+    yield ManuscriptViewSet, 'submitted_at week', {
+        'submitted_at__gte': values[ManuscriptViewSet]['submitted_at__gte'],
+        'submitted_at__lt': values[ManuscriptViewSet]['submitted_at__lt'],
+    }
+    yield ReviewViewSet, 'reviewer + status=Pending', {'reviewer': review.reviewer_id, 'status': 'Pending'}
+
+
+def first_page(viewset, params, user):
+    """The list endpoint's first-page queryset for ``params``, without running it."""
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory, force_authenticate
+
+    factory = APIRequestFactory()
+    django_request = factory.get('/', params)
+    force_authenticate(django_request, user)
+    view = viewset(action='list', format_kwarg=None)
+    view.request = Request(django_request)
+    view.args, view.kwargs = (), {}
+    queryset = view.filter_queryset(view.get_queryset())
+    paginator = view.paginator
+    ordering = paginator.get_ordering(queryset, view)
+    queryset = queryset.order_by(*[f'-{name}' if desc else name for name, desc in ordering])
+    return queryset[:paginator.get_page_size(view.request) + 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--manuscripts', type=int, default=200_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--keepdb', action='store_true', help='Reuse an already seeded test database')
+    parser.add_argument('--verbose', action='store_true', help='Print every plan, not only failing ones')
+    args = parser.parse_args()
+
+    setup_django()
+
+    with test_database(keepdb=args.keepdb):
+        from apps.manuscripts.models import Manuscript
+        from apps.users.models import User
+
+        if not Manuscript.objects.exists():
+            print(f"Seeding {args.manuscripts:,} manuscripts and reviews...")
+            seed(args.manuscripts)
+        user, _ = User.objects.get_or_create(
+            username='filters@example.com', defaults={'email': 'filters@example.com', 'is_superuser': True},
+        )
+
+        failures = []
+        print(f"\nFirst page per filter over {Manuscript.objects.count():,} manuscripts")
+        for viewset, label, params in cases():
+            queryset = first_page(viewset, params, user)
+            plan = explain(queryset)
+            scanned = bool(_TABLE_SCAN.search(plan))
+            sorted_ = bool(_SORT.search(plan))
+            stats = measure(lambda: list(queryset.all()), repeat=args.repeat)
+            note = 'TABLE SCAN' if scanned else ('index + sort' if sorted_ else 'index')
+            print(format_stats(f"{viewset.__name__.replace('ViewSet', '')}: {label} [{note}]", stats))
+            if scanned:
+                failures.append(label)
+            if scanned or args.verbose:
+                print('    ' + plan.replace('\n', '\n    '))
+
+    if failures:
+        print(f"\nFilters without an index scan: {', '.join(failures)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
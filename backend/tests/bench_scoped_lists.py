@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark for query-scoped manuscript visibility.
+
+Seeds a large manuscript table (1M rows by default) and measures the manuscript
+list endpoint for an author, a reviewer, a section editor and an oversight user
+(Editor-in-Chief). Run against PostgreSQL for representative numbers:
+
+    python tests/bench_scoped_lists.py --manuscripts 1000000
+"""
+
+import argparse
+import sys
+
+from harness import explain, format_stats, grant_role, measure, seed_manuscripts, setup_django, test_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--manuscripts', type=int, default=1_000_000)
+    parser.add_argument('--authors', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--keepdb', action='store_true', help='Reuse an already seeded test database')
+    parser.add_argument('--explain', action='store_true', help='Print the query plan for each persona')
+    args = parser.parse_args()
+
+    setup_django()
+
+    with test_database(keepdb=args.keepdb):
+        from rest_framework.test import APIClient
+        from apps.manuscripts.models import Manuscript
+        from apps.manuscripts.repositories import scope_manuscripts
+        from apps.users.models import User
+
+        if not Manuscript.objects.exists():
+            print(f"Seeding {args.manuscripts:,} manuscripts...")
+            seeded = seed_manuscripts(
+                args.manuscripts,
+                authors=args.authors,
+                progress=lambda n: print(f"  {n:,}", end='\r', file=sys.stderr),
+            )
+            grant_role(seeded['authors'][0], 'Author')
+            grant_role(seeded['reviewers'][0], 'Reviewer')
+            grant_role(seeded['editors'][0], 'Section Editor')
+            chief = User.objects.create_user(username='chief@example.com', email='chief@example.com')
+            grant_role(chief, 'Editor-in-Chief')
+
+        personas = {
+            'author': User.objects.get(username='author0@example.com'),
+            'reviewer': User.objects.get(username='reviewer0@example.com'),
+            'section editor': User.objects.get(username='editor0@example.com'),
+            'editor-in-chief': User.objects.get(username='chief@example.com'),
+        }
+
+        print(f"\nManuscript list latency over {Manuscript.objects.count():,} rows")
+        for label, user in personas.items():
+            queryset = scope_manuscripts(Manuscript.objects.all(), user)
+            print(format_stats(
+                f"{label}: first 50 rows (SQL)",
+                measure(lambda: list(queryset.order_by('-id')[:50]), repeat=args.repeat),
+            ))
+            if args.explain:
+                print(explain(queryset.order_by('-id')[:50]))
+
+            if label == 'editor-in-chief':
+                # Unscoped by design; the full list is not a meaningful request.
+                continue
+            client = APIClient()
+            client.force_authenticate(user)
+            print(format_stats(
+                f"{label}: GET /api/manuscripts/manuscripts/",
+                measure(lambda: client.get('/api/manuscripts/manuscripts/'), repeat=args.repeat),
+            ))
+
+
+if __name__ == '__main__':
+    main()
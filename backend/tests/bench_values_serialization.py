@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the values()-based list read path.
+
+Seeds manuscript status history and review ratings, then compares rows/sec
+of the regular ModelSerializer path against ValuesReader for the serializers
+behind ManuscriptStatusHistoryViewSet and ReviewRatingViewSet, after checking
+that both produce identical output:
+
+    python tests/bench_values_serialization.py --rows 100000
+"""
+
+import argparse
+import json
+
+from harness import measure, seed_manuscripts, setup_django, test_database
+
+
+def seed_children(rows):
+    from apps.manuscripts.models import Manuscript, ManuscriptStatusHistory
+    from apps.reviews.models import ReviewAssignment, ReviewRating
+    from apps.workflow.models import WorkflowState
+
+    manuscripts = list(Manuscript.objects.values_list('id', 'corresponding_author_id'))
+    assignments = list(ReviewAssignment.objects.values_list('id', flat=True))
+    states = list(WorkflowState.objects.values_list('id', flat=True))
+    ManuscriptStatusHistory.objects.bulk_create([
+        ManuscriptStatusHistory(
+            manuscript_id=manuscripts[i % len(manuscripts)][0],
+            state_id=states[i % len(states)],
+            changed_by_id=manuscripts[i % len(manuscripts)][1],
+        )
+        for i in range(rows)
+    ], batch_size=10000)
+    ReviewRating.objects.bulk_create([
+        ReviewRating(review_id=assignments[i % len(assignments)], criterion=f'Criterion {i % 5}', rating=i % 5 + 1)
+        for i in range(rows)
+    ], batch_size=10000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--keepdb', action='store_true', help='Reuse an already seeded test database')
+    args = parser.parse_args()
+
+    setup_django()
+
+    with test_database(keepdb=args.keepdb):
+        from rest_framework.utils.encoders import JSONEncoder
+        from apps.manuscripts.models import ManuscriptStatusHistory
+        from apps.manuscripts.serializers import ManuscriptStatusHistorySerializer
+        from apps.reviews.models import ReviewRating
+        from apps.reviews.serializers import ReviewRatingSerializer
+        from core.serializers import get_values_reader
+
+        if not ReviewRating.objects.exists():
+            print(f"Seeding {args.rows:,} status history rows and ratings...")
+            seed_manuscripts(max(args.rows // 10, 1), authors=100, editors=10, reviewers=100)
+            seed_children(args.rows)
+
+        for model, serializer_class in (
+            (ManuscriptStatusHistory, ManuscriptStatusHistorySerializer),
+            (ReviewRating, ReviewRatingSerializer),
+        ):
+            queryset = model.objects.order_by('-id')
+            count = queryset.count()
+            reader = get_values_reader(serializer_class)
+
+            regular = serializer_class(queryset, many=True).data
+            fast = reader.render(queryset.values(*reader.columns))
+            dump = lambda data: json.dumps(data, cls=JSONEncoder)
+            assert dump(regular) == dump(fast), f"{serializer_class.__name__}: outputs differ"
+
+            print(f"\n{serializer_class.__name__} over {count:,} rows (output identical)")
+            for label, render in (
+                ('ModelSerializer', lambda: serializer_class(queryset.all(), many=True).data),
+                ('ValuesReader', lambda: reader.render(queryset.values(*reader.columns))),
+            ):
+                stats = measure(render, repeat=args.repeat, warmup=1)
+                print(f"  {label:<16} median {stats['median']:9.1f} ms  {count / stats['median'] * 1000:12,.0f} rows/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Shared bootstrap for the benchmark and query-budget scripts in this directory.
+
+Scripts call setup_django() before importing any app module, then run inside
+test_database() so seeded rows never touch the development database.
+"""
+
+import os
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def setup_django(settings_module='core.settings.dev'):
+    """Configure Django for a standalone script."""
+    if str(BACKEND_DIR) not in sys.path:
+        sys.path.insert(0, str(BACKEND_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    # Keep per-request SQL summaries (core.middleware.queries) out of the reports.
+    os.environ.setdefault('SQL_LOG_LEVEL', 'WARNING')
+    import django
+    django.setup()
+
+
+@contextmanager
+def test_database(keepdb=False):
+    """Create (or reuse with keepdb) the test database for the duration of the block."""
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, keepdb=keepdb)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+        teardown_test_environment()
+
+
+def measure(func, repeat=20, warmup=2):
+    """Run func repeatedly and return latency statistics in milliseconds."""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        'min': samples[0],
+        'median': statistics.median(samples),
+        'p95': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+    }
+
+
+def format_stats(label, stats):
+    return f"{label:<52} min {stats['min']:8.2f} ms | median {stats['median']:8.2f} ms | p95 {stats['p95']:8.2f} ms"
+
+
+def explain(queryset):
+    """Return the database plan for a queryset (PostgreSQL gives the most detail)."""
+    from django.db import connection
+    if connection.vendor == 'postgresql':
+        return queryset.explain(analyze=True, buffers=True)
+    return queryset.explain()
+
+
+# -------------------------
+# Seeding
+# -------------------------
+
+def grant_role(user, role_name):
+    from apps.users.models import Role, UserRole
+    UserRole.objects.create(user=user, role=Role.objects.get(name=role_name))
+
+
+def create_users(count, prefix='user', batch_size=5000):
+    """Bulk-create users sharing one pre-hashed password ("Passw0rd!")."""
+    from django.contrib.auth.hashers import make_password
+    from apps.users.models import User
+
+    password = make_password('Passw0rd!')
+    created = []
+    for start in range(0, count, batch_size):
+        batch = [
+            User(username=f'{prefix}{i}@example.com', email=f'{prefix}{i}@example.com', password=password)
+            for i in range(start, min(start + batch_size, count))
+        ]
+        created.extend(User.objects.bulk_create(batch, batch_size=batch_size))
+    return created
+
+
+def seed_manuscripts(count, authors=1000, editors=50, reviewers=500, batch_size=10000, progress=None):
+    """
+    Seed ``count`` manuscripts spread over ``authors`` with one editor
+    assignment and one review round/assignment per manuscript.
+
+    Returns a dict with the journal and the author/editor/reviewer lists.
+    """
+    from apps.journals.models import Journal, Section
+    from apps.manuscripts.models import Manuscript, EditorAssignment
+    from apps.reviews.models import ReviewRound, ReviewAssignment
+    from apps.workflow.models import WorkflowState
+
+    journal, _ = Journal.objects.get_or_create(name='Benchmark Journal', slug='benchmark')
+    sections = [
+        Section.objects.get_or_create(journal=journal, slug=f'section-{i}', defaults={'name': f'Section {i}'})[0]
+        for i in range(5)
+    ]
+    states = [WorkflowState.objects.get_or_create(name=name)[0] for name in ('Submitted', 'In Review', 'Accepted')]
+
+    author_users = create_users(authors, prefix='author')
+    editor_users = create_users(editors, prefix='editor')
+    reviewer_users = create_users(reviewers, prefix='reviewer')
+
+    for start in range(0, count, batch_size):
+        stop = min(start + batch_size, count)
+        manuscripts = Manuscript.objects.bulk_create([
+            Manuscript(
+                journal=journal,
+                section=sections[i % len(sections)],
+                title=f'Manuscript {i}',
+                abstract='Lorem ipsum dolor sit amet. ' * 8,
+                corresponding_author=author_users[i % authors],
+                current_state=states[i % len(states)],
+            )
+            for i in range(start, stop)
+        ], batch_size=batch_size)
+        EditorAssignment.objects.bulk_create([
+            EditorAssignment(manuscript=m, editor=editor_users[(start + n) % editors], role='Section Editor')
+            for n, m in enumerate(manuscripts)
+        ], batch_size=batch_size)
+        rounds = ReviewRound.objects.bulk_create([ReviewRound(manuscript=m) for m in manuscripts], batch_size=batch_size)
+        ReviewAssignment.objects.bulk_create([
+            ReviewAssignment(review_round=r, reviewer=reviewer_users[(start + n) % reviewers])
+            for n, r in enumerate(rounds)
+        ], batch_size=batch_size)
+        if progress:
+            progress(stop)
+
+    return {
+        'journal': journal,
+        'authors': author_users,
+        'editors': editor_users,
+        'reviewers': reviewer_users,
+    }
+
+
+def seed_activity(manuscripts=None):
+    """
+    Give every seeded manuscript (or the given ones) a version, a status
+    change and a decision, and every review assignment a review, a comment,
+    a rating and a file, so each endpoint has related rows to render.
+    """
+    from apps.manuscripts.models import Decision, Manuscript, ManuscriptStatusHistory, ManuscriptVersion
+    from apps.reviews.models import Review, ReviewAssignment, ReviewComment, ReviewFile, ReviewRating
+    from apps.workflow.models import WorkflowState
+
+    manuscripts = list(manuscripts if manuscripts is not None else Manuscript.objects.all())
+    state = WorkflowState.objects.order_by('id').first()
+    ManuscriptVersion.objects.bulk_create([ManuscriptVersion(manuscript=m, version_number=1) for m in manuscripts])
+    ManuscriptStatusHistory.objects.bulk_create([
+        ManuscriptStatusHistory(manuscript=m, state=state, changed_by_id=m.corresponding_author_id) for m in manuscripts
+    ])
+    Decision.objects.bulk_create([
+        Decision(manuscript=m, decision='Minor Revision', decided_by_id=m.corresponding_author_id) for m in manuscripts
+    ])
+
+    assignments = list(ReviewAssignment.objects.select_related('review_round'))
+    reviews = Review.objects.bulk_create([
+        Review(
+            manuscript_id=a.review_round.manuscript_id,
+            review_round_id=a.review_round_id,
+            reviewer_id=a.reviewer_id,
+            comments='Solid methodology; clarify the sampling.',
+        )
+        for a in assignments
+    ])
+    ReviewComment.objects.bulk_create([
+        ReviewComment(review=a, commenter_id=a.reviewer_id, comment='See attached notes.') for a in assignments
+    ])
+    ReviewRating.objects.bulk_create([ReviewRating(review=a, criterion='Originality', rating=4) for a in assignments])
+    ReviewFile.objects.bulk_create([ReviewFile(review=r, file=f'uploads/reviews/review-{r.pk}.pdf') for r in reviews])
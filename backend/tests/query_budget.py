@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Query-count and N+1 regression check for every router-registered endpoint.
+
+Seeds a small but complete dataset, then walks the viewsets registered on the
+``router`` of each ``apps/*/urls.py`` and records, per action and persona,
+the number of SQL queries and of repeated query shapes:
+
+  * list at two page sizes (and with every expandable relation expanded) -
+    the count must not grow with the page size;
+  * retrieve of the first visible row;
+  * create with a payload cloned from an existing row, rolled back.
+
+Counts are compared against ``query_budget.json`` next to this script; any
+endpoint over budget, or whose list cost depends on the page size, fails the
+run. After an intentional change, rewrite the budget and commit it:
+
+    python tests/query_budget.py
+    python tests/query_budget.py --update
+"""
+
+import argparse
+import json
+import re
+import sys
+from collections import Counter
+from importlib import import_module
+from pathlib import Path
+
+from harness import grant_role, seed_activity, seed_manuscripts, setup_django, test_database
+
+BUDGET_FILE = Path(__file__).with_name('query_budget.json')
+PAGE_SIZES = (5, 50)
+
+# Transaction bookkeeping is not work the endpoint asked for.
+_TRANSACTION = re.compile(r'^\s*(BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT)\b', re.I)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\bIN \((?:\?|%s|\s|,)+\)', re.I)
+
+
+def signature(sql):
+    """Reduce a statement to its shape: literals and IN-lists become placeholders."""
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    return _IN_LIST.sub('IN (...)', sql)
+
+
+def run(client, method, url, data=None):
+    """Perform a request and return ``(response, queries, duplicates)``."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as captured:
+        response = getattr(client, method)(url, data, format='json')
+        if getattr(response, 'streaming', False):
+            b''.join(response.streaming_content)
+    statements = [q['sql'] for q in captured.captured_queries if not _TRANSACTION.match(q['sql'])]
+    shapes = Counter(signature(sql) for sql in statements)
+    return response, len(statements), sum(n - 1 for n in shapes.values())
+
+
+def discover_endpoints():
+    """``(app, prefix, basename, viewset)`` for every router in apps/*/urls.py."""
+    from django.apps import apps
+
+    endpoints = []
+    for config in apps.get_app_configs():
+        if not config.name.startswith('apps.'):
+            continue
+        try:
+            module = import_module(f'{config.name}.urls')
+        except ModuleNotFoundError:
+            continue
+        router = getattr(module, 'router', None)
+        for prefix, viewset, basename in getattr(router, 'registry', ()):
+            endpoints.append((config.label, prefix, basename, viewset))
+    return endpoints
+
+
+def create_payload(viewset, instance, marker):
+    """Clone ``instance`` through the viewset's serializer, keeping unique fields unique."""
+    from django.db.models import F
+    from rest_framework import serializers
+
+    serializer = viewset.serializer_class(instance)
+    fields = serializer.fields
+    if any(isinstance(f, serializers.FileField) and not f.read_only for f in fields.values()):
+        return None
+    model = viewset.serializer_class.Meta.model
+    unique = {f.name for f in model._meta.fields if f.unique and not f.primary_key}
+    for together in model._meta.unique_together:
+        unique.update(together)
+    for constraint in model._meta.constraints:
+        unique.update(getattr(constraint, 'fields', ()))
+        for expression in getattr(constraint, 'expressions', ()):
+            unique.update(ref.name for ref in expression.flatten() if isinstance(ref, F))
+
+    payload = {}
+    for name, value in serializer.data.items():
+        field = fields[name]
+        if field.read_only:
+            continue
+        if name in unique and isinstance(value, str):
+            value = f'{marker}{value}' if isinstance(field, serializers.EmailField) else f'{value}-{marker}'
+        elif name in unique and isinstance(value, int) and not isinstance(field, serializers.RelatedField):
+            value += 1000
+        payload[name] = value
+    return payload
+
+
+def seed():
+    from apps.notifications.models import Notification
+    from apps.users.models import User
+
+    seeded = seed_manuscripts(300, authors=20, editors=5, reviewers=20)
+    seed_activity()
+    # editor0 handles every fifth manuscript: enough rows for the larger page.
+    grant_role(seeded['editors'][0], 'Section Editor')
+    admin = User.objects.create_superuser(username='admin@example.com', email='admin@example.com', password='Passw0rd!')
+    Notification.objects.bulk_create(
+        Notification(recipient=user, title=f'Notification {n}', message='Seeded.')
+        for user in (admin, seeded['editors'][0]) for n in range(60)
+    )
+
+
+def measure_endpoints(personas):
+    import logging
+    from django.db import transaction
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+
+    # 403s and 400s are recorded in the budget; they are not worth a log line each.
+    logging.getLogger('django.request').setLevel(logging.ERROR)
+    results = {}
+    problems = []
+    for app, prefix, basename, viewset in discover_endpoints():
+        list_url = reverse(f'{basename}-list')
+        for persona, user in personas.items():
+            client = APIClient()
+            client.force_authenticate(user)
+            key = f'{app}/{prefix} [{persona}]'
+            entry = results[key] = {}
+
+            # Warm per-user caches (permissions, content types) first.
+            run(client, 'get', list_url)
+            counts = {}
+            for page_size in PAGE_SIZES:
+                response, queries, duplicates = run(client, 'get', list_url, {'page_size': page_size})
+                counts[page_size] = queries
+                entry[f'list?page_size={page_size}'] = {
+                    'status': response.status_code, 'queries': queries, 'duplicates': duplicates,
+                }
+            if counts[PAGE_SIZES[-1]] > counts[PAGE_SIZES[0]]:
+                problems.append(
+                    f'{key} list: {counts[PAGE_SIZES[0]]} queries at page_size={PAGE_SIZES[0]}, '
+                    f'{counts[PAGE_SIZES[-1]]} at page_size={PAGE_SIZES[-1]}'
+                )
+
+            expandable = getattr(viewset.serializer_class, 'expandable_fields', None)
+            if expandable:
+                expand = ','.join(expandable)
+                small = run(client, 'get', list_url, {'page_size': PAGE_SIZES[0], 'expand': expand})
+                response, queries, duplicates = run(
+                    client, 'get', list_url, {'page_size': PAGE_SIZES[-1], 'expand': expand},
+                )
+                entry['list?expand=*'] = {'status': response.status_code, 'queries': queries, 'duplicates': duplicates}
+                if queries > small[1]:
+                    problems.append(
+                        f'{key} list?expand={expand}: {small[1]} queries at page_size={PAGE_SIZES[0]}, '
+                        f'{queries} at page_size={PAGE_SIZES[-1]}'
+                    )
+
+            listed = run(client, 'get', list_url, {'page_size': 1})[0]
+            rows = listed.data.get('results', listed.data) if listed.status_code == 200 else []
+            instance = viewset.queryset.model._default_manager.get(pk=rows[0]['id']) if rows else None
+            if instance is not None:
+                response, queries, duplicates = run(client, 'get', reverse(f'{basename}-detail', args=[instance.pk]))
+                entry['retrieve'] = {'status': response.status_code, 'queries': queries, 'duplicates': duplicates}
+
+            if instance is not None and hasattr(viewset, 'create') and user.is_superuser:
+                payload = create_payload(viewset, instance, marker='budget')
+                if payload is not None:
+                    with transaction.atomic():
+                        response, queries, duplicates = run(client, 'post', list_url, payload)
+                        transaction.set_rollback(True)
+                    entry['create'] = {'status': response.status_code, 'queries': queries, 'duplicates': duplicates}
+    return results, problems
+
+
+def compare(results, budget):
+    """Return the regressions of ``results`` against ``budget``."""
+    problems = []
+    for key, actions in results.items():
+        for action, measured in actions.items():
+            allowed = budget.get(key, {}).get(action)
+            if allowed is None:
+                problems.append(f'{key} {action}: not in the budget ({measured["queries"]} queries); run with --update')
+                continue
+            if measured['status'] != allowed['status']:
+                problems.append(f'{key} {action}: status {measured["status"]}, budget has {allowed["status"]}')
+            for metric in ('queries', 'duplicates'):
+                if measured[metric] > allowed[metric]:
+                    problems.append(f'{key} {action}: {measured[metric]} {metric}, budget {allowed[metric]}')
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--update', action='store_true', help=f'Rewrite {BUDGET_FILE.name} with the measured counts')
+    parser.add_argument('--keepdb', action='store_true', help='Reuse an already seeded test database')
+    args = parser.parse_args()
+
+    setup_django()
+
+    with test_database(keepdb=args.keepdb):
+        from apps.users.models import User
+
+        if not User.objects.filter(username='admin@example.com').exists():
+            print("Seeding...")
+            seed()
+        personas = {
+            'superuser': User.objects.get(username='admin@example.com'),
+            'section editor': User.objects.get(username='editor0@example.com'),
+        }
+        results, problems = measure_endpoints(personas)
+
+    for key, actions in results.items():
+        for action, measured in actions.items():
+            print(f"{key:<52} {action:<20} {measured['status']}  "
+                  f"{measured['queries']:3} queries  {measured['duplicates']:3} duplicates")
+
+    if args.update:
+        BUDGET_FILE.write_text(json.dumps(results, indent=2, sort_keys=True) + '\n')
+        print(f"\nWrote {BUDGET_FILE.name}")
+    else:
+        budget = json.loads(BUDGET_FILE.read_text()) if BUDGET_FILE.exists() else {}
+        problems += compare(results, budget)
+
+    if problems:
+        print('\nQuery budget exceeded:', file=sys.stderr)
+        for problem in problems:
+            print(f'  {problem}', file=sys.stderr)
+        sys.exit(1)
+    print('\nAll endpoints within budget.')
+
+
+if __name__ == '__main__':
+    main()
@@ -248,7 +248,9 @@ class APITester:
             
             if response.status_code == 200:
                 data = response.json()
-                count = len(data) if isinstance(data, list) else 0
+                # List endpoints are paginated: {"next", "previous", "results"}.
+                results = data.get('results', []) if isinstance(data, dict) else data
+                count = len(results)
                 self.print_result(
                     "Journals List",
                     True,
@@ -294,7 +296,9 @@ class APITester:
             
             if response.status_code == 200:
                 data = response.json()
-                count = len(data) if isinstance(data, list) else 0
+                # List endpoints are paginated: {"next", "previous", "results"}.
+                results = data.get('results', []) if isinstance(data, dict) else data
+                count = len(results)
                 self.print_result(
                     "Sections List",
                     True,
@@ -340,7 +344,9 @@ class APITester:
             
             if response.status_code == 200:
                 data = response.json()
-                count = len(data) if isinstance(data, list) else 0
+                # List endpoints are paginated: {"next", "previous", "results"}.
+                results = data.get('results', []) if isinstance(data, dict) else data
+                count = len(results)
                 self.print_result(
                     "Manuscripts List",
                     True,